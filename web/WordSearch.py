@@ -4,9 +4,15 @@
 
 import sys
 import os
-import pprint
-from puzzle import CrossWords, Search
-dir_path = os.path.dirname(os.path.realpath(__file__))
+import time
+import puzzle
+from puzzle import CrossWords, Search, SearchResult, SearchStore
+from metrics import create_metrics, metrics_from_environment
+from writer import ResultWriter
+
+__version__ = "1.1.0"
+
+COMPILED_EXTENSION = ".pzc"
 
 class WordSearchError(Exception):
     """
@@ -31,9 +37,97 @@ class WordSearch(object):
         self.result = None
         self.outputs_directory = "outputs"
         self.input_directory = "puzzles"
-        self.puzzles = []
-        self.searches = []
-        self.crosswords = CrossWords()
+        self.engine = CrossWords.ENGINE_SCAN
+        self.backend = CrossWords.BACKEND_PYTHON
+        self.all_matches = False
+        self.compact = False
+        self.max_mismatches = 0
+        self.allow_ragged = False
+        self.output_format = ResultWriter.FORMAT_TEXT
+        self.workers = 1
+        self.index_cache = None
+        self.memo = None
+        self.mapped_grid = None
+        self.metrics = metrics_from_environment(os.environ)
+        self.quiet = False
+        self.unittest_running = None
+        self.crosswords = self.create_crosswords()
+
+    def reset(self):
+        """
+        Clears the puzzle state so the same pipeline can solve another puzzle
+        file, the engine, backend and directories are kept.
+        """
+
+        self.puzzle_file = None
+        self.result = None
+        self.crosswords = self.create_crosswords()
+        return self
+
+    def create_crosswords(self):
+        """
+        Creates the crosswords of a puzzle with the pipeline settings.
+
+        :returns:   The crosswords
+        :rtype:     CrossWords
+        """
+
+        crosswords = CrossWords(self.backend)
+        crosswords.memo = self.memo
+        crosswords.metrics = self.metrics
+        crosswords.max_mismatches = self.max_mismatches
+        crosswords.engine = self.engine
+        if self.compact:
+            crosswords.use_store(SearchStore())
+        return crosswords
+
+    def configure(self, options):
+        """
+        Apply the options of a word search pipeline, missing options are kept.
+
+        :param      options:  The engine, backend, all_matches,
+                              compact, max_mismatches, allow_ragged, output_format,
+                              cache_directory, memo_entries, memo_ttl,
+                              metrics and metrics_allocations
+        :type       options:  dictionary
+        """
+
+        if options.get("backend"):
+            self.set_backend(options["backend"])
+        if options.get("engine"):
+            self.set_engine(options["engine"])
+        if "all_matches" in options:
+            self.set_all_matches(options["all_matches"])
+        if options.get("compact"):
+            self.set_compact(True)
+        if options.get("max_mismatches"):
+            self.set_max_mismatches(options["max_mismatches"])
+        if options.get("allow_ragged"):
+            self.set_allow_ragged(True)
+        if options.get("output_format"):
+            self.set_output_format(options["output_format"])
+        if options.get("cache_directory"):
+            from cache import GridIndexCache
+            self.set_index_cache(GridIndexCache(options["cache_directory"]))
+        if options.get("memo_entries"):
+            from cache import LRUCache
+            self.set_memo(LRUCache(options["memo_entries"], options.get("memo_ttl")))
+        if options.get("metrics"):
+            self.set_metrics(create_metrics(
+                options["metrics"], options.get("metrics_allocations", False)
+            ))
+        return self
+
+    def set_quiet(self, quiet):
+        """
+        Sets whether the progress messages are printed.
+
+        :param      quiet:  True to disable the progress messages
+        :type       quiet:  boolean
+        """
+
+        self.quiet = bool(quiet)
+        return self
 
     def set_puzzle_file(self, puzzle_file):
         """
@@ -46,20 +140,407 @@ class WordSearch(object):
         self.puzzle_file = puzzle_file;
         return self
 
+    def set_engine(self, engine):
+        """
+        Sets the search engine.
+
+        :param      engine:           The engine, one of CrossWords.ENGINES
+        :type       engine:           string
+
+        :raises     WordSearchError:  If the engine is unknown
+        """
+
+        engine = str(engine).upper()
+        if engine not in CrossWords.ENGINES:
+            raise WordSearchError("{} is not a valid search engine".format(engine))
+
+        self.engine = engine
+        self.crosswords.engine = engine
+        return self
+
+    def set_backend(self, backend):
+        """
+        Sets the grid backend, must be called before reading the puzzle.
+
+        :param      backend:          The backend, one of CrossWords.BACKENDS
+        :type       backend:          string
+
+        :raises     WordSearchError:  If the backend is unknown or unavailable
+        """
+
+        backend = str(backend).upper()
+        if backend not in CrossWords.BACKENDS:
+            raise WordSearchError("{} is not a valid grid backend".format(backend))
+        if backend == CrossWords.BACKEND_NUMPY and not puzzle.has_numpy():
+            raise WordSearchError("numpy is required for the {} backend".format(backend))
+
+        self.backend = backend
+        self.crosswords = self.create_crosswords()
+        return self
+
+    def set_compact(self, compact):
+        """
+        Sets whether the searches are kept in a columnar store, for word lists
+        too large to keep one object per word.
+
+        :param      compact:  True to keep the searches in a store
+        :type       compact:  boolean
+        """
+
+        self.compact = bool(compact)
+        if self.compact and not isinstance(self.crosswords.searches, SearchStore):
+            self.crosswords.use_store(SearchStore())
+        return self
+
+    def set_max_mismatches(self, max_mismatches):
+        """
+        Sets the letters a match may have differing from the word, with the
+        pattern engine.
+
+        :param      max_mismatches:   The mismatches allowed in a match
+        :type       max_mismatches:   number
+
+        :raises     WordSearchError:  If the mismatches are negative
+        """
+
+        max_mismatches = int(max_mismatches or 0)
+        if max_mismatches < 0:
+            raise WordSearchError("{} is not a valid number of mismatches".format(max_mismatches))
+
+        self.max_mismatches = max_mismatches
+        self.crosswords.max_mismatches = max_mismatches
+        return self
+
+    def set_allow_ragged(self, allow_ragged):
+        """
+        Sets whether the grid rows may have different lengths, the missing
+        cells are never part of a match.
+
+        :param      allow_ragged:  True to allow rows of different lengths
+        :type       allow_ragged:  boolean
+        """
+
+        self.allow_ragged = bool(allow_ragged)
+        return self
+
+    def set_output_format(self, output_format):
+        """
+        Sets the format of the output file.
+
+        :param      output_format:    The format, one of ResultWriter.FORMATS
+        :type       output_format:    string
+
+        :raises     WordSearchError:  If the format is unknown
+        """
+
+        output_format = str(output_format).upper()
+        if output_format not in ResultWriter.FORMATS:
+            raise WordSearchError("{} is not a valid output format".format(output_format))
+
+        self.output_format = output_format
+        return self
+
+    def set_workers(self, workers):
+        """
+        Sets the number of processes searching the words.
+
+        :param      workers:  The number of worker processes, 1 searches in
+                              the current process
+        :type       workers:  number
+        """
+
+        self.workers = max(1, int(workers or 1))
+        return self
+
+    def set_index_cache(self, index_cache):
+        """
+        Sets the grid index cache, grids already in the cache skip the puzzle
+        initialization and are searched through their n-gram index.
+
+        :param      index_cache:  The index cache, None to disable it
+        :type       index_cache:  GridIndexCache
+        """
+
+        self.index_cache = index_cache
+        return self
+
+    def set_memo(self, memo):
+        """
+        Sets the search results memo, shared by every puzzle searched with
+        this pipeline.
+
+        :param      memo:  The memo, None to disable it
+        :type       memo:  LRUCache
+        """
+
+        self.memo = memo
+        self.crosswords.memo = memo
+        return self
+
+    def set_metrics(self, metrics):
+        """
+        Sets the metrics collecting the time of every stage and search.
+
+        :param      metrics:  The metrics, NULL_METRICS to disable them
+        :type       metrics:  Metrics
+        """
+
+        self.metrics = metrics
+        self.crosswords.metrics = metrics
+        return self
+
+    def set_all_matches(self, all_matches):
+        """
+        Sets whether every occurrence of the words is written.
+
+        :param      all_matches:  True to write all occurrences
+        :type       all_matches:  boolean
+        """
+
+        self.all_matches = bool(all_matches)
+        return self
+
     def run_search(self):
         """
         Run the search for words based on the puzzle file and output it to the
         outputs directory
         """
 
-        self.read_puzzle_file()
-        self.build_puzzle()
-        self.build_searches()
-        self.begin_search()
-        self.output_result()
+        metrics = self.metrics
+        try:
+            with metrics.stage("read_puzzle_file"):
+                self.read_puzzle_file()
+            with metrics.stage("build_puzzle"):
+                self.build_puzzle()
+            with metrics.stage("build_searches"):
+                self.build_searches()
+            if not self.all_matches:
+                with metrics.stage("filter_searches"):
+                    self.filter_searches()
+                with metrics.stage("begin_search"):
+                    self.begin_search()
+            with metrics.stage("output_result"):
+                self.output_result()
+        finally:
+            self.close_compiled_file()
+
+        return self.report_metrics()
+
+    def run_word_stream(self, words, output_file = None):
+        """
+        Search the words of a stream in the puzzle file grid, the grid is
+        built once then every word is searched as it is read and its result
+        written at once, so the first result never waits for the whole list
+        and the memory stays the same whatever the number of words. The words
+        of the puzzle file are not searched.
+
+        :param      words:        The words, one per line, like sys.stdin
+        :type       words:        iterable
+        :param      output_file:  The binary output file, the standard
+                                  output when None
+        :type       output_file:  file
+
+        :raises     WordSearchError:  If the puzzle file is missing, has no
+                                      rows, an incorrect dimension or a word
+                                      is not valid
+        """
+
+        if output_file is None:
+            output_file = sys.stdout.buffer
+
+        searched = 0
+        found = 0
+        try:
+            with self.metrics.stage("read_puzzle_file"):
+                self.read_puzzle_rows()
+            with self.metrics.stage("build_puzzle"):
+                self.build_puzzle()
+
+            with ResultWriter(output_file, self.output_format, batch_size = 1) as writer:
+                for line in words:
+                    line = line.strip()
+                    if not line:
+                        continue
+
+                    self.validate_line(line, True)
+                    search = Search(line)
+                    if not self.all_matches:
+                        self.stream_find(search)
+                    self.write_result(writer, search, self.all_matches, searched)
+                    searched += 1
+                    found += search.was_found
+        finally:
+            self.close_compiled_file()
+
+        self.metrics.count("searches", searched)
+        self.metrics.count("words_found", found)
+        return self.report_metrics()
+
+    def read_puzzle_rows(self):
+        """
+        Reads the grid rows of the puzzle file, it stops at the words.
+
+        :raises     WordSearchError:  If puzzle file is missing
+        """
+
+        if self.is_compiled_file():
+            self.read_compiled_file()
+            return self
+
+        with open(self.get_puzzle_path(), 'r') as reader:
+            for is_search, line in self.parse_puzzle(reader):
+                if is_search:
+                    break
+                self.crosswords.add_row(line)
 
         return self
 
+    def load_puzzle(self, rows, words):
+        """
+        Loads a puzzle from memory.
+
+        :param      rows:             The grid rows, an iterable or a new line
+                                      separated string
+        :type       rows:             iterable
+        :param      words:            The words to search, an iterable or a
+                                      new line separated string
+        :type       words:            iterable
+
+        :raises     WordSearchError:  If a row or a word is not valid
+        """
+
+        for row in self.iter_lines(rows):
+            self.validate_line(row)
+            self.crosswords.add_row(row)
+
+        for word in self.iter_lines(words):
+            self.validate_line(word, True)
+            self.crosswords.add_searches(word)
+
+        return self
+
+    def load_puzzle_text(self, text):
+        """
+        Loads a puzzle from the content of a puzzle file.
+
+        :param      text:             The puzzle file content
+        :type       text:             string
+
+        :raises     WordSearchError:  If a row or a word is not valid
+        """
+
+        for is_search, line in self.parse_puzzle(text.splitlines()):
+            if is_search:
+                self.crosswords.add_searches(line)
+            else:
+                self.crosswords.add_row(line)
+
+        return self
+
+    @staticmethod
+    def iter_lines(lines):
+        """
+        Iterate over the non blank lines
+
+        :param      lines:  An iterable or a new line separated string
+        :type       lines:  iterable
+
+        :returns:   The lines without trailing whitespaces
+        :rtype:     generator
+        """
+
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+
+        for line in lines:
+            line = str(line).rstrip()
+            if line:
+                yield line
+
+    def solve(self):
+        """
+        Search the loaded puzzle, without touching the disk.
+
+        :returns:   The search results
+        :rtype:     generator
+
+        :raises     WordSearchError:  If the puzzle has no rows, no words or
+                                      an incorrect dimension
+        """
+
+        metrics = self.metrics
+        with metrics.stage("build_puzzle"):
+            self.build_puzzle()
+        with metrics.stage("build_searches"):
+            self.build_searches()
+        if not self.all_matches:
+            with metrics.stage("filter_searches"):
+                self.filter_searches()
+            with metrics.stage("begin_search"):
+                self.begin_search()
+
+        self.report_metrics()
+        return self.iter_results()
+
+    def run_stream_search(self):
+        """
+        Run the search one word at a time while reading the puzzle file, the
+        results are written in small batches as the words are read so the
+        memory is bounded by the grid and not by the number of words.
+        """
+
+        output_path = self.get_output_path()
+        output_file = None
+
+        if self.is_compiled_file():
+            mapped_grid = self.read_compiled_file()
+            try:
+                with self.metrics.stage("build_puzzle"):
+                    self.build_puzzle()
+                with open(output_path, 'wb') as output_file:
+                    with ResultWriter(output_file, self.output_format) as writer:
+                        for number, word in enumerate(mapped_grid.iter_words()):
+                            search = Search(word)
+                            if not self.all_matches:
+                                self.stream_find(search)
+                            self.write_result(writer, search, self.all_matches, number)
+            finally:
+                self.close_compiled_file()
+
+            self._print("Output file: {}".format(output_path))
+            return self.report_metrics()
+
+        number = 0
+        try:
+            with open(self.get_puzzle_path(), 'r') as reader:
+                for is_search, line in self.parse_puzzle(reader):
+                    if not is_search:
+                        self.crosswords.add_row(line)
+                        continue
+
+                    if output_file is None:
+                        with self.metrics.stage("build_puzzle"):
+                            self.build_puzzle()
+                        output_file = open(output_path, 'wb')
+                        writer = ResultWriter(output_file, self.output_format)
+
+                    search = Search(line)
+                    if not self.all_matches:
+                        self.stream_find(search)
+                    self.write_result(writer, search, self.all_matches, number)
+                    number += 1
+        finally:
+            if output_file is not None:
+                writer.flush()
+                output_file.close()
+
+        if output_file is None:
+            self.build_puzzle()
+            raise WordSearchError("There are no words to search found in puzzle file")
+
+        self._print("Output file: {}".format(output_path))
+        return self.report_metrics()
+
     def read_puzzle_file(self):
         """
         Reads a puzzle file.
@@ -67,8 +548,115 @@ class WordSearch(object):
         :raises     WordSearchError:  If puzzle file is missing
         """
 
-        found_new_line = False
-        found_string = False
+        if self.is_compiled_file():
+            for word in self.read_compiled_file().iter_words():
+                self.crosswords.add_searches(word)
+            return self
+
+        with open(self.get_puzzle_path(), 'r') as reader:
+            for is_search, line in self.parse_puzzle(reader):
+                if is_search:
+                    self.crosswords.add_searches(line)
+                else:
+                    self.crosswords.add_row(line)
+
+        return self
+
+    def is_compiled_file(self):
+        """
+        Determines if the puzzle file is a compiled puzzle.
+
+        :returns:   True if compiled puzzle, False otherwise.
+        :rtype:     boolean
+        """
+
+        return str(self.puzzle_file).endswith(COMPILED_EXTENSION)
+
+    def read_compiled_file(self):
+        """
+        Memory map a compiled puzzle file as the crosswords grid.
+
+        :returns:   The mapped grid
+        :rtype:     MappedGrid
+
+        :raises     WordSearchError:  If puzzle file is missing or invalid
+        """
+
+        from compiled import MappedGrid
+
+        try:
+            self.mapped_grid = MappedGrid(self.get_puzzle_path())
+        except ValueError as e:
+            raise WordSearchError(str(e))
+
+        self.crosswords.grid = self.mapped_grid
+        return self.mapped_grid
+
+    def close_compiled_file(self):
+        """
+        Closes the memory map of the compiled puzzle file once searched, unless
+        the index cache keeps its grid for the next searches.
+        """
+
+        mapped_grid = self.mapped_grid
+        self.mapped_grid = None
+        if mapped_grid is None:
+            return self
+
+        index = self.crosswords.index
+        if index is None or index.grid is not mapped_grid:
+            mapped_grid.close()
+        return self
+
+    def compile_puzzle_file(self, diagonals = True):
+        """
+        Compiles the puzzle file in a binary puzzle file next to it, which
+        can be searched again without parsing the grid.
+
+        :param      diagonals:        True to store the diagonals
+        :type       diagonals:        boolean
+
+        :returns:   The compiled puzzle path
+        :rtype:     string
+
+        :raises     WordSearchError:  If the puzzle grid or words are not ASCII,
+                                      or the grid is not rectangular
+        """
+
+        from compiled import write_compiled
+
+        self.read_puzzle_file()
+        self.build_puzzle()
+        self.build_searches()
+
+        if not self.crosswords.grid.is_rectangular():
+            raise WordSearchError("Compiled puzzle must have rows of equal length")
+
+        words = [search.word for search in self.crosswords.get_searches()]
+        compiled_path = '{}/{}{}'.format(
+            self.input_directory,
+            os.path.splitext(self.puzzle_file)[0],
+            COMPILED_EXTENSION
+        )
+
+        try:
+            write_compiled(compiled_path, self.crosswords.grid, words, diagonals)
+        except UnicodeEncodeError:
+            raise WordSearchError("Compiled puzzle must only have ASCII letters")
+
+        self._print("Compiled file: {}".format(compiled_path))
+        return compiled_path
+
+    def get_puzzle_path(self):
+        """
+        Gets the puzzle path.
+
+        :returns:   The puzzle path.
+        :rtype:     string
+
+        :raises     WordSearchError:  If puzzle file is missing
+        """
+
         puzzle_path = '{}/{}'.format(self.input_directory, self.puzzle_file)
 
         if not os.path.exists(puzzle_path):
@@ -76,44 +664,65 @@ class WordSearch(object):
                 self.puzzle_file, self.input_directory
             ))
 
-        with open(puzzle_path, 'r') as reader:
-            for line in reader.readlines():
-                # Ignore the first new lines
-                line = line.rstrip()
-                if not line and not found_string:
-                    continue
-                else:
-                    found_string = True
-
-                if not line:
-                    # Lock the first new line
-                    found_new_line = True
-                    continue
-
-                if found_new_line:
-                    """
-                    While storing word needs to be searched, also ignores whitespaces
-                    """
-                    self.validate_line(line)
-                    self.searches.append(line)
-                else:
-                    self.validate_line(line)
-                    self.puzzles.append(line)
+        return puzzle_path
 
-        return self
+    def parse_puzzle(self, lines):
+        """
+        Parse and validate the puzzle lines one at a time, the rows come first
+        and the words to search come after the first blank line.
+
+        :param      lines:  The puzzle lines, like an opened puzzle file
+        :type       lines:  iterable
+
+        :returns:   Pairs of True for a word or False for a row, and the line
+        :rtype:     generator
+        """
+
+        found_new_line = False
+        found_string = False
+
+        for line in lines:
+            # Ignore the first new lines
+            line = line.rstrip()
+            if not line and not found_string:
+                continue
+            else:
+                found_string = True
+
+            if not line:
+                # Lock the first new line
+                found_new_line = True
+                continue
 
-    def validate_line(self, word):
+            """
+            While yielding word needs to be searched, also ignores whitespaces
+            """
+            self.validate_line(line, found_new_line)
+            yield found_new_line, line
+
+    def validate_line(self, word, is_search = False):
         """
         Validate Line
 
         :param      word:             The word
         :type       word:             string
+        :param      is_search:        True for a word to search, which may
+                                      have wildcards with the pattern engine
+        :type       is_search:        boolean
 
-        :raises     WordSearchError:  If the line is not valid alphabet or is
-                                      one charcter only
+        :raises     WordSearchError:  If the line is not valid alphabet, is
+                                      one charcter only, or is a pattern
+                                      with only or consecutive stars
         """
 
-        if not str(word).isalpha():
+        letters = str(word)
+        if is_search and self.engine == CrossWords.ENGINE_PATTERN:
+            stars = CrossWords.ANY_LETTERS
+            if not letters.strip(stars) or stars * 2 in letters:
+                raise WordSearchError("{} is not a valid alphabet".format(word))
+            letters = letters.replace("?", "A").replace(stars, "A")
+
+        if not letters.isalpha():
             raise WordSearchError("{} is not a valid alphabet".format(word))
         if len(word) <= 1:
             raise WordSearchError("{} should be more than 2 characters".format(word))
@@ -129,23 +738,65 @@ class WordSearch(object):
                                       dimension
         """
 
-        if not len(self.puzzles):
+        if not len(self.crosswords.grid.rows):
             raise WordSearchError("There are no puzzles found in puzzle file")
 
-        for row in self.puzzles:
-            self.crosswords.add_row(row)
-
-        self.crosswords.init_puzzle()
+        if self.index_cache is None:
+            self.crosswords.init_puzzle()
+        else:
+            self.build_puzzle_index()
 
-        if not self.crosswords.grid.is_dimension_valid():
+        if not self.crosswords.grid.is_dimension_valid(self.allow_ragged):
             raise WordSearchError("Puzzle file must have equal dimension (X,X)")
 
+        if self.engine == CrossWords.ENGINE_INDEX:
+            self.build_suffix_index()
+
         self._print("Puzzle Preview:")
-        if not self.is_unittest_running():
+        if not self.is_quiet():
             self.crosswords.preview_grid(1)
 
         return self
 
+    def build_puzzle_index(self):
+        """
+        Use the cached index of the grid, or initialize the puzzle and cache
+        its index.
+        """
+
+        from cache import GridIndex
+
+        fingerprint = self.crosswords.grid.fingerprint()
+        index = self.index_cache.get(fingerprint)
+        if index is None:
+            self.crosswords.init_puzzle()
+            index = GridIndex(self.crosswords.grid, self.crosswords.get_straights())
+            self.index_cache.set(fingerprint, index)
+
+        self.crosswords.use_index(index)
+        return self
+
+    def build_suffix_index(self):
+        """
+        Use the cached suffix index of the grid, or build it and cache it.
+        Only a small grid has its suffix index built, a larger one is searched
+        with its n-gram index.
+        """
+
+        if self.index_cache is None or not self.crosswords.fits_suffix_index():
+            self.crosswords.build_search_index()
+            return self
+
+        from cache import SuffixIndex
+
+        key = self.crosswords.grid.fingerprint() + SuffixIndex.CACHE_SUFFIX
+        suffix_index = self.index_cache.get(key)
+        if suffix_index is None:
+            self.index_cache.set(key, self.crosswords.build_suffix_index())
+        else:
+            self.crosswords.use_suffix_index(suffix_index)
+        return self
+
     def build_searches(self):
         """
         Builds searches.
@@ -153,29 +804,130 @@ class WordSearch(object):
         :raises     WordSearchError:  If there are no searches
         """
 
-        if not len(self.searches):
+        if not len(self.crosswords.get_searches()):
             raise WordSearchError("There are no words to search found in puzzle file")
 
         self._print("Words to search:")
-        for word in self.searches:
-            self._print(word)
-            self.crosswords.add_searches(word)
+        for search in self.crosswords.get_searches():
+            self._print(search.word)
 
         return self
 
+    def stream_find(self, search):
+        """
+        Find a search read from a stream, unless the grid can not hold it,
+        the patterns are found like the pattern engine does.
+
+        :param      search:  The search
+        :type       search:  Search
+        """
+
+        if self.engine != CrossWords.ENGINE_PATTERN and self.crosswords.rejects(search):
+            return self
+        self.crosswords.find(search)
+        return self
+
+    def filter_searches(self):
+        """
+        Marks not found the words the grid can not hold, before searching.
+        The patterns are never filtered, their wildcards and mismatches may
+        match any letter.
+        """
+
+        if self.engine == CrossWords.ENGINE_PATTERN:
+            return self
+
+        pruned = self.crosswords.filter_searches()
+        self._print("Words pruned: {}".format(pruned))
+        return self
+
     def begin_search(self):
         """
         Begins a search.
         """
 
-        for search in self.crosswords.get_searches():
-            if not self.crosswords.is_in_puzzle(search):
-                continue
-            self.crosswords.sync_pointer(search)
-            search.create_coordinates()
+        if self.workers > 1:
+            return self.begin_parallel_search()
 
+        self.crosswords.search(self.engine)
         return self
 
+    def begin_parallel_search(self):
+        """
+        Begins a search with the words split across a process pool.
+
+        The grid is handed to each worker once, when the pool starts, and the
+        solved searches are merged back in the original word order.
+        """
+
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        global _search_grid
+
+        # Each distinct word is searched once, the pruned and memoized ones
+        # are not
+        searched = self.crosswords.recall_searches()
+        words = list(searched)
+        if not words:
+            return self
+
+        chunk_size = max(1, -(-len(words) // (self.workers * 4)))
+        chunks = [words[start:start + chunk_size] for start in range(0, len(words), chunk_size)]
+
+        # Forked workers inherit the grid, the others receive it once, with
+        # all its straights generated so no worker generates them again
+        grid = self.crosswords.generate_straights().grid
+        if self.engine == CrossWords.ENGINE_INDEX and self.crosswords.suffix_index is None:
+            self.crosswords.build_search_index()
+        context = multiprocessing.get_context()
+        _search_grid = (grid, self.crosswords.index, self.crosswords.suffix_index)
+        initargs = (None if context.get_start_method() == "fork" else _search_grid,)
+
+        try:
+            with ProcessPoolExecutor(max_workers = self.workers, mp_context = context,
+                    initializer = _init_search_worker, initargs = initargs) as executor:
+                results = {}
+                for solved in executor.map(_search_chunk, chunks, [self.engine] * len(chunks),
+                        [self.max_mismatches] * len(chunks)):
+                    for search in solved:
+                        results[search.word] = search.get_result()
+        finally:
+            _search_grid = None
+
+        searches = self.crosswords.get_searches()
+        for word, positions in searched.items():
+            for position in positions:
+                search = searches[position]
+                search.set_result(results[word])
+                searches[position] = search
+                self.crosswords.has_result = self.crosswords.has_result or search.was_found
+        self.crosswords.memorize_searches(searched)
+        return self
+
+    def set_cell(self, row, column, letter):
+        """
+        Changes the letter of a cell of the built puzzle, only the searches
+        the change may affect are searched again.
+
+        :param      row:              The row, starting at 0
+        :type       row:              number
+        :param      column:           The column, starting at 0
+        :type       column:           number
+        :param      letter:           The letter
+        :type       letter:           string
+
+        :returns:   The positions of the searches searched again
+        :rtype:     list
+
+        :raises     WordSearchError:  If the cell or the letter is not valid
+        """
+
+        try:
+            return self.crosswords.set_cell(row, column, letter)
+        except ValueError as e:
+            raise WordSearchError(str(e))
+
     def get_output_path(self):
         """
         Gets the output path.
@@ -186,27 +938,122 @@ class WordSearch(object):
 
         input_file = self.puzzle_file
         input_file_name = os.path.splitext(input_file)
-        output_path = '{}/{}.out'.format(self.outputs_directory, input_file_name[0])
+        output_path = '{}/{}{}'.format(
+            self.outputs_directory, input_file_name[0],
+            ResultWriter.EXTENSIONS[self.output_format]
+        )
 
         return output_path
 
-    def output_result(self):
+    def output_result(self, all_matches = None):
         """
         Output the result in output directory
+
+        :param      all_matches:  True to write every occurrence of the words,
+                                  defaults to the all matches setting
+        :type       all_matches:  boolean
         """
 
+        if all_matches is None:
+            all_matches = self.all_matches
+
         output_path = self.get_output_path()
-        with open(output_path, 'w') as output_file:
-            for search in self.crosswords.get_searches():
-                line = '{} {}\n'.format(search.word, 'not found')
-                if search.was_found:
-                    line = '{} {}\n'.format(
-                        search.word, search.print_coordinates(1)
-                    )
-                output_file.write(line)
+        with open(output_path, 'wb') as output_file:
+            with ResultWriter(output_file, self.output_format) as writer:
+                for number, search in enumerate(self.crosswords.get_searches()):
+                    self.write_result(writer, search, all_matches, number)
 
             self._print("Output file: {}".format(output_path))
 
+    def write_result(self, writer, search, all_matches = False, number = 0):
+        """
+        Writes the result of a search
+
+        :param      writer:       The result writer
+        :type       writer:       ResultWriter
+        :param      search:       The search
+        :type       search:       Search
+        :param      all_matches:  True to write every occurrence of the word
+        :type       all_matches:  boolean
+        :param      number:       The position of the word in the word list
+        :type       number:       number
+        """
+
+        for result in self.iter_search_results(search, all_matches):
+            writer.write(result, number)
+        return self
+
+    def iter_results(self, all_matches = None):
+        """
+        Iterate over the results of the searches
+
+        :param      all_matches:  True to report every occurrence of the
+                                  words, defaults to the all matches setting
+        :type       all_matches:  boolean
+
+        :returns:   The search results
+        :rtype:     generator
+        """
+
+        if all_matches is None:
+            all_matches = self.all_matches
+
+        for search in self.crosswords.get_searches():
+            for result in self.iter_search_results(search, all_matches):
+                yield result
+
+    def iter_search_results(self, search, all_matches = False):
+        """
+        Iterate over the results of one search
+
+        :param      search:       The search
+        :type       search:       Search
+        :param      all_matches:  True to report every occurrence of the word
+        :type       all_matches:  boolean
+
+        :returns:   The search results
+        :rtype:     generator
+        """
+
+        if not all_matches:
+            yield SearchResult.from_search(search)
+            return
+
+        was_found = False
+        for start, end, direction, mismatches in self.crosswords.iter_matches(search):
+            was_found = True
+            yield SearchResult(search.word, True, start, end, direction, mismatches)
+
+        if not was_found:
+            yield SearchResult(search.word)
+
+    def report_metrics(self):
+        """
+        Adds the searches and caches counts to the metrics, then export them.
+        """
+
+        metrics = self.metrics
+        if not metrics.enabled:
+            return self
+
+        searches = self.crosswords.get_searches()
+        metrics.count("searches", len(searches))
+        metrics.count("words_found", sum(1 for search in searches if search.was_found))
+        metrics.count("lines_scanned", self.crosswords.lines_scanned)
+        metrics.count("searches_pruned", self.crosswords.searches_pruned)
+        self.crosswords.lines_scanned = 0
+        self.crosswords.searches_pruned = 0
+
+        if self.memo is not None:
+            metrics.gauge("memo_hits", self.memo.hits)
+            metrics.gauge("memo_misses", self.memo.misses)
+        if self.index_cache is not None:
+            metrics.gauge("index_cache_hits", self.index_cache.hits)
+            metrics.gauge("index_cache_misses", self.index_cache.misses)
+
+        metrics.export()
+        return self
+
     def _print(self, message):
         """
         Prints the message
@@ -216,9 +1063,19 @@ class WordSearch(object):
         """
 
         """Disable outut in unittest"""
-        if not self.is_unittest_running():
+        if not self.is_quiet():
             print(message)
 
+    def is_quiet(self):
+        """
+        Determines if progress messages are disabled.
+
+        :returns:   True if quiet or unittest running, False otherwise.
+        :rtype:     boolean
+        """
+
+        return self.quiet or self.is_unittest_running()
+
     def is_unittest_running(self):
         """
         Determines if unittest running.
@@ -227,21 +1084,317 @@ class WordSearch(object):
         :rtype:     boolean
         """
 
-        return 'unittest' in sys.modules.keys()
+        if self.unittest_running is None:
+            self.unittest_running = 'unittest' in sys.modules
+        return self.unittest_running
+
+def solve(rows, words, options = None):
+    """
+    Solves a puzzle in memory
+
+    :param      rows:     The grid rows, an iterable or a new line separated
+                          string
+    :type       rows:     iterable
+    :param      words:    The words to search, an iterable or a new line
+                          separated string
+    :type       words:    iterable
+    :param      options:  The WordSearch.configure options
+    :type       options:  dictionary
+
+    :returns:   The search results
+    :rtype:     generator
+
+    :raises     WordSearchError:  If the puzzle is not valid
+    """
+
+    word_search = WordSearch()
+    word_search.set_quiet(True)
+    word_search.configure(options or {})
+    return word_search.load_puzzle(rows, words).solve()
+
+def solve_text(text, options = None):
+    """
+    Solves the content of a puzzle file in memory
+
+    :param      text:     The puzzle file content
+    :type       text:     string
+    :param      options:  The WordSearch.configure options
+    :type       options:  dictionary
+
+    :returns:   The search results
+    :rtype:     generator
+
+    :raises     WordSearchError:  If the puzzle is not valid
+    """
+
+    word_search = WordSearch()
+    word_search.set_quiet(True)
+    word_search.configure(options or {})
+    return word_search.load_puzzle_text(text).solve()
+
+_search_grid = None
+
+def _init_search_worker(grid):
+    """
+    Keeps the grid searched by a parallel search worker process
+
+    :param      grid:  The grid and its n-gram and suffix indexes, None when
+                       inherited from a forked parent
+    :type       grid:  tuple
+    """
+
+    global _search_grid
+
+    if grid is not None:
+        _search_grid = grid
+
+def _search_chunk(words, engine, max_mismatches = 0):
+    """
+    Search a chunk of words in the worker grid
+
+    :param      words:           The words
+    :type       words:           list
+    :param      engine:          The search engine
+    :type       engine:          string
+    :param      max_mismatches:  The mismatches allowed by the pattern engine
+    :type       max_mismatches:  number
+
+    :returns:   The solved searches in the words order
+    :rtype:     list
+    """
+
+    crosswords = CrossWords()
+    crosswords.grid, crosswords.index, crosswords.suffix_index = _search_grid
+    crosswords.max_mismatches = max_mismatches
+    for word in words:
+        crosswords.add_searches(word)
+    crosswords.search(engine)
+    return crosswords.get_searches()
+
+_batch_word_search = None
+
+def _init_batch_worker(input_directory, outputs_directory, options):
+    """
+    Creates the word search pipeline reused by a batch worker process
+
+    :param      input_directory:    The input directory
+    :type       input_directory:    string
+    :param      outputs_directory:  The outputs directory
+    :type       outputs_directory:  string
+    :param      options:            The WordSearch.configure options
+    :type       options:            dictionary
+    """
+
+    global _batch_word_search
+
+    _batch_word_search = WordSearch()
+    _batch_word_search.input_directory = input_directory
+    _batch_word_search.outputs_directory = outputs_directory
+    _batch_word_search.configure(options)
+    _batch_word_search.set_quiet(True)
+
+def _solve_batch_file(puzzle_file):
+    """
+    Solves one puzzle file with the worker pipeline
+
+    :param      puzzle_file:  The puzzle file
+    :type       puzzle_file:  string
+
+    :returns:   The puzzle file, the elapsed seconds and the error if any
+    :rtype:     tuple
+    """
+
+    error = None
+    started = time.perf_counter()
+    try:
+        _batch_word_search.reset()
+        _batch_word_search.set_puzzle_file(puzzle_file)
+        _batch_word_search.run_search()
+    except Exception as e:
+        error = str(e)
+    return (puzzle_file, time.perf_counter() - started, error)
+
+def run_batch(input_directory, workers = None, outputs_directory = "outputs", options = None):
+    """
+    Solves every puzzle file of a directory with a process pool, each puzzle
+    writes its own output file.
+
+    :param      input_directory:    The directory of the puzzle files
+    :type       input_directory:    string
+    :param      workers:            The number of worker processes, defaults to
+                                    the number of cores
+    :type       workers:            number
+    :param      outputs_directory:  The outputs directory
+    :type       outputs_directory:  string
+    :param      options:            The WordSearch.configure options of the
+                                    worker pipelines
+    :type       options:            dictionary
+
+    :returns:   The puzzle file, the elapsed seconds and the error of every
+                puzzle, sorted by puzzle file
+    :rtype:     list
+
+    :raises     WordSearchError:    If the input directory is missing
+    """
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    if not os.path.isdir(input_directory):
+        raise WordSearchError("directory {} not found".format(input_directory))
+
+    puzzle_files = sorted(
+        name for name in os.listdir(input_directory) if name.endswith(".pzl")
+    )
+    if not puzzle_files:
+        return []
+
+    os.makedirs(outputs_directory, exist_ok = True)
+
+    initargs = (input_directory, outputs_directory, dict(options or {}))
+    with ProcessPoolExecutor(max_workers = workers,
+            initializer = _init_batch_worker, initargs = initargs) as executor:
+        return list(executor.map(_solve_batch_file, puzzle_files))
+
+def print_batch_summary(results):
+    """
+    Prints the timing and errors of a batch run
+
+    :param      results:  The batch results
+    :type       results:  list
+    """
+
+    errors = 0
+    for puzzle_file, elapsed, error in results:
+        status = "ok"
+        if error:
+            errors += 1
+            status = "error : " + error
+        print("{:<40} {:>10.4f}s  {}".format(puzzle_file, elapsed, status))
+
+    print("\n")
+    print("Solved {} puzzle files, {} errors, {:.4f}s total".format(
+        len(results) - errors, errors, sum(result[1] for result in results)
+    ))
 
 if __name__ == "__main__":
 
     """Run as a script"""
 
-    if len(sys.argv) <= 1:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Search words in a puzzle file")
+    parser.add_argument("puzzle_file", nargs="?", help="puzzle file in the puzzles directory")
+    parser.add_argument("--version", action="version", version="%(prog)s " + __version__)
+    parser.add_argument(
+        "--engine", default=CrossWords.ENGINE_SCAN, type=str.upper,
+        choices=CrossWords.ENGINES, help="search engine to use"
+    )
+    parser.add_argument(
+        "--backend", default=CrossWords.BACKEND_PYTHON, type=str.upper,
+        choices=CrossWords.BACKENDS, help="grid backend to use"
+    )
+    parser.add_argument(
+        "--all", dest="all_matches", action="store_true",
+        help="write every occurrence of the words"
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="search and write the words one at a time while reading the puzzle"
+    )
+    parser.add_argument(
+        "--words", metavar="SOURCE", type=argparse.FileType("r"),
+        help="search the words read from a file or - for stdin, writing every result to stdout"
+    )
+    parser.add_argument(
+        "--compile", action="store_true",
+        help="compile the puzzle file to a binary {} file".format(COMPILED_EXTENSION)
+    )
+    parser.add_argument(
+        "--skip-diagonals", action="store_true",
+        help="do not store the diagonals in the compiled puzzle"
+    )
+    parser.add_argument(
+        "--mismatches", type=int, default=0,
+        help="letters a match may have differing from the word, with the pattern engine"
+    )
+    parser.add_argument(
+        "--format", dest="output_format", default=ResultWriter.FORMAT_TEXT, type=str.upper,
+        choices=ResultWriter.FORMATS, help="format of the output file"
+    )
+    parser.add_argument(
+        "--ragged", action="store_true",
+        help="allow grid rows of different lengths"
+    )
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="keep the searches in a columnar store for very large word lists"
+    )
+    parser.add_argument("--cache-dir", help="directory caching the grid indexes")
+    parser.add_argument("--memo", type=int, default=0, help="number of search results memoized")
+    parser.add_argument("--batch", metavar="DIRECTORY", help="solve every puzzle file of a directory")
+    parser.add_argument("--workers", type=int, help="number of batch or search worker processes")
+    parser.add_argument("--outputs", default="outputs", help="outputs directory of the batch")
+    parser.add_argument(
+        "--metrics", metavar="TARGET",
+        help="collect the stages and searches metrics, log or a Prometheus text file path"
+    )
+    parser.add_argument(
+        "--metrics-allocations", action="store_true",
+        help="also count the allocations of every stage"
+    )
+    args = parser.parse_args()
+
+    options = {
+        "engine": args.engine,
+        "backend": args.backend,
+        "all_matches": args.all_matches,
+        "compact": args.compact,
+        "max_mismatches": args.mismatches,
+        "allow_ragged": args.ragged,
+        "output_format": args.output_format,
+        "cache_directory": args.cache_dir,
+        "memo_entries": args.memo,
+        "metrics": args.metrics,
+        "metrics_allocations": args.metrics_allocations,
+    }
+
+    if args.batch:
+        try:
+            print_batch_summary(run_batch(args.batch, args.workers, args.outputs, options))
+        except Exception as e:
+            print("Problem running batch word search error : " + str(e))
+        exit()
+
+    if not args.puzzle_file:
         print("Missing puzzle file as first argument")
         print("EG: python WordSearch.py puzzle1.pzl")
         exit()
 
+    if args.words:
+        # The standard output only has the results
+        try:
+            word_search = WordSearch().set_quiet(True)
+            word_search.set_puzzle_file(args.puzzle_file)
+            word_search.configure(options)
+            word_search.run_word_stream(args.words)
+        except BrokenPipeError:
+            # The reader is gone, nothing is left to flush at exit
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        except Exception as e:
+            print("Problem running word search error : " + str(e), file=sys.stderr)
+        exit()
+
     try:
         word_search = WordSearch();
-        word_search.set_puzzle_file(sys.argv[1]);
-        word_search.run_search();
+        word_search.set_puzzle_file(args.puzzle_file);
+        word_search.configure(options);
+        word_search.set_workers(args.workers);
+        if args.compile:
+            word_search.compile_puzzle_file(not args.skip_diagonals);
+        elif args.stream:
+            word_search.run_stream_search();
+        else:
+            word_search.run_search();
         print("\n")
         print("Done searching please see directory outputs")
     except Exception as e:
@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from puzzle import CrossWords
+from WordSearch import WordSearch
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+"""All eight directions as (row step, column step)"""
+DIRECTIONS = [
+    (0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (-1, -1), (1, -1), (-1, 1)
+]
+
+PHASES = (
+    "read_puzzle_file", "build_puzzle", "build_searches", "filter_searches", "begin_search",
+    "output_result"
+)
+
+def generate_puzzle(size, word_count, planted_ratio = 0.5, min_length = 3,
+        max_length = 10, seed = None):
+    """
+    Generates a random square puzzle with words planted in every direction
+
+    :param      size:           The number of rows and columns
+    :type       size:           number
+    :param      word_count:     The number of words to search
+    :type       word_count:     number
+    :param      planted_ratio:  The part of the words planted in the grid
+    :type       planted_ratio:  number
+    :param      min_length:     The minimum word length
+    :type       min_length:     number
+    :param      max_length:     The maximum word length
+    :type       max_length:     number
+    :param      seed:           The random seed
+    :type       seed:           number
+
+    :returns:   The grid rows and the words to search
+    :rtype:     tuple
+    """
+
+    generator = random.Random(seed)
+    max_length = max(min_length, min(max_length, size))
+    min_length = min(min_length, max_length)
+    grid = [
+        bytearray(generator.choices(LETTERS.encode("ascii"), k = size))
+        for row in range(0, size)
+    ]
+
+    words = []
+    for number in range(0, word_count):
+        length = generator.randint(min_length, max_length)
+        word = "".join(generator.choices(LETTERS, k = length))
+        words.append(word)
+
+        if generator.random() >= planted_ratio:
+            continue
+
+        row_step, column_step = generator.choice(DIRECTIONS)
+        row = generator.randrange(0, size) if not row_step else (
+            generator.randrange(0, size - length + 1) if row_step > 0
+            else generator.randrange(length - 1, size)
+        )
+        column = generator.randrange(0, size) if not column_step else (
+            generator.randrange(0, size - length + 1) if column_step > 0
+            else generator.randrange(length - 1, size)
+        )
+        for letter in word.encode("ascii"):
+            grid[row][column] = letter
+            row += row_step
+            column += column_step
+
+    return [row.decode("ascii") for row in grid], words
+
+def write_puzzle(path, rows, words):
+    """
+    Writes a puzzle file
+
+    :param      path:   The puzzle path
+    :type       path:   string
+    :param      rows:   The grid rows
+    :type       rows:   list
+    :param      words:  The words to search
+    :type       words:  list
+    """
+
+    with open(path, "w") as writer:
+        writer.write("\n".join(rows))
+        writer.write("\n\n")
+        writer.write("\n".join(words))
+        writer.write("\n")
+
+def time_run_search(directory, puzzle_file, engine, backend):
+    """
+    Times every phase of WordSearch.run_search
+
+    :param      directory:    The directory of the puzzle and output files
+    :type       directory:    string
+    :param      puzzle_file:  The puzzle file
+    :type       puzzle_file:  string
+    :param      engine:       The search engine
+    :type       engine:       string
+    :param      backend:      The grid backend
+    :type       backend:      string
+
+    :returns:   The seconds spent in each phase and the number of words found
+    :rtype:     tuple
+    """
+
+    word_search = WordSearch()
+    word_search.input_directory = directory
+    word_search.outputs_directory = directory
+    word_search.set_quiet(True)
+    word_search.set_backend(backend)
+    word_search.set_engine(engine)
+    word_search.set_puzzle_file(puzzle_file)
+
+    phases = {}
+    for phase in PHASES:
+        started = time.perf_counter()
+        getattr(word_search, phase)()
+        phases[phase] = time.perf_counter() - started
+
+    found = sum(1 for search in word_search.crosswords.get_searches() if search.was_found)
+    return phases, found
+
+def get_default_engines(size):
+    """
+    Gets the engines benchmarked by default on a grid, the index engine only
+    when the grid is small enough to build its suffix index
+
+    :param      size:  The grid size
+    :type       size:  number
+
+    :returns:   The search engines
+    :rtype:     list
+    """
+
+    return [
+        engine for engine in CrossWords.ENGINES
+        if engine != CrossWords.ENGINE_INDEX or size * size <= CrossWords.SUFFIX_INDEX_CELLS
+    ]
+
+def run_benchmark(sizes, word_counts, engines = None,
+        backends = (CrossWords.BACKEND_PYTHON,), seed = 0):
+    """
+    Runs the benchmark of every size, word count, engine and backend
+
+    :param      sizes:        The grid sizes
+    :type       sizes:        list
+    :param      word_counts:  The word list sizes
+    :type       word_counts:  list
+    :param      engines:      The search engines, None for the default engines
+                              of each size
+    :type       engines:      list
+    :param      backends:     The grid backends
+    :type       backends:     list
+    :param      seed:         The random seed
+    :type       seed:         number
+
+    :returns:   The benchmark report
+    :rtype:     dictionary
+    """
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": [],
+    }
+
+    directory = tempfile.mkdtemp(prefix = "wordsearch-benchmark-")
+    try:
+        for size in sizes:
+            for word_count in word_counts:
+                rows, words = generate_puzzle(size, word_count, seed = seed)
+                puzzle_file = "benchmark_{}_{}.pzl".format(size, word_count)
+                write_puzzle(os.path.join(directory, puzzle_file), rows, words)
+                del rows, words
+
+                for backend in backends:
+                    for engine in engines or get_default_engines(size):
+                        phases, found = time_run_search(directory, puzzle_file, engine, backend)
+                        report["results"].append({
+                            "size": size,
+                            "words": word_count,
+                            "engine": engine,
+                            "backend": backend,
+                            "found": found,
+                            "phases": phases,
+                            "total": sum(phases.values()),
+                        })
+    finally:
+        shutil.rmtree(directory, ignore_errors = True)
+
+    return report
+
+if __name__ == "__main__":
+
+    """Run as a script"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the word search engines")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="grid sizes")
+    parser.add_argument("--words", type=int, nargs="+", default=[100, 1000], help="word list sizes")
+    parser.add_argument(
+        "--engines", type=str.upper, nargs="+", choices=CrossWords.ENGINES,
+        help="search engines to compare, all but index on large grids by default"
+    )
+    parser.add_argument(
+        "--backends", type=str.upper, nargs="+", default=[CrossWords.BACKEND_PYTHON],
+        choices=CrossWords.BACKENDS, help="grid backends to compare"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--output", default="benchmark.json", help="JSON report path, - for stdout")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.sizes, args.words, args.engines, args.backends, args.seed)
+
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        with open(args.output, "w") as writer:
+            json.dump(report, writer, indent=2)
+
+    for result in report["results"]:
+        print("{size:>6}x{size:<6} {words:>8} words  {engine:<10} {backend:<7} {total:>10.4f}s  {found} found".format(**result))
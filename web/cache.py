@@ -0,0 +1,453 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+import bisect
+import copy
+import os
+import pickle
+import time
+from array import array
+from collections import OrderedDict
+
+from matcher import SuffixArray
+
+class LRUCache:
+    """
+    This class describes a bounded least recently used cache.
+
+    Entries can also expire a number of seconds after being set.
+    """
+
+    def __init__(self, max_entries = 128, ttl = None):
+        """
+        Constructs a new instance.
+
+        :param      max_entries:  The maximum number of entries kept
+        :type       max_entries:  number
+        :param      ttl:          The seconds an entry is kept, None to keep
+                                  them until evicted
+        :type       ttl:          number
+        """
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.expires = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default = None):
+        """
+        Gets a value and mark it as recently used.
+
+        :param      key:      The key
+        :type       key:      string
+        :param      default:  The value when the key is missing
+        :type       default:  object
+
+        :returns:   The value
+        :rtype:     object
+        """
+
+        if key in self.expires and self.expires[key] <= time.monotonic():
+            del self.entries[key]
+            del self.expires[key]
+
+        if key not in self.entries:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def set(self, key, value):
+        """
+        Sets a value, evicting the least recently used entries over the limit.
+
+        :param      key:    The key
+        :type       key:    string
+        :param      value:  The value
+        :type       value:  object
+        """
+
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if self.ttl is not None:
+            self.expires[key] = time.monotonic() + self.ttl
+
+        while len(self.entries) > self.max_entries:
+            evicted, value = self.entries.popitem(last = False)
+            self.expires.pop(evicted, None)
+        return self
+
+    def clear(self):
+        """
+        Removes every entry and resets the counters.
+        """
+
+        self.entries.clear()
+        self.expires.clear()
+        self.hits = 0
+        self.misses = 0
+        return self
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+class GridIndex:
+    """
+    This class describes the precomputed index of a grid.
+
+    Keeps the grid with all its straights generated along with an n-gram index
+    mapping each n letters to the straights holding them, in searching order.
+    """
+
+    NGRAM_SIZE = 3
+
+    def __init__(self, grid, families):
+        """
+        Constructs a new instance.
+
+        :param      grid:      The grid, with its straights generated
+        :type       grid:      Grid
+        :param      families:  The search directions in searching order
+        :type       families:  list
+        """
+
+        self.grid = grid
+        self.lines = []
+        self.ngrams = {}
+
+        for found_by, straights in families:
+            for index, straight in enumerate(straights):
+                line_number = len(self.lines)
+                self.lines.append((found_by, index))
+
+                for ngram in self.get_ngrams(str(straight)):
+                    self.ngrams.setdefault(ngram, []).append(line_number)
+
+    def copy(self):
+        """
+        Copies the index and its grid, so they can be changed without changing
+        the cached ones.
+
+        :returns:   The copy
+        :rtype:     GridIndex
+        """
+
+        index = GridIndex(copy.deepcopy(self.grid), [])
+        index.lines = list(self.lines)
+        index.ngrams = {ngram: list(posting) for ngram, posting in self.ngrams.items()}
+        return index
+
+    def update_lines(self, changes):
+        """
+        Index again straights changed in the grid.
+
+        :param      changes:  The (direction, index) of every changed straight
+                              with its previous and current letters
+        :type       changes:  list
+        """
+
+        line_numbers = dict((line, number) for number, line in enumerate(self.lines))
+
+        for line, previous, straight in changes:
+            line_number = line_numbers.get(line)
+            if line_number is None:
+                continue
+
+            for ngram in self.get_ngrams(str(previous)):
+                posting = self.ngrams[ngram]
+                position = bisect.bisect_left(posting, line_number)
+                if position < len(posting) and posting[position] == line_number:
+                    del posting[position]
+                if not posting:
+                    del self.ngrams[ngram]
+
+            for ngram in self.get_ngrams(str(straight)):
+                posting = self.ngrams.setdefault(ngram, [])
+                position = bisect.bisect_left(posting, line_number)
+                if position == len(posting) or posting[position] != line_number:
+                    posting.insert(position, line_number)
+
+        return self
+
+    def get_ngrams(self, straight):
+        """
+        Gets the distinct n-grams of a straight.
+
+        :param      straight:  The straight letters
+        :type       straight:  string
+
+        :returns:   The n-grams
+        :rtype:     set
+        """
+
+        return set(
+            straight[start:start + self.NGRAM_SIZE]
+            for start in range(0, len(straight) - self.NGRAM_SIZE + 1)
+        )
+
+    def candidate_lines(self, word):
+        """
+        Gets the straights that may hold the word or its reverse.
+
+        :param      word:  The word
+        :type       word:  string
+
+        :returns:   The (direction, index) of the candidate straights in
+                    searching order, None when the word is too short to be
+                    looked up
+        :rtype:     list
+        """
+
+        if len(word) < self.NGRAM_SIZE:
+            return None
+
+        line_numbers = set()
+        for pattern in set((word, word[::-1])):
+            line_numbers.update(self.lookup(pattern))
+
+        return [self.lines[line_number] for line_number in sorted(line_numbers)]
+
+    def lookup(self, pattern):
+        """
+        Gets the straights holding every n-gram of a pattern.
+
+        :param      pattern:  The pattern
+        :type       pattern:  string
+
+        :returns:   The line numbers
+        :rtype:     set
+        """
+
+        postings = []
+        for start in range(0, len(pattern) - self.NGRAM_SIZE + 1):
+            posting = self.ngrams.get(pattern[start:start + self.NGRAM_SIZE])
+            if posting is None:
+                return set()
+            postings.append(posting)
+
+        postings.sort(key = len)
+        line_numbers = set(postings[0])
+        for posting in postings[1:]:
+            line_numbers.intersection_update(posting)
+            if not line_numbers:
+                break
+        return line_numbers
+
+class SuffixIndex:
+    """
+    This class describes a suffix array index of a grid.
+
+    All the straights are joined in searching order with a separator, so a
+    word is located in the length of the word and the number of its
+    occurrences, whatever the size of the grid.
+    """
+
+    SEPARATOR = "\n"
+
+    """Suffix of the grid fingerprint keying the suffix index in the cache"""
+    CACHE_SUFFIX = ".suffixes"
+
+    def __init__(self, families):
+        """
+        Constructs a new instance.
+
+        :param      families:  The search directions in searching order
+        :type       families:  list
+        """
+
+        self.lines = []
+        self.line_starts = array("I")
+
+        letters = []
+        start = 0
+        for found_by, straights in families:
+            for index, straight in enumerate(straights):
+                straight = str(straight)
+                self.lines.append((found_by, index))
+                self.line_starts.append(start)
+                letters.append(straight)
+                start += len(straight) + len(self.SEPARATOR)
+
+        self.suffixes = SuffixArray(self.SEPARATOR.join(letters))
+
+    def locate(self, word):
+        """
+        Locates the first straight holding the word or its reverse, like
+        scanning the straights in searching order would.
+
+        :param      word:  The word
+        :type       word:  string
+
+        :returns:   The direction and index of the straight, True when the
+                    reverse is in it, and the position of the word in it;
+                    None when not found
+        :rtype:     tuple
+        """
+
+        firsts = []
+        for pattern in (word, word[::-1]):
+            firsts.append(min(self.suffixes.iter_positions(pattern), default = None))
+
+        found = [first for first in firsts if first is not None]
+        if not found:
+            return None
+
+        # The straights are joined in searching order, the first position
+        # is in the first straight
+        line_number = bisect.bisect_right(self.line_starts, min(found)) - 1
+        start = self.line_starts[line_number]
+        end = len(self.suffixes.text)
+        if line_number + 1 < len(self.line_starts):
+            end = self.line_starts[line_number + 1]
+
+        found_by, index = self.lines[line_number]
+        if firsts[1] is not None and firsts[1] < end:
+            return found_by, index, True, firsts[1] - start
+        return found_by, index, False, firsts[0] - start
+
+class GridIndexCache:
+    """
+    This class describes a cache of grid indexes keyed by grid fingerprint.
+
+    Indexes are kept in a bounded in memory LRU cache and, when a directory is
+    given, pickled on disk with the oldest files removed over the size limit.
+    """
+
+    EXTENSION = ".idx"
+
+    def __init__(self, directory = None, max_entries = 32, max_disk_bytes = 256 * 1024 * 1024):
+        """
+        Constructs a new instance.
+
+        :param      directory:       The cache directory, None to only cache in
+                                     memory
+        :type       directory:       string
+        :param      max_entries:     The maximum number of indexes in memory
+        :type       max_entries:     number
+        :param      max_disk_bytes:  The maximum size of the cache directory
+        :type       max_disk_bytes:  number
+        """
+
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = LRUCache(max_entries)
+        self.hits = 0
+        self.misses = 0
+
+        if directory:
+            os.makedirs(directory, exist_ok = True)
+
+    def get(self, key):
+        """
+        Gets an index from memory, then from disk.
+
+        :param      key:  The grid fingerprint
+        :type       key:  string
+
+        :returns:   The index or None when not cached
+        :rtype:     GridIndex
+        """
+
+        index = self.memory.get(key)
+        if index is None and self.directory:
+            index = self.read(key)
+            if index is not None:
+                self.memory.set(key, index)
+
+        if index is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return index
+
+    def set(self, key, index):
+        """
+        Sets an index in memory and on disk.
+
+        :param      key:    The grid fingerprint
+        :type       key:    string
+        :param      index:  The index
+        :type       index:  GridIndex
+        """
+
+        self.memory.set(key, index)
+        if self.directory:
+            self.write(key, index)
+            self.evict()
+        return self
+
+    def get_path(self, key):
+        """
+        Gets the path of a cached index.
+
+        :param      key:  The grid fingerprint
+        :type       key:  string
+
+        :returns:   The path
+        :rtype:     string
+        """
+
+        return os.path.join(self.directory, key + self.EXTENSION)
+
+    def read(self, key):
+        """
+        Reads an index from disk.
+
+        :param      key:  The grid fingerprint
+        :type       key:  string
+
+        :returns:   The index or None when missing or unreadable
+        :rtype:     GridIndex
+        """
+
+        path = self.get_path(key)
+        try:
+            with open(path, "rb") as reader:
+                index = pickle.load(reader)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        return index
+
+    def write(self, key, index):
+        """
+        Writes an index on disk.
+
+        :param      key:    The grid fingerprint
+        :type       key:    string
+        :param      index:  The index
+        :type       index:  GridIndex
+        """
+
+        path = self.get_path(key)
+        with open(path + ".tmp", "wb") as writer:
+            pickle.dump(index, writer, pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+        return self
+
+    def evict(self):
+        """
+        Removes the least recently used index files over the size limit.
+        """
+
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith(self.EXTENSION):
+                stat = os.stat(os.path.join(self.directory, name))
+                files.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for mtime, size, name in files)
+        for mtime, size, name in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+        return self
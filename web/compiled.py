@@ -0,0 +1,342 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+import mmap
+import struct
+
+from puzzle import Grid
+
+MAGIC = b"WSPZ"
+VERSION = 1
+HAS_DIAGONALS = 1
+
+"""
+Compiled puzzle layout, every offset is from the start of the file:
+
+    header          HEADER struct below
+    horizontals     row_count lines of column_count bytes, row-major
+    verticals       column_count lines of row_count bytes, column-major
+    diagonals       optional, diagonals then anti diagonals in Grid order
+    words           the words to search separated by a new line
+"""
+HEADER = struct.Struct("<4sHHIIIQQQQQQ")
+
+def diagonal_layout(row_count, column_count):
+    """
+    Gets the origin and length of every diagonal then anti diagonal, in the
+    order Grid.generate_diagonals builds them.
+
+    :param      row_count:     The row count
+    :type       row_count:     number
+    :param      column_count:  The column count
+    :type       column_count:  number
+
+    :returns:   The diagonals and anti diagonals lists of (origin, length)
+    :rtype:     tuple
+    """
+
+    diagonals = []
+    for offset in range(1 - row_count, column_count):
+        row, column = max(0, -offset), max(0, offset)
+        diagonals.append(((row, column), min(row_count - row, column_count - column)))
+
+    anti_diagonals = []
+    for offset in range(0, row_count + column_count - 1):
+        row, column = max(0, offset - column_count + 1), min(offset, column_count - 1)
+        anti_diagonals.append(((row, column), min(row_count - row, column + 1)))
+
+    return diagonals, anti_diagonals
+
+def write_compiled(path, grid, words, diagonals = True):
+    """
+    Writes a compiled puzzle file from a generated grid.
+
+    :param      path:       The compiled puzzle path
+    :type       path:       string
+    :param      grid:       The grid, with its straights generated
+    :type       grid:       Grid
+    :param      words:      The words to search
+    :type       words:      list
+    :param      diagonals:  True to store the diagonals
+    :type       diagonals:  boolean
+    """
+
+    sections = [
+        "".join(grid.horizontals).encode("ascii"),
+        "".join(grid.verticals).encode("ascii"),
+        b"",
+        b"",
+        "\n".join(words).encode("ascii"),
+    ]
+    if diagonals:
+        sections[2] = "".join(grid.diagonals).encode("ascii")
+        sections[3] = "".join(grid.anti_diagonals).encode("ascii")
+
+    offsets = []
+    position = HEADER.size
+    for section in sections:
+        offsets.append(position)
+        position += len(section)
+
+    with open(path, "wb") as writer:
+        writer.write(HEADER.pack(
+            MAGIC, VERSION, HAS_DIAGONALS if diagonals else 0,
+            grid.row_max_count, grid.column_max_count, len(words),
+            offsets[0], offsets[1], offsets[2], offsets[3], offsets[4],
+            len(sections[4])
+        ))
+        for section in sections:
+            writer.write(section)
+
+class MappedLine:
+    """
+    This class describes a straight read in place from a memory map.
+
+    Supports the string operations used by the searches, `in` and `find`,
+    without copying the letters out of the map.
+    """
+
+    __slots__ = ("buffer", "start", "length")
+
+    def __init__(self, buffer, start, length):
+        """
+        Constructs a new instance.
+
+        :param      buffer:  The memory map
+        :type       buffer:  mmap
+        :param      start:   The line start in the map
+        :type       start:   number
+        :param      length:  The line length
+        :type       length:  number
+        """
+
+        self.buffer = buffer
+        self.start = start
+        self.length = length
+
+    def find(self, word, start = 0):
+        """
+        Find the lowest offset of the word in the line.
+
+        :param      word:   The word
+        :type       word:   string
+        :param      start:  The offset to start from
+        :type       start:  number
+
+        :returns:   The offset or -1 when not found
+        :rtype:     number
+        """
+
+        try:
+            word = word.encode("ascii")
+        except UnicodeEncodeError:
+            return -1
+
+        position = self.buffer.find(word, self.start + start, self.start + self.length)
+        return position - self.start if position != -1 else -1
+
+    def __contains__(self, word):
+        return self.find(word) != -1
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("line index out of range")
+        return chr(self.buffer[self.start + index])
+
+    def __iter__(self):
+        return iter(str(self))
+
+    def __str__(self):
+        return self.buffer[self.start:self.start + self.length].decode("ascii")
+
+    def __eq__(self, other):
+        return str(self) == str(other)
+
+    def __hash__(self):
+        return hash(str(self))
+
+class MappedLines:
+    """
+    This class describes a list of straights stored back to back in a memory
+    map.
+    """
+
+    def __init__(self, buffer, starts, lengths):
+        """
+        Constructs a new instance.
+
+        :param      buffer:   The memory map
+        :type       buffer:   mmap
+        :param      starts:   The start of every line
+        :type       starts:   list
+        :param      lengths:  The length of every line
+        :type       lengths:  list
+        """
+
+        self.buffer = buffer
+        self.starts = starts
+        self.lengths = lengths
+
+    @classmethod
+    def uniform(cls, buffer, start, count, length):
+        """
+        Creates lines of the same length.
+
+        :param      buffer:  The memory map
+        :type       buffer:  mmap
+        :param      start:   The first line start
+        :type       start:   number
+        :param      count:   The line count
+        :type       count:   number
+        :param      length:  The length of every line
+        :type       length:  number
+
+        :returns:   The mapped lines
+        :rtype:     MappedLines
+        """
+
+        return cls(buffer, range(start, start + count * length, length), [length] * count)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        return MappedLine(self.buffer, self.starts[index], self.lengths[index])
+
+    def __iter__(self):
+        for index in range(0, len(self.starts)):
+            yield MappedLine(self.buffer, self.starts[index], self.lengths[index])
+
+class MappedGrid(Grid):
+    """
+    This class describes a grid searched in place from a compiled puzzle
+    file, loading it costs a memory map instead of a parse.
+    """
+
+    def __init__(self, path):
+        """
+        Constructs a new instance.
+
+        :param      path:  The compiled puzzle path
+        :type       path:  string
+
+        :raises     ValueError:  If the file is not a compiled puzzle
+        """
+
+        super().__init__()
+        self.path = path
+
+        with open(path, "rb") as reader:
+            self.buffer = mmap.mmap(reader.fileno(), 0, access = mmap.ACCESS_READ)
+
+        if len(self.buffer) < HEADER.size:
+            self.close()
+            raise ValueError("{} is not a compiled puzzle".format(path))
+
+        (magic, version, self.flags, row_count, column_count, self.word_count,
+            rows_offset, columns_offset, diagonals_offset, anti_diagonals_offset,
+            self.words_offset, self.words_size) = HEADER.unpack_from(self.buffer)
+
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError("{} is not a compiled puzzle".format(path))
+
+        self.row_max_count = row_count
+        self.column_min_count = column_count
+        self.column_max_count = column_count
+        self.rows = MappedLines.uniform(self.buffer, rows_offset, row_count, column_count)
+        self.cells = self.rows
+        self.horizontals = self.rows
+        self.verticals = MappedLines.uniform(
+            self.buffer, columns_offset, column_count, row_count
+        )
+
+        diagonals, anti_diagonals = diagonal_layout(row_count, column_count)
+        self.diagonal_origins = [origin for origin, length in diagonals]
+        self.anti_diagonal_origins = [origin for origin, length in anti_diagonals]
+        if self.flags & HAS_DIAGONALS:
+            self.diagonals = self.map_lines(diagonals_offset, diagonals)
+            self.anti_diagonals = self.map_lines(anti_diagonals_offset, anti_diagonals)
+
+    def map_lines(self, offset, layout):
+        """
+        Map the lines stored back to back from an offset.
+
+        :param      offset:  The offset of the first line
+        :type       offset:  number
+        :param      layout:  The (origin, length) of every line
+        :type       layout:  list
+
+        :returns:   The mapped lines
+        :rtype:     MappedLines
+        """
+
+        starts = []
+        lengths = []
+        for origin, length in layout:
+            starts.append(offset)
+            lengths.append(length)
+            offset += length
+        return MappedLines(self.buffer, starts, lengths)
+
+    def iter_words(self):
+        """
+        Iterate over the words to search stored in the compiled puzzle
+
+        :returns:   The words
+        :rtype:     generator
+        """
+
+        start = self.words_offset
+        end = self.words_offset + self.words_size
+        while start < end:
+            stop = self.buffer.find(b"\n", start, end)
+            if stop == -1:
+                stop = end
+            yield self.buffer[start:stop].decode("ascii")
+            start = stop + 1
+
+    def add_row(self, row):
+        raise ValueError("a compiled puzzle grid can not be changed")
+
+    def set_cell(self, row, column, letter):
+        raise ValueError("a compiled puzzle grid can not be changed")
+
+    def generate_cells(self):
+        return self
+
+    def generate_horizontals(self):
+        return self
+
+    def generate_verticals(self):
+        return self
+
+    def generate_diagonals(self):
+        """
+        Generate the diagonals when the compiled puzzle does not store them
+        """
+
+        if self.flags & HAS_DIAGONALS:
+            return self
+        return super().generate_diagonals()
+
+    def close(self):
+        """
+        Closes the memory map.
+        """
+
+        self.buffer.close()
+        return self
+
+    def __getstate__(self):
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+        self.generate_diagonals()
@@ -0,0 +1,405 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+from array import array
+
+class AhoCorasick:
+    """
+    This class describes an Aho-Corasick automaton.
+
+    Every added word becomes a path in a trie, the failure links turn the trie
+    into an automaton that reports all the words found in a text in one pass.
+    """
+
+    def __init__(self):
+        """
+        Constructs a new instance.
+        """
+
+        self.goto = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+        self.transitions = []
+        self.is_built = False
+
+    def add_word(self, word, payload):
+        """
+        Adds a word to the trie.
+
+        :param      word:     The word
+        :type       word:     string
+        :param      payload:  The value reported when the word is matched
+        :type       payload:  object
+        """
+
+        state = 0
+        for letter in word:
+            next_state = self.goto[state].get(letter)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][letter] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            state = next_state
+        self.outputs[state].append((len(word), payload))
+        self.is_built = False
+        return self
+
+    def build(self):
+        """
+        Builds the failure links in breadth first order.
+        """
+
+        queue = list(self.goto[0].values())
+        for state in queue:
+            self.fail[state] = 0
+
+        for state in queue:
+            for letter, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and letter not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(letter, 0)
+                self.outputs[next_state] = (
+                    self.outputs[next_state] +
+                    self.outputs[self.fail[next_state]]
+                )
+
+        self.transitions = [{} for state in self.goto]
+        self.is_built = True
+        return self
+
+    def get_order(self):
+        """
+        Gets the states in breadth first order, every state comes after the
+        state of its failure link.
+
+        :returns:   The states
+        :rtype:     list
+        """
+
+        order = [0]
+        for state in order:
+            order.extend(self.goto[state].values())
+        return order
+
+    def next_state(self, state, letter):
+        """
+        Gets the state following a letter through the failure links, the
+        transition is kept so the links are followed once per state and
+        letter.
+
+        :param      state:   The state
+        :type       state:   number
+        :param      letter:  The letter
+        :type       letter:  string
+
+        :returns:   The next state
+        :rtype:     number
+        """
+
+        target = state
+        while target and letter not in self.goto[target]:
+            target = self.fail[target]
+        next_state = self.goto[target].get(letter, 0)
+        self.transitions[state][letter] = next_state
+        return next_state
+
+    def find_states(self, text):
+        """
+        Gets the states reached reading the text, the payloads of their
+        outputs are all the words in the text.
+
+        :param      text:  The text
+        :type       text:  string
+
+        :returns:   The states
+        :rtype:     set
+        """
+
+        if not self.is_built:
+            self.build()
+
+        transitions = self.transitions
+        state = 0
+        states = set()
+        for letter in text:
+            following = transitions[state].get(letter)
+            if following is None:
+                following = self.next_state(state, letter)
+            state = following
+            states.add(state)
+        return states
+
+    def iter_matches(self, text):
+        """
+        Iterate over every match in the text
+
+        :param      text:  The text
+        :type       text:  string
+
+        :returns:   Pairs of the match start position and the payload
+        :rtype:     generator
+        """
+
+        if not self.is_built:
+            self.build()
+
+        goto = self.goto
+        fail = self.fail
+        outputs = self.outputs
+        state = 0
+        for position, letter in enumerate(text):
+            while state and letter not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(letter, 0)
+            for length, payload in outputs[state]:
+                yield position - length + 1, payload
+
+class ShiftAdd:
+    """
+    This class describes a bit-parallel Shift-Add matcher.
+
+    Every pattern letter owns a field of bits in one integer counting the
+    mismatches of the alignment ending at the current letter of the text, all
+    the patterns are updated at once by a shift and an addition per letter.
+    The top bit of a field is set once the count exceeds the mismatches
+    allowed, so the matches are found by testing the last field of every
+    pattern with a single mask.
+    """
+
+    WILDCARD = "?"
+    GAP = " "
+
+    def __init__(self, max_mismatches = 0):
+        """
+        Constructs a new instance.
+
+        :param      max_mismatches:  The mismatches allowed in a match
+        :type       max_mismatches:  number
+        """
+
+        self.max_mismatches = max_mismatches
+        self.patterns = []
+        self.is_built = False
+
+    def add_word(self, pattern, payload):
+        """
+        Adds a pattern, the wildcard letter matches any letter.
+
+        :param      pattern:  The pattern
+        :type       pattern:  string
+        :param      payload:  The value reported when the pattern is matched
+        :type       payload:  object
+        """
+
+        self.patterns.append((pattern, payload))
+        self.is_built = False
+        return self
+
+    def build(self):
+        """
+        Builds the masks of the fields.
+        """
+
+        longest = max([len(pattern) for pattern, payload in self.patterns] or [0])
+        width = longest.bit_length() + 1
+        high = 1 << (width - 1)
+        limit = min(self.max_mismatches, longest)
+        # Added to the first field so a count over the limit sets the top bit
+        bias = high - limit - 1
+
+        self.width = width
+        self.bias = bias
+        self.initial = 0
+        self.keep = 0
+        self.last_fields = {}
+
+        start_bias = 0
+        mismatches = 0
+        letters = set()
+        field = 0
+        for pattern, payload in self.patterns:
+            for position in range(0, len(pattern)):
+                self.initial |= high << (field * width)
+                if position:
+                    self.keep |= ((1 << width) - 1) << (field * width)
+                else:
+                    start_bias |= bias << (field * width)
+                if pattern[position] != self.WILDCARD:
+                    mismatches |= 1 << (field * width)
+                    letters.add(pattern[position])
+                field += 1
+            self.last_fields[field * width - 1] = (len(pattern), payload)
+
+        self.last_high = sum(1 << bit for bit in self.last_fields)
+
+        # The mismatches of each letter, plus the bias of the first fields
+        self.mismatches = {}
+        for letter in letters:
+            masks = mismatches
+            field = 0
+            for pattern, payload in self.patterns:
+                for position in range(0, len(pattern)):
+                    if pattern[position] == letter:
+                        masks ^= 1 << (field * width)
+                    field += 1
+            self.mismatches[letter] = masks + start_bias
+        self.default = mismatches + start_bias
+
+        self.is_built = True
+        return self
+
+    def iter_matches(self, text):
+        """
+        Iterate over every match in the text, no match goes across a gap.
+
+        :param      text:  The text
+        :type       text:  string
+
+        :returns:   The match start position, the payload and the mismatches
+        :rtype:     generator
+        """
+
+        if not self.is_built:
+            self.build()
+        if not self.patterns:
+            return
+
+        if self.GAP in text:
+            offset = 0
+            for segment in text.split(self.GAP):
+                for start, payload, count in self.iter_matches(segment):
+                    yield offset + start, payload, count
+                offset += len(segment) + 1
+            return
+
+        width = self.width
+        keep = self.keep
+        last_high = self.last_high
+        masks = self.mismatches
+        default = self.default
+        state = self.initial
+        for position, letter in enumerate(text):
+            state = ((state << width) & keep) + masks.get(letter, default)
+            hits = ~state & last_high
+            while hits:
+                bit = hits & -hits
+                hits ^= bit
+                top = bit.bit_length() - 1
+                length, payload = self.last_fields[top]
+                count = ((state >> (top + 1 - width)) & ((1 << width) - 1)) - self.bias
+                yield position - length + 1, payload, count
+
+class SuffixArray:
+    """
+    This class describes the suffix array of a text.
+
+    The start of every suffix is kept in the sorted order of the suffixes,
+    so the suffixes beginning with a pattern are one range found by two
+    binary searches. The array is sorted by prefix doubling, each round
+    ranks the suffixes by twice as many letters as the previous one.
+    """
+
+    def __init__(self, text):
+        """
+        Constructs a new instance.
+
+        :param      text:  The text
+        :type       text:  string
+        """
+
+        self.text = text
+        self.suffixes = array("I", self.sort_suffixes(text))
+
+    @staticmethod
+    def sort_suffixes(text):
+        """
+        Sort the suffixes of a text
+
+        :param      text:  The text
+        :type       text:  string
+
+        :returns:   The start of every suffix in sorted order
+        :rtype:     list
+        """
+
+        count = len(text)
+        if not count:
+            return []
+
+        rank = [ord(letter) for letter in text]
+        suffixes = sorted(range(0, count), key = rank.__getitem__)
+        length = 1
+        while True:
+            # Ranked by the letters from the start, then by those following
+            base = max(rank[suffixes[-1]], count) + 2
+            following = rank[length:] + [-1] * min(length, count)
+            keys = [first * base + second + 1 for first, second in zip(rank, following)]
+            suffixes.sort(key = keys.__getitem__)
+
+            current = 0
+            previous = keys[suffixes[0]]
+            for start in suffixes:
+                key = keys[start]
+                if key != previous:
+                    current += 1
+                    previous = key
+                rank[start] = current
+
+            if current == count - 1:
+                return suffixes
+            length *= 2
+
+    def find_range(self, pattern):
+        """
+        Finds the range of the suffixes beginning with a pattern.
+
+        :param      pattern:  The pattern
+        :type       pattern:  string
+
+        :returns:   The first and past the last position in the suffixes
+        :rtype:     tuple
+        """
+
+        text = self.text
+        suffixes = self.suffixes
+        length = len(pattern)
+
+        low, high = 0, len(suffixes)
+        while low < high:
+            middle = (low + high) // 2
+            start = suffixes[middle]
+            if text[start:start + length] < pattern:
+                low = middle + 1
+            else:
+                high = middle
+        first = low
+
+        high = len(suffixes)
+        while low < high:
+            middle = (low + high) // 2
+            start = suffixes[middle]
+            if text[start:start + length] <= pattern:
+                low = middle + 1
+            else:
+                high = middle
+        return first, low
+
+    def iter_positions(self, pattern):
+        """
+        Iterate over the positions of a pattern in the text, in no order
+
+        :param      pattern:  The pattern
+        :type       pattern:  string
+
+        :returns:   The positions
+        :rtype:     generator
+        """
+
+        first, last = self.find_range(pattern)
+        for position in range(first, last):
+            yield self.suffixes[position]
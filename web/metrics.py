@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+import sys
+import time
+
+"""Environment variable enabling the metrics: log, or a Prometheus text file path"""
+METRICS_VARIABLE = "WORDSEARCH_METRICS"
+
+"""Environment variable also counting the allocations of every stage"""
+ALLOCATIONS_VARIABLE = "WORDSEARCH_METRICS_ALLOCATIONS"
+
+class NullStage:
+    """
+    This class describes a stage that measures nothing.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+class NullMetrics:
+    """
+    This class describes disabled metrics, every hook is a no-op.
+    """
+
+    enabled = False
+    stage_context = NullStage()
+
+    def stage(self, name):
+        return self.stage_context
+
+    def count(self, name, value = 1):
+        pass
+
+    def observe(self, name, value):
+        pass
+
+    def gauge(self, name, value):
+        pass
+
+    def export(self):
+        pass
+
+NULL_METRICS = NullMetrics()
+
+class Stage:
+    """
+    This class describes the measure of one run of a stage.
+    """
+
+    def __init__(self, metrics, name):
+        """
+        Constructs a new instance.
+
+        :param      metrics:  The metrics
+        :type       metrics:  Metrics
+        :param      name:     The stage name
+        :type       name:     string
+        """
+
+        self.metrics = metrics
+        self.name = name
+        self.started = None
+        self.allocated = None
+
+    def __enter__(self):
+        if self.metrics.track_allocations:
+            import tracemalloc
+            self.allocated = tracemalloc.get_traced_memory()[0]
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        elapsed = time.perf_counter() - self.started
+        allocated = 0
+        if self.allocated is not None:
+            import tracemalloc
+            allocated = max(0, tracemalloc.get_traced_memory()[0] - self.allocated)
+        self.metrics.add_stage(self.name, elapsed, allocated)
+        return False
+
+class Metrics:
+    """
+    This class describes the metrics of the word search pipeline.
+
+    Collects the time and allocations of every stage, counters, and the
+    count, sum and maximum of observed values, then export them as a log line
+    or as a Prometheus text file.
+    """
+
+    enabled = True
+
+    def __init__(self, target = "log", track_allocations = False):
+        """
+        Constructs a new instance.
+
+        :param      target:             "log" for a log line on stderr, or the
+                                        path of a Prometheus text file
+        :type       target:             string
+        :param      track_allocations:  True to count the stages allocations
+        :type       track_allocations:  boolean
+        """
+
+        self.target = target
+        self.track_allocations = track_allocations
+        self.stages = {}
+        self.counters = {}
+        self.observations = {}
+        self.gauges = {}
+
+        if track_allocations:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    def stage(self, name):
+        """
+        Measures a stage.
+
+        :param      name:  The stage name
+        :type       name:  string
+
+        :returns:   The context manager measuring the stage
+        :rtype:     Stage
+        """
+
+        return Stage(self, name)
+
+    def add_stage(self, name, seconds, allocated = 0):
+        """
+        Adds the measure of a stage run.
+
+        :param      name:       The stage name
+        :type       name:       string
+        :param      seconds:    The elapsed seconds
+        :type       seconds:    number
+        :param      allocated:  The allocated bytes
+        :type       allocated:  number
+        """
+
+        stage = self.stages.setdefault(name, [0, 0.0, 0])
+        stage[0] += 1
+        stage[1] += seconds
+        stage[2] += allocated
+        return self
+
+    def count(self, name, value = 1):
+        """
+        Increments a counter.
+
+        :param      name:   The counter name
+        :type       name:   string
+        :param      value:  The increment
+        :type       value:  number
+        """
+
+        self.counters[name] = self.counters.get(name, 0) + value
+        return self
+
+    def observe(self, name, value):
+        """
+        Observes a value, keeping its count, sum and maximum.
+
+        :param      name:   The observation name
+        :type       name:   string
+        :param      value:  The value
+        :type       value:  number
+        """
+
+        observation = self.observations.get(name)
+        if observation is None:
+            self.observations[name] = [1, value, value]
+        else:
+            observation[0] += 1
+            observation[1] += value
+            if value > observation[2]:
+                observation[2] = value
+        return self
+
+    def gauge(self, name, value):
+        """
+        Sets a gauge.
+
+        :param      name:   The gauge name
+        :type       name:   string
+        :param      value:  The value
+        :type       value:  number
+        """
+
+        self.gauges[name] = value
+        return self
+
+    def to_log_line(self):
+        """
+        Format the metrics as one log line.
+
+        :returns:   The log line
+        :rtype:     string
+        """
+
+        fields = []
+        for name, (calls, seconds, allocated) in sorted(self.stages.items()):
+            fields.append("{}={:.6f}s".format(name, seconds))
+            if self.track_allocations:
+                fields.append("{}.allocated={}".format(name, allocated))
+        for name, (count, total, maximum) in sorted(self.observations.items()):
+            fields.append("{}.count={} {}.sum={} {}.max={}".format(
+                name, count, name, total, name, maximum
+            ))
+        for name, value in sorted(self.counters.items()):
+            fields.append("{}={}".format(name, value))
+        for name, value in sorted(self.gauges.items()):
+            fields.append("{}={}".format(name, value))
+        return "wordsearch metrics " + " ".join(fields)
+
+    def to_prometheus(self):
+        """
+        Format the metrics in the Prometheus text format.
+
+        :returns:   The Prometheus text
+        :rtype:     string
+        """
+
+        lines = []
+        if self.stages:
+            lines.append("# TYPE wordsearch_stage_seconds_total counter")
+            for name, (calls, seconds, allocated) in sorted(self.stages.items()):
+                lines.append('wordsearch_stage_seconds_total{{stage="{}"}} {}'.format(name, seconds))
+            lines.append("# TYPE wordsearch_stage_calls_total counter")
+            for name, (calls, seconds, allocated) in sorted(self.stages.items()):
+                lines.append('wordsearch_stage_calls_total{{stage="{}"}} {}'.format(name, calls))
+            if self.track_allocations:
+                lines.append("# TYPE wordsearch_stage_allocated_bytes_total counter")
+                for name, (calls, seconds, allocated) in sorted(self.stages.items()):
+                    lines.append('wordsearch_stage_allocated_bytes_total{{stage="{}"}} {}'.format(
+                        name, allocated
+                    ))
+
+        for name, (count, total, maximum) in sorted(self.observations.items()):
+            lines.append("# TYPE wordsearch_{} summary".format(name))
+            lines.append("wordsearch_{}_count {}".format(name, count))
+            lines.append("wordsearch_{}_sum {}".format(name, total))
+            lines.append("# TYPE wordsearch_{}_max gauge".format(name))
+            lines.append("wordsearch_{}_max {}".format(name, maximum))
+
+        for name, value in sorted(self.counters.items()):
+            lines.append("# TYPE wordsearch_{}_total counter".format(name))
+            lines.append("wordsearch_{}_total {}".format(name, value))
+
+        for name, value in sorted(self.gauges.items()):
+            lines.append("# TYPE wordsearch_{} gauge".format(name))
+            lines.append("wordsearch_{} {}".format(name, value))
+
+        return "\n".join(lines) + "\n"
+
+    def export(self):
+        """
+        Export the metrics to the target.
+        """
+
+        if self.target == "log":
+            print(self.to_log_line(), file = sys.stderr)
+            return self
+
+        with open(self.target + ".tmp", "w") as writer:
+            writer.write(self.to_prometheus())
+
+        import os
+        os.replace(self.target + ".tmp", self.target)
+        return self
+
+def create_metrics(target = None, track_allocations = False):
+    """
+    Creates the metrics of a target, disabled metrics without target
+
+    :param      target:             "log", a Prometheus text file path or None
+    :type       target:             string
+    :param      track_allocations:  True to count the stages allocations
+    :type       track_allocations:  boolean
+
+    :returns:   The metrics
+    :rtype:     Metrics
+    """
+
+    if not target:
+        return NULL_METRICS
+    return Metrics(target, track_allocations)
+
+def metrics_from_environment(environment):
+    """
+    Creates the metrics configured by the environment variables
+
+    :param      environment:  The environment, like os.environ
+    :type       environment:  dictionary
+
+    :returns:   The metrics
+    :rtype:     Metrics
+    """
+
+    return create_metrics(
+        environment.get(METRICS_VARIABLE),
+        environment.get(ALLOCATIONS_VARIABLE, "") not in ("", "0")
+    )
@@ -2,23 +2,110 @@
 
 # -*- coding: utf-8 -*-
 
+import bisect
+import time
+from array import array
+
+from matcher import AhoCorasick, ShiftAdd
+from metrics import NULL_METRICS
+
+"""The numpy module, imported by the first numpy grid as it is slow to import"""
+numpy = None
+numpy_imported = False
+
+def import_numpy():
+    """
+    Imports numpy on first use
+
+    :returns:   The numpy module, None if numpy is not installed
+    :rtype:     module
+    """
+
+    global numpy, numpy_imported
+    if not numpy_imported:
+        numpy_imported = True
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+    return numpy
+
+def has_numpy():
+    """
+    Determines if numpy is installed.
+
+    :returns:   True if numpy is installed, False otherwise.
+    :rtype:     boolean
+    """
+
+    return import_numpy() is not None
+
+def lazy_line(name, generate):
+    """
+    Creates a grid property generated on first access, then kept until the
+    grid lines are reset
+
+    :param      name:      The property name
+    :type       name:      string
+    :param      generate:  The name of the grid method generating it
+    :type       generate:  string
+
+    :returns:   The property
+    :rtype:     property
+    """
+
+    attribute = "_" + name
+
+    def get_line(self):
+        if self.__dict__.get(attribute) is None:
+            getattr(self, generate)()
+        return self.__dict__[attribute]
+
+    def set_line(self, value):
+        self.__dict__[attribute] = value
+
+    return property(get_line, set_line)
+
 class Grid:
     """
     This class describes a grid.
+
+    Everything derived from the rows is generated when first used, a search
+    resolved in the rows never builds the columns nor the diagonals.
+
+    Rows may have any length, the cells missing from the shorter rows are GAP
+    letters inside the columns and diagonals so every letter keeps its offset
+    from the line origin, the gaps ending a line are left out.
     """
 
+    GAP = " "
+
+    LINES = (
+        "cells", "horizontals", "verticals", "diagonals", "anti_diagonals",
+        "diagonal_origins", "anti_diagonal_origins"
+    )
+
+    cells = lazy_line("cells", "generate_cells")
+    horizontals = lazy_line("horizontals", "generate_horizontals")
+    verticals = lazy_line("verticals", "generate_verticals")
+    diagonals = lazy_line("diagonals", "generate_diagonals")
+    anti_diagonals = lazy_line("anti_diagonals", "generate_diagonals")
+    diagonal_origins = lazy_line("diagonal_origins", "generate_diagonals")
+    anti_diagonal_origins = lazy_line("anti_diagonal_origins", "generate_diagonals")
+
     def __init__(self):
         """
         Constructs a new instance.
         """
 
-        self.cells = []
         self.rows = []
-        self.horizontals = []
-        self.verticals = []
+        self.reset_lines()
+        self.digest = None
+        self.letter_filter = None
         self.row_count = 0;
         self.row_max_count = 0;
         self.column_count = 0;
+        self.column_min_count = 0;
         self.column_max_count = 0;
 
     def add_row(self, row):
@@ -30,26 +117,171 @@ class Grid:
         """
 
         self.rows.append(str(row).upper())
+        self.digest = None
+        self.letter_filter = None
+        self.reset_lines()
         if self.row_max_count < len(self.rows):
             self.row_max_count = len(self.rows)
         if self.column_max_count < len(row):
             self.column_max_count = len(row)
+        if len(self.rows) == 1 or len(row) < self.column_min_count:
+            self.column_min_count = len(row)
+        return self
+
+    def reset_lines(self):
+        """
+        Forget the lines derived from the rows, they are generated again on
+        next access.
+        """
+
+        for name in Grid.LINES:
+            self.__dict__["_" + name] = None
         return self
 
-    def is_dimension_valid(self):
+    def is_generated(self, name):
+        """
+        Determines if a line derived from the rows is generated.
+
+        :param      name:  The name, one of Grid.LINES
+        :type       name:  string
+
+        :returns:   True if generated, False otherwise.
+        :rtype:     boolean
+        """
+
+        return self.__dict__.get("_" + name) is not None
+
+    def set_cell(self, row, column, letter):
+        """
+        Changes the letter of a cell, only the row, column and diagonals
+        through the cell are generated again.
+
+        :param      row:         The row
+        :type       row:         number
+        :param      column:      The column
+        :type       column:      number
+        :param      letter:      The letter
+        :type       letter:      string
+
+        :raises     ValueError:  If the cell is outside the grid or the letter
+                                 is not a single letter
+        """
+
+        letter = str(letter).upper()
+        if len(letter) != 1 or not letter.isalpha():
+            raise ValueError("{} is not a valid letter".format(letter))
+        if not 0 <= row < len(self.rows) or not 0 <= column < len(self.rows[row]):
+            raise ValueError("({}, {}) is not a cell of the grid".format(row, column))
+
+        self.rows[row] = self.rows[row][:column] + letter + self.rows[row][column + 1:]
+        self.digest = None
+        self.letter_filter = None
+        if self.is_generated("cells"):
+            self.set_cells_letter(row, column, letter)
+
+        if self.is_generated("verticals"):
+            self.verticals[column] = self.trace_line((0, column), 0)
+
+        if self.is_generated("diagonals"):
+            for found_by, index in self.get_cell_lines(row, column)[2:]:
+                if found_by == Search.BY_DIAGONAL:
+                    self.diagonals[index] = self.trace_line(self.diagonal_origins[index], 1)
+                else:
+                    self.anti_diagonals[index] = self.trace_line(
+                        self.anti_diagonal_origins[index], -1
+                    )
+
+        return self
+
+    def set_cells_letter(self, row, column, letter):
+        """
+        Changes the letter of a generated cell.
+
+        :param      row:     The row
+        :type       row:     number
+        :param      column:  The column
+        :type       column:  number
+        :param      letter:  The letter
+        :type       letter:  string
+        """
+
+        self.cells[row][column] = letter
+        return self
+
+    def get_cell_lines(self, row, column):
+        """
+        Gets the straights going through a cell.
+
+        :param      row:     The row
+        :type       row:     number
+        :param      column:  The column
+        :type       column:  number
+
+        :returns:   The (direction, index) of the row, column, diagonal and
+                    anti diagonal of the cell
+        :rtype:     list
+        """
+
+        return [
+            (Search.BY_ROW, row),
+            (Search.BY_COLUMN, column),
+            (Search.BY_DIAGONAL, column - row + self.row_max_count - 1),
+            (Search.BY_ANTI_DIAGONAL, row + column),
+        ]
+
+    def fingerprint(self):
+        """
+        Gets the fingerprint of the grid rows, equal grids share the same
+        fingerprint.
+
+        :returns:   The hexadecimal SHA-1 of the rows
+        :rtype:     string
+        """
+
+        if self.digest is None:
+            import hashlib
+            digest = hashlib.sha1()
+            for row in self.rows:
+                digest.update(str(row).encode("utf-8"))
+                digest.update(b"\n")
+            self.digest = digest.hexdigest()
+        return self.digest
+
+    def get_letter_filter(self):
+        """
+        Gets the letters and bigrams filter of the grid, built when first used
+        and kept with the grid until a cell changes.
+
+        :returns:   The letter filter
+        :rtype:     LetterFilter
         """
-        Determines if dimension valid.
+
+        if self.letter_filter is None:
+            self.letter_filter = LetterFilter(self)
+        return self.letter_filter
+
+    def is_dimension_valid(self, allow_ragged = False):
+        """
+        Determines if dimension valid, any rectangular grid is valid.
+
+        :param      allow_ragged:  True to allow rows of different lengths
+        :type       allow_ragged:  boolean
 
         :returns:   True if dimension valid, False otherwise.
         :rtype:     boolean
         """
 
-        if self.column_max_count != self.row_max_count:
-            return False
-        for row in self.rows:
-            if len(row) != self.column_max_count:
-                return False
-        return True
+        return allow_ragged or self.is_rectangular()
+
+    def is_rectangular(self):
+        """
+        Determines if all rows have the same length.
+
+        :returns:   True if rectangular, False otherwise.
+        :rtype:     boolean
+        """
+
+        return self.column_min_count == self.column_max_count
 
     def generate_cells(self):
         """
@@ -69,27 +301,345 @@ class Grid:
 
     def generate_verticals(self):
         """
-        Generate all verticals string in the grid
+        Generate all verticals string in the grid, every column of a
+        rectangular grid is a slice of the joined rows stepping a row at a
+        time, the columns of a ragged grid are traced row by row
+        """
+
+        column_count = self.column_max_count
+        if self.is_rectangular():
+            letters = "".join(str(row) for row in self.rows)
+            self.verticals = [letters[column::column_count] for column in range(column_count)]
+        else:
+            self.verticals = self.gather_lines(
+                column_count, 0, lambda row: 0, lambda row, column: row
+            )
+        return self
+
+    def generate_diagonals(self):
+        """
+        Generate all diagonal strings in the grid, top left to bottom right for
+        the diagonals and top right to bottom left for the anti diagonals.
+
+        The origins tables keeps the (row, column) where each diagonal starts,
+        the letter at offset N of a diagonal is N steps away from its origin.
+
+        The diagonals of a rectangular grid are slices of the joined rows
+        stepping a row and a column at a time, the diagonals of a ragged grid
+        are gathered from its cells, so only the cells of the grid are read.
+        """
+
+        row_count = self.row_max_count
+        column_count = self.column_max_count
+        line_count = max(0, row_count + column_count - 1)
+
+        self.diagonal_origins = (
+            [(row, 0) for row in range(row_count - 1, 0, -1)] +
+            [(0, column) for column in range(column_count)]
+        )
+        self.anti_diagonal_origins = (
+            [(0, column) for column in range(column_count)] +
+            [(row, column_count - 1) for row in range(1, row_count)]
+        )
+
+        if not self.is_rectangular():
+            self.diagonals = self.gather_lines(
+                line_count, 1, lambda row: row_count - 1 - row,
+                lambda row, column: min(row, column)
+            )
+            self.anti_diagonals = self.gather_lines(
+                line_count, -1, lambda row: row,
+                lambda row, column: min(row, column_count - 1 - column)
+            )
+            return self
+
+        letters = "".join(str(row) for row in self.rows)
+
+        diagonals = []
+        step = column_count + 1
+        for row, column in self.diagonal_origins:
+            start = row * column_count + column
+            length = min(row_count - row, column_count - column)
+            diagonals.append(letters[start:start + (length - 1) * step + 1:step])
+
+        anti_diagonals = []
+        step = max(1, column_count - 1)
+        for row, column in self.anti_diagonal_origins:
+            start = row * column_count + column
+            length = min(row_count - row, column + 1)
+            anti_diagonals.append(letters[start:start + (length - 1) * step + 1:step])
+
+        self.diagonals = diagonals
+        self.anti_diagonals = anti_diagonals
+        return self
+
+    def gather_lines(self, line_count, step, get_first, get_offset):
+        """
+        Gather the letters of the rows in lines, the letters of a row go to
+        consecutive lines and missing cells between two letters of a line are
+        gaps, only the cells of the grid are read.
+
+        :param      line_count:  The number of lines
+        :type       line_count:  number
+        :param      step:        The column step for every row, 0, 1 or -1
+        :type       step:        number
+        :param      get_first:   Gets the line of the first letter of a row
+        :type       get_first:   function
+        :param      get_offset:  Gets the offset in its line of the letter
+                                 at a row and column
+        :type       get_offset:  function
+
+        :returns:   The lines
+        :rtype:     list
+        """
+
+        lines = [[] for index in range(line_count)]
+        previous = None
+        for row, letters in enumerate(self.rows):
+            letters = str(letters)
+            first = get_first(row)
+
+            # The letters following a letter of the previous row are
+            # appended as is, the others after the gaps they are missing
+            following = len(letters)
+            if previous is not None:
+                following = max(0, min(following, len(previous) + step))
+            for line, letter in zip(lines[first:first + following], letters):
+                line.append(letter)
+            for column in range(following, len(letters)):
+                line = lines[first + column]
+                missing = get_offset(row, column) - len(line)
+                if missing:
+                    line.extend(Grid.GAP * missing)
+                line.append(letters[column])
+            previous = letters
+
+        return ["".join(line) for line in lines]
+
+    def trace_line(self, origin, step):
+        """
+        Collect the letters from the origin going down the grid
+
+        :param      origin:  The origin (row, column)
+        :type       origin:  tuple
+        :param      step:    The column step for every row, 0, 1 or -1
+        :type       step:    number
+
+        :returns:   The letters of the line
+        :rtype:     string
+        """
+
+        row, column = origin
+        letters = []
+        while row < self.row_max_count and 0 <= column < self.column_max_count:
+            line = self.rows[row]
+            letters.append(line[column] if column < len(line) else Grid.GAP)
+            row += 1
+            column += step
+        return "".join(letters).rstrip(Grid.GAP)
+
+    def get_origin(self, found_by, index):
+        """
+        Gets the (row, column) where a straight starts.
+
+        :param      found_by:  The straight direction
+        :type       found_by:  string
+        :param      index:     The straight index
+        :type       index:     number
+
+        :returns:   The origin (row, column)
+        :rtype:     tuple
+        """
+
+        if found_by == Search.BY_COLUMN:
+            return (0, index)
+        if found_by == Search.BY_DIAGONAL:
+            return self.diagonal_origins[index]
+        if found_by == Search.BY_ANTI_DIAGONAL:
+            return self.anti_diagonal_origins[index]
+        return (index, 0)
+
+    def get_position(self, found_by, index, offset):
+        """
+        Gets the (row, column) of a letter in a straight.
+
+        :param      found_by:  The straight direction
+        :type       found_by:  string
+        :param      index:     The straight index
+        :type       index:     number
+        :param      offset:    The letter offset in the straight
+        :type       offset:    number
+
+        :returns:   The position (row, column)
+        :rtype:     tuple
+        """
+
+        row, column = self.get_origin(found_by, index)
+        if found_by == Search.BY_ROW:
+            return (row, column + offset)
+        if found_by == Search.BY_ANTI_DIAGONAL:
+            return (row + offset, column - offset)
+        if found_by == Search.BY_DIAGONAL:
+            return (row + offset, column + offset)
+        return (row + offset, column)
+
+class NumpyGrid(Grid):
+    """
+    This class describes a grid backed by a NumPy uint8 array.
+
+    The cells take a byte each instead of a string each, the columns and
+    diagonals are read from views of the array and build about as fast as the
+    slices of the plain grid, so the backend saves memory rather than time.
+    Grids that are not rectangular or not ASCII falls back to the plain grid
+    generation.
+    """
+
+    def __init__(self):
+        """
+        Constructs a new instance.
+        """
+
+        super().__init__()
+        self.array = None
+
+    def generate_cells(self):
+        """
+        Generates the cells as a 2D uint8 array
+        """
+
+        self.array = None
+        if not self.rows or not self.is_rectangular():
+            return super().generate_cells()
+
+        try:
+            letters = "".join(self.rows).encode("ascii")
+        except UnicodeEncodeError:
+            return super().generate_cells()
+
+        numpy = import_numpy()
+        self.array = numpy.frombuffer(letters, dtype=numpy.uint8).reshape(
+            len(self.rows), self.column_max_count
+        )
+        self.cells = self.array
+        return self
+
+    def set_cells_letter(self, row, column, letter):
+        """
+        Changes the letter of a cell of the array, copied first when it is a
+        read only view of the rows.
+
+        :param      row:     The row
+        :type       row:     number
+        :param      column:  The column
+        :type       column:  number
+        :param      letter:  The letter
+        :type       letter:  string
+        """
+
+        if self.array is None:
+            return super().set_cells_letter(row, column, letter)
+
+        try:
+            code = letter.encode("ascii")[0]
+        except UnicodeEncodeError:
+            # The array only holds ASCII letters, use the plain grid cells
+            return self.generate_cells()
+
+        if not self.array.flags.writeable:
+            self.array = self.array.copy()
+            self.cells = self.array
+        self.array[row, column] = code
+        return self
+
+    def generate_verticals(self):
+        """
+        Generate all verticals string from the transposed array
         """
 
-        vertical_string = ""
-        for column in range(0, self.column_max_count):
-            vertical_string = ""
-            for row in range(0, self.row_max_count):
-                try:
-                    vertical_string = vertical_string + self.cells[row][column]
-                except IndexError:
-                    vertical_string = vertical_string + ''
-            self.verticals.append(vertical_string)
+        if not self.is_generated("cells"):
+            self.generate_cells()
+        if self.array is None:
+            return super().generate_verticals()
+
+        self.verticals = self.split_lines(
+            self.array.T.tobytes().decode("ascii"), self.array.shape[0]
+        )
+        return self
+
+    def generate_diagonals(self):
+        """
+        Generate all diagonal strings from the array diagonals views
+        """
+
+        if not self.is_generated("cells"):
+            self.generate_cells()
+        if self.array is None:
+            return super().generate_diagonals()
+
+        row_count, column_count = self.array.shape
+        flipped = self.array[:, ::-1]
+
+        self.diagonals = []
+        self.diagonal_origins = []
+        for offset in range(1 - row_count, column_count):
+            self.diagonal_origins.append((max(0, -offset), max(0, offset)))
+            self.diagonals.append(
+                self.array.diagonal(offset).tobytes().decode("ascii")
+            )
+
+        self.anti_diagonals = []
+        self.anti_diagonal_origins = []
+        for offset in range(0, row_count + column_count - 1):
+            self.anti_diagonal_origins.append((
+                max(0, offset - column_count + 1), min(offset, column_count - 1)
+            ))
+            self.anti_diagonals.append(
+                flipped.diagonal(column_count - 1 - offset).tobytes().decode("ascii")
+            )
+
         return self
 
+    @staticmethod
+    def split_lines(letters, length):
+        """
+        Split a string in lines of equal length.
+
+        :param      letters:  The letters
+        :type       letters:  string
+        :param      length:   The length of each line
+        :type       length:   number
+
+        :returns:   The lines
+        :rtype:     list
+        """
+
+        return [letters[start:start + length] for start in range(0, len(letters), length)]
+
 class Search:
     """
     This class describes a search.
     """
 
-    BY_ROW    = "BY_ROW"
-    BY_COLUMN = "BY_COLUMN"
+    BY_ROW           = "BY_ROW"
+    BY_COLUMN        = "BY_COLUMN"
+    BY_DIAGONAL      = "BY_DIAGONAL"
+    BY_ANTI_DIAGONAL = "BY_ANTI_DIAGONAL"
+
+    DIRECTIONS = {
+        (BY_ROW, False): "E",
+        (BY_ROW, True): "W",
+        (BY_COLUMN, False): "S",
+        (BY_COLUMN, True): "N",
+        (BY_DIAGONAL, False): "SE",
+        (BY_DIAGONAL, True): "NW",
+        (BY_ANTI_DIAGONAL, False): "SW",
+        (BY_ANTI_DIAGONAL, True): "NE",
+    }
+
+    __slots__ = (
+        "word", "start_coord", "end_coord", "was_found", "found_by",
+        "is_reverse", "current_index", "pointer", "length", "mismatches"
+    )
 
     def __init__(self, word):
         """
@@ -107,35 +657,69 @@ class Search:
         self.is_reverse = False
         self.current_index = 0
         self.pointer = None
-        self.coordinates = None
+        self.length = None
+        self.mismatches = 0
 
-    def create_coordinates(self):
+    @property
+    def coordinates(self):
         """
-        Creates coordinates.
+        Gets the coordinates, from the first to the last letter of the word.
+
+        :returns:   The (x, y) start and end, None until created
+        :rtype:     tuple
         """
 
-        padding = len(self.word) - 1
+        if self.start_coord is None:
+            return None
+        if self.is_reverse:
+            return (self.end_coord, self.start_coord)
+        return (self.start_coord, self.end_coord)
 
-        if self.found_by == Search.BY_COLUMN:
-            if self.is_reverse:
-                self.start_coord = (self.current_index, self.pointer)
-                self.end_coord = (self.pointer + padding, self.current_index)
-            else:
-                self.start_coord = (self.pointer, self.current_index)
-                self.end_coord = (self.current_index, self.pointer + padding)
+    def create_coordinates(self, grid):
+        """
+        Creates coordinates, the (x, y) of the first and last letters of the
+        match in its straight.
 
-        if self.found_by == Search.BY_ROW:
-            self.start_coord = (self.pointer, self.current_index)
-            self.end_coord = (self.pointer + padding, self.current_index)
+        :param      grid:  The grid searched
+        :type       grid:  Grid
+        """
 
-        self.coordinates = (self.start_coord, self.end_coord)
+        padding = (self.length or len(self.word)) - 1
 
-        if self.is_reverse:
-            self.coordinates = (self.end_coord, self.start_coord)
-            pass
+        start = grid.get_position(self.found_by, self.current_index, self.pointer)
+        end = grid.get_position(self.found_by, self.current_index, self.pointer + padding)
+        self.start_coord = (start[1], start[0])
+        self.end_coord = (end[1], end[0])
 
         return self.coordinates
 
+    def get_result(self):
+        """
+        Gets the result of the search.
+
+        :returns:   The search state once found
+        :rtype:     tuple
+        """
+
+        return (
+            self.was_found, self.found_by, self.is_reverse, self.current_index,
+            self.pointer, self.start_coord, self.end_coord, self.length,
+            self.mismatches
+        )
+
+    def set_result(self, result):
+        """
+        Sets the result of the search, from an equal word search.
+
+        :param      result:  The search state from get_result
+        :type       result:  tuple
+        """
+
+        (self.was_found, self.found_by, self.is_reverse, self.current_index,
+            self.pointer, self.start_coord, self.end_coord, self.length,
+            self.mismatches) = result
+        return self
+
     def print_coordinates(self, padding = 0):
         """
         Prints coordinates.
@@ -144,153 +728,1650 @@ class Search:
         :type       padding:  number
         """
 
-        _from = (self.coordinates[0][0] + padding, self.coordinates[0][1] + padding)
-        _to = (self.coordinates[1][0] + padding, self.coordinates[1][1] + padding)
+        return Search.format_coordinates(self.coordinates, padding)
+
+    @staticmethod
+    def format_coordinates(coordinates, padding = 0):
+        """
+        Format a pair of (x, y) coordinates.
+
+        :param      coordinates:  The start and end coordinates
+        :type       coordinates:  tuple
+        :param      padding:      The padding
+        :type       padding:      number
+
+        :returns:   The formatted coordinates
+        :rtype:     string
+        """
+
+        _from = (coordinates[0][0] + padding, coordinates[0][1] + padding)
+        _to = (coordinates[1][0] + padding, coordinates[1][1] + padding)
         return '{}{}'.format(_from, _to)
 
-class CrossWords:
+class SearchResult:
     """
-    This class describes cross words.
+    This class describes the result of a search, one for each occurrence
+    reported.
     """
 
-    def __init__(self):
+    def __init__(self, word, was_found = False, start = None, end = None, direction = None,
+            mismatches = 0):
         """
         Constructs a new instance.
-        """
-
-        self.searches = []
-        self.grid = Grid()
-        self.has_result = False
 
-    def add_row(self, row):
+        :param      word:        The word
+        :type       word:        string
+        :param      was_found:   True if the word was found
+        :type       was_found:   boolean
+        :param      start:       The (x, y) start
+        :type       start:       tuple
+        :param      end:         The (x, y) end
+        :type       end:         tuple
+        :param      direction:   The direction, one of Search.DIRECTIONS
+        :type       direction:   string
+        :param      mismatches:  The letters of the match differing from the
+                                 word
+        :type       mismatches:  number
         """
-        Adds a row.
 
-        :param      row:  The row
-        :type       row:  string
+        self.word = word
+        self.was_found = was_found
+        self.start = start
+        self.end = end
+        self.direction = direction
+        self.mismatches = mismatches
+
+    @classmethod
+    def from_search(cls, search):
         """
+        Creates the result of a searched search.
 
-        self.grid.add_row(row)
-        self.grid.generate_horizontals()
-        return self
+        :param      search:  The search
+        :type       search:  Search
 
-    def init_puzzle(self):
-        """
-        Initializes the puzzle.
+        :returns:   The search result
+        :rtype:     SearchResult
         """
 
-        self.grid.generate_cells()
-        self.grid.generate_verticals()
-        return self
+        if not search.was_found:
+            return cls(search.word)
 
-    def add_searches(self, word):
-        """
-        Adds searches.
+        return cls(
+            search.word, True, search.coordinates[0], search.coordinates[1],
+            Search.DIRECTIONS[(search.found_by, search.is_reverse)], search.mismatches
+        )
 
-        :param      word:  The word
-        :type       word:  string
+    def to_line(self, padding = 0):
         """
+        Format the result as an output file line.
 
-        self.searches.append(Search(word))
-        return self
+        :param      padding:  The padding
+        :type       padding:  number
 
-    def get_searches(self):
+        :returns:   The line
+        :rtype:     string
         """
-        Gets the searches.
 
-        :returns:   The searches.
-        :rtype:     list
+        if not self.was_found:
+            return '{} {}\n'.format(self.word, 'not found')
+        if self.mismatches:
+            return '{} {} {} mismatches\n'.format(
+                self.word, Search.format_coordinates((self.start, self.end), padding),
+                self.mismatches
+            )
+        return '{} {}\n'.format(
+            self.word, Search.format_coordinates((self.start, self.end), padding)
+        )
+
+    def to_dict(self, padding = 0):
         """
+        Format the result as a dictionary.
 
-        return self.searches
+        :param      padding:  The padding
+        :type       padding:  number
 
-    def is_in_puzzle(self, search):
+        :returns:   The word, whether it was found, its coordinates, direction
+                    and mismatches if any
+        :rtype:     dictionary
         """
-        Determines whether the specified search is in puzzle.
 
-        :param      search:  The search
-        :type       search:  string
-
-        :returns:   True if the specified search is in puzzle, False otherwise.
-        :rtype:     boolean
-        """
+        result = {"word": self.word, "found": self.was_found}
+        if self.was_found:
+            result["start"] = [axis + padding for axis in self.start]
+            result["end"] = [axis + padding for axis in self.end]
+            result["direction"] = self.direction
+            if self.mismatches:
+                result["mismatches"] = self.mismatches
+        return result
 
-        found = False
+class SearchStore:
+    """
+    This class describes searches kept in columns rather than one object per
+    search.
 
-        # search in rows
-        found = self.is_in_grid(search, self.grid.horizontals)
-        if found:
-            search.found_by = Search.BY_ROW
-            return True
+    The words are stored back to back in one buffer and the results in typed
+    arrays, a Search is built when read and its result is written back when
+    assigned, so millions of searches only cost a few dozen bytes each.
+    """
 
-        # search in colmns
-        found = self.is_in_grid(search, self.grid.verticals)
-        if found:
-            search.found_by = Search.BY_COLUMN
-            return True
+    """The (found_by, is_reverse) of every direction code"""
+    DIRECTIONS = list(Search.DIRECTIONS)
 
-        return False
+    NOT_FOUND = -1
 
-    def is_in_grid(self, search, straights):
+    def __init__(self):
         """
-        Determines if in grid.
-
-        :param      search:     The search
-        :type       search:     Search
-        :param      straights:  The straights
-        :type       straights:  string
-
-        :returns:   True if in grid, False otherwise.
-        :rtype:     boolean
+        Constructs a new instance.
         """
 
-        for index, straight in enumerate(straights):
-            if search.word in straight or search.word[::-1] in straight:
-                search.current_index = index
-                search.was_found = True
-                if search.word[::-1] in straight:
-                    search.is_reverse = True
-                return True
-        return False
-
-    def sync_pointer(self, search):
+        self.letters = bytearray()
+        self.offsets = array("Q", [0])
+        self.directions = array("b")
+        self.indexes = array("i")
+        self.pointers = array("i")
+        # The match length, 0 when it is the word length
+        self.lengths = array("i")
+        self.mismatches = array("i")
+        # Four values per search, the start x and y then the end x and y
+        self.coordinates = array("i")
+
+    def append(self, search):
         """
-        Sync the pointer position
+        Appends a search.
 
         :param      search:  The search
         :type       search:  Search
         """
 
-        pointer = None
-        match = ''
-        word = search.word
-
-        if search.found_by == Search.BY_ROW:
-            match = self.grid.horizontals[search.current_index]
+        self.letters.extend(search.word.encode("utf-8"))
+        self.offsets.append(len(self.letters))
+        self.directions.append(SearchStore.NOT_FOUND)
+        self.indexes.append(0)
+        self.pointers.append(0)
+        self.lengths.append(0)
+        self.mismatches.append(0)
+        self.coordinates.extend((0, 0, 0, 0))
 
-        if search.found_by == Search.BY_COLUMN:
-            match = self.grid.verticals[search.current_index]
-
-        if search.is_reverse:
-            word = word[::-1]
-
-        search.pointer = match.find(word)
-        self.has_result = True
+        self[len(self) - 1] = search
         return self
 
-    def preview_grid(self, padding = 0):
+    def get_word(self, index):
         """
-        Prints out the puzzle grid
+        Gets the word of a search.
+
+        :param      index:  The search index
+        :type       index:  number
+
+        :returns:   The word
+        :rtype:     string
+        """
+
+        return self.letters[self.offsets[index]:self.offsets[index + 1]].decode("utf-8")
+
+    def __len__(self):
+        return len(self.directions)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("search index out of range")
+
+        search = Search(self.get_word(index))
+        direction = self.directions[index]
+        if direction == SearchStore.NOT_FOUND:
+            return search
+
+        search.was_found = True
+        search.found_by, search.is_reverse = SearchStore.DIRECTIONS[direction]
+        search.current_index = self.indexes[index]
+        search.pointer = self.pointers[index]
+        search.length = self.lengths[index] or None
+        search.mismatches = self.mismatches[index]
+        search.start_coord = tuple(self.coordinates[index * 4:index * 4 + 2])
+        search.end_coord = tuple(self.coordinates[index * 4 + 2:index * 4 + 4])
+        return search
+
+    def __setitem__(self, index, search):
+        if index < 0:
+            index += len(self)
+
+        if not search.was_found or search.start_coord is None:
+            self.directions[index] = SearchStore.NOT_FOUND
+            return
+
+        self.directions[index] = SearchStore.DIRECTIONS.index(
+            (search.found_by, search.is_reverse)
+        )
+        self.indexes[index] = search.current_index
+        self.pointers[index] = search.pointer
+        self.lengths[index] = search.length or 0
+        self.mismatches[index] = search.mismatches
+        self.coordinates[index * 4:index * 4 + 4] = array(
+            "i", search.start_coord + search.end_coord
+        )
+
+    def __iter__(self):
+        for index in range(0, len(self)):
+            yield self[index]
+
+class FirstPositions:
+    """
+    This class describes the position of the first search of every word.
+
+    The positions are kept in an open addressing table of ints indexed by the
+    hash of the words, the word of a position is read back from the searches
+    so no word nor result is held next to them.
+    """
+
+    EMPTY = -1
+
+    def __init__(self, count, get_word):
+        """
+        Constructs a new instance.
+
+        :param      count:     The number of searches
+        :type       count:     number
+        :param      get_word:  Gets the word of a search position
+        :type       get_word:  function
+        """
+
+        size = 1
+        while size < count * 2:
+            size *= 2
+        self.mask = size - 1
+        self.positions = array("i", [FirstPositions.EMPTY]) * size
+        self.get_word = get_word
+
+    def setdefault(self, word, position):
+        """
+        Gets the position of the first search of a word, the position given
+        is kept when the word has none yet.
+
+        :param      word:      The word
+        :type       word:      string
+        :param      position:  The search position
+        :type       position:  number
+
+        :returns:   The position of the first search of the word
+        :rtype:     number
+        """
+
+        slot = hash(word) & self.mask
+        while True:
+            first = self.positions[slot]
+            if first == FirstPositions.EMPTY:
+                self.positions[slot] = position
+                return position
+            if self.get_word(first) == word:
+                return first
+            slot = (slot + 1) & self.mask
+
+class LetterFilter:
+    """
+    This class describes the letters and bigrams a grid holds.
+
+    Every letter of the grid is numbered and every pair of neighbour letters,
+    in any direction, sets one bit of an integer, so a word the grid can not
+    hold is rejected in the length of the word without reading a straight.
+    """
+
+    def __init__(self, grid):
+        """
+        Constructs a new instance.
+
+        :param      grid:  The grid
+        :type       grid:  Grid
+        """
+
+        rows = [str(row) for row in grid.rows]
+        self.longest = max(grid.row_max_count, grid.column_max_count)
+        self.numbers = dict(
+            (letter, number) for number, letter in enumerate(sorted(set("".join(rows))))
+        )
+
+        # The neighbours in the rows, columns, diagonals and anti diagonals,
+        # until every bigram is found
+        pairs = set()
+        every = len(self.numbers) ** 2
+        for number, row in enumerate(rows):
+            pairs.update(zip(row, row[1:]))
+            if number:
+                upper = rows[number - 1]
+                pairs.update(zip(upper, row))
+                pairs.update(zip(upper, row[1:]))
+                pairs.update(zip(upper[1:], row))
+            if len(pairs) == every:
+                break
+
+        # Both orders, the words are also searched reversed
+        self.bigrams = 0
+        for first, second in pairs:
+            self.bigrams |= 1 << self.get_bigram(self.numbers[first], self.numbers[second])
+            self.bigrams |= 1 << self.get_bigram(self.numbers[second], self.numbers[first])
+
+    def get_bigram(self, first, second):
+        """
+        Gets the bit of a bigram.
+
+        :param      first:   The number of the first letter
+        :type       first:   number
+        :param      second:  The number of the second letter
+        :type       second:  number
+
+        :returns:   The bit
+        :rtype:     number
+        """
+
+        return first * len(self.numbers) + second
+
+    def rejects(self, word):
+        """
+        Determines if the grid can not hold a word: it is longer than every
+        straight, or has a letter or a bigram the grid does not have.
+
+        :param      word:  The word
+        :type       word:  string
+
+        :returns:   True if the word can not be in the grid, False otherwise.
+        :rtype:     boolean
+        """
+
+        if len(word) > self.longest:
+            return True
+
+        numbers = self.numbers
+        bigrams = self.bigrams
+        previous = None
+        for letter in word:
+            number = numbers.get(letter)
+            if number is None:
+                return True
+            if previous is not None and not bigrams >> self.get_bigram(previous, number) & 1:
+                return True
+            previous = number
+        return False
+
+class CrossWords:
+    """
+    This class describes cross words.
+    """
+
+    ENGINE_SCAN      = "SCAN"
+    ENGINE_AUTOMATON = "AUTOMATON"
+    ENGINE_PATTERN   = "PATTERN"
+    ENGINE_INDEX     = "INDEX"
+    ENGINES          = (ENGINE_SCAN, ENGINE_AUTOMATON, ENGINE_PATTERN, ENGINE_INDEX)
+
+    """Matches any run of letters in the words searched as patterns"""
+    ANY_LETTERS      = "*"
+
+    """The most cells of a grid whose suffix index is built for one search"""
+    SUFFIX_INDEX_CELLS = 40000
+
+    BACKEND_PYTHON   = "PYTHON"
+    BACKEND_NUMPY    = "NUMPY"
+    BACKENDS         = (BACKEND_PYTHON, BACKEND_NUMPY)
+
+    """The search directions in searching order and their grid lines"""
+    FAMILIES         = (
+        (Search.BY_ROW, "horizontals"),
+        (Search.BY_COLUMN, "verticals"),
+        (Search.BY_DIAGONAL, "diagonals"),
+        (Search.BY_ANTI_DIAGONAL, "anti_diagonals"),
+    )
+
+    def __init__(self, backend = BACKEND_PYTHON):
+        """
+        Constructs a new instance.
+
+        :param      backend:  The grid backend, one of CrossWords.BACKENDS
+        :type       backend:  string
+        """
+
+        self.searches = []
+        self.grid = NumpyGrid() if backend == CrossWords.BACKEND_NUMPY else Grid()
+        self.index = None
+        self.suffix_index = None
+        self.pruned = set()
+        self.memo = None
+        self.metrics = NULL_METRICS
+        self.lines_scanned = 0
+        self.searches_pruned = 0
+        self.max_mismatches = 0
+        self.engine = CrossWords.ENGINE_SCAN
+        self.has_result = False
+
+    def add_row(self, row):
+        """
+        Adds a row.
+
+        :param      row:  The row
+        :type       row:  string
+        """
+
+        self.grid.add_row(row)
+        self.grid.generate_horizontals()
+        return self
+
+    def init_puzzle(self):
+        """
+        Initializes the puzzle, the straights are generated when the searches
+        first reach them.
+        """
+
+        self.grid.generate_horizontals()
+        return self
+
+    def generate_straights(self):
+        """
+        Generates every straight now rather than on first search.
+        """
+
+        for found_by, straights in self.get_straights():
+            pass
+        return self
+
+    def use_index(self, index):
+        """
+        Use a precomputed grid index in place of the grid, the index grid
+        already has all its straights so the puzzle needs no initialization.
+
+        :param      index:  The index
+        :type       index:  GridIndex
+        """
+
+        self.grid = index.grid
+        self.index = index
+        return self
+
+    def use_suffix_index(self, suffix_index):
+        """
+        Use a suffix index of the grid to locate the searches, rather than
+        scanning the straights.
+
+        :param      suffix_index:  The suffix index, None to scan the straights
+        :type       suffix_index:  SuffixIndex
+        """
+
+        self.suffix_index = suffix_index
+        return self
+
+    def build_suffix_index(self):
+        """
+        Builds the suffix index of the grid and use it.
+
+        :returns:   The suffix index
+        :rtype:     SuffixIndex
+        """
+
+        from cache import SuffixIndex
+
+        with self.metrics.stage("build_suffix_index"):
+            self.suffix_index = SuffixIndex(self.get_straights())
+        return self.suffix_index
+
+    def fits_suffix_index(self):
+        """
+        Determines if the grid is small enough to build its suffix index.
+
+        :returns:   True if the grid has at most SUFFIX_INDEX_CELLS cells, False
+                    otherwise.
+        :rtype:     boolean
+        """
+
+        return sum(len(row) for row in self.grid.rows) <= CrossWords.SUFFIX_INDEX_CELLS
+
+    def build_search_index(self):
+        """
+        Builds the suffix index of a grid up to SUFFIX_INDEX_CELLS cells, the
+        suffixes of a larger grid take longer to sort than its searches so it
+        uses the n-gram index instead.
+        """
+
+        if self.fits_suffix_index():
+            self.build_suffix_index()
+        elif self.index is None:
+            from cache import GridIndex
+
+            with self.metrics.stage("build_index"):
+                self.use_index(GridIndex(self.grid, self.get_straights()))
+        return self
+
+    def filter_searches(self, searches = None):
+        """
+        Marks not found, without searching them, the words the grid can not
+        hold according to its letters and bigrams.
+
+        :param      searches:  The searches, all the searches when None
+        :type       searches:  list
+
+        :returns:   The number of searches pruned
+        :rtype:     number
+        """
+
+        if searches is None:
+            searches = self.searches
+
+        searches_pruned = self.searches_pruned
+        for search in searches:
+            if search.word in self.pruned:
+                self.searches_pruned += 1
+            elif self.rejects(search):
+                self.pruned.add(search.word)
+        return self.searches_pruned - searches_pruned
+
+    def rejects(self, search):
+        """
+        Determines if the grid can not hold a search, which is then counted as
+        pruned.
+
+        :param      search:  The search
+        :type       search:  Search
+
+        :returns:   True if the search can not be in the grid, False otherwise.
+        :rtype:     boolean
+        """
+
+        if self.grid.get_letter_filter().rejects(search.word):
+            self.searches_pruned += 1
+            return True
+        return False
+
+    def use_store(self, store):
+        """
+        Keep the searches in a columnar store, the searches already added are
+        moved to it.
+
+        :param      store:  The store
+        :type       store:  SearchStore
+        """
+
+        for search in self.searches:
+            store.append(search)
+        self.searches = store
+        return self
+
+    def set_cell(self, row, column, letter):
+        """
+        Changes the letter of a cell and search again the searches the change
+        may affect: the searches not found holding the letter, the searches
+        found in a straight through the cell, and the searches holding the
+        letter found after a straight through the cell. They are searched
+        with the engine of the puzzle, so the patterns keep their wildcards
+        and mismatches, a letter a pattern does not hold only adds a mismatch.
+
+        A grid shared with an index cache is copied before being changed, the
+        suffix index is dropped until the next search with the index engine
+        and the pruned searches are searched again.
+
+        :param      row:         The row
+        :type       row:         number
+        :param      column:      The column
+        :type       column:      number
+        :param      letter:      The letter
+        :type       letter:      string
+
+        :returns:   The positions of the searches searched again
+        :rtype:     list
+
+        :raises     ValueError:  If the cell or the letter is not valid
+        """
+
+        lines = self.grid.get_cell_lines(row, column)
+        self.suffix_index = None
+        self.pruned = set()
+        if self.index is not None:
+            self.index = self.index.copy()
+            self.grid = self.index.grid
+            previous = [self.get_straight(*line) for line in lines]
+
+        self.grid.set_cell(row, column, letter)
+        letter = str(letter).upper()
+
+        if self.index is not None:
+            self.index.update_lines([
+                (line, before, self.get_straight(*line))
+                for line, before in zip(lines, previous)
+            ])
+
+        ranks = dict(
+            (found_by, rank) for rank, (found_by, name) in enumerate(CrossWords.FAMILIES)
+        )
+        first = min((ranks[found_by], index) for found_by, index in lines)
+        affected = set(lines)
+
+        positions = []
+        solved = FirstPositions(len(self.searches), self.get_word)
+        for position, search in enumerate(self.searches):
+            if not search.was_found:
+                if letter not in search.word:
+                    continue
+            elif (search.found_by, search.current_index) not in affected:
+                if letter not in search.word:
+                    continue
+                if first > (ranks[search.found_by], search.current_index):
+                    continue
+
+            first_position = solved.setdefault(search.word, position)
+            search = Search(search.word)
+            if first_position == position:
+                self.find(search)
+            else:
+                search.set_result(self.searches[first_position].get_result())
+            self.searches[position] = search
+            positions.append(position)
+
+        return positions
+
+    def add_searches(self, word):
+        """
+        Adds searches.
+
+        :param      word:  The word
+        :type       word:  string
+        """
+
+        self.searches.append(Search(word))
+        return self
+
+    def get_word(self, position):
+        """
+        Gets the word of a search, without building it from a store.
+
+        :param      position:  The search position
+        :type       position:  number
+
+        :returns:   The word
+        :rtype:     string
+        """
+
+        if isinstance(self.searches, SearchStore):
+            return self.searches.get_word(position)
+        return self.searches[position].word
+
+    def get_searches(self):
+        """
+        Gets the searches.
+
+        :returns:   The searches.
+        :rtype:     list
+        """
+
+        return self.searches
+
+    def get_straights(self):
+        """
+        Iterate over the straights in the order they are searched, each
+        direction is only generated when the iteration reaches it.
+
+        :returns:   Pairs of the search direction and its straights
+        :rtype:     generator
+        """
+
+        for found_by, name in CrossWords.FAMILIES:
+            if self.metrics.enabled and not self.grid.is_generated(name):
+                with self.metrics.stage("generate_" + name):
+                    straights = getattr(self.grid, name)
+            else:
+                straights = getattr(self.grid, name)
+            yield found_by, straights
+
+    def get_straight(self, found_by, index):
+        """
+        Gets a straight.
+
+        :param      found_by:  The straight direction
+        :type       found_by:  string
+        :param      index:     The straight index
+        :type       index:     number
+
+        :returns:   The straight
+        :rtype:     string
+        """
+
+        for direction, straights in self.get_straights():
+            if direction == found_by:
+                return straights[index]
+
+    def is_in_puzzle(self, search):
+        """
+        Determines whether the specified search is in puzzle.
+
+        :param      search:  The search
+        :type       search:  string
+
+        :returns:   True if the specified search is in puzzle, False otherwise.
+        :rtype:     boolean
+        """
+
+        if self.index is not None:
+            candidates = self.index.candidate_lines(search.word)
+            if candidates is not None:
+                return self.is_in_candidates(search, candidates)
+
+        # search in rows, columns, diagonals then anti diagonals
+        for found_by, straights in self.get_straights():
+            if self.is_in_grid(search, straights):
+                search.found_by = found_by
+                return True
+
+        return False
+
+    def is_in_suffix_index(self, search):
+        """
+        Determines whether the search is in the puzzle using the suffix
+        index, the pointer is set from the index.
+
+        :param      search:  The search
+        :type       search:  Search
+
+        :returns:   True if the search is in the puzzle, False otherwise.
+        :rtype:     boolean
+        """
+
+        location = self.suffix_index.locate(search.word)
+        if location is None:
+            return False
+
+        search.found_by, search.current_index, search.is_reverse, search.pointer = location
+        search.was_found = True
+        self.has_result = True
+        return True
+
+    def is_in_candidates(self, search, candidates):
+        """
+        Determines whether the search is in the candidate straights.
+
+        :param      search:      The search
+        :type       search:      Search
+        :param      candidates:  The (direction, index) of the straights in
+                                 searching order
+        :type       candidates:  list
+
+        :returns:   True if in a candidate straight, False otherwise.
+        :rtype:     boolean
+        """
+
+        reverse = search.word[::-1]
+        for number, (found_by, index) in enumerate(candidates):
+            straight = self.get_straight(found_by, index)
+            if search.word in straight or reverse in straight:
+                search.current_index = index
+                search.was_found = True
+                search.found_by = found_by
+                if reverse in straight:
+                    search.is_reverse = True
+                self.lines_scanned += number + 1
+                return True
+        self.lines_scanned += len(candidates)
+        return False
+
+    def is_in_grid(self, search, straights):
+        """
+        Determines if in grid.
+
+        :param      search:     The search
+        :type       search:     Search
+        :param      straights:  The straights
+        :type       straights:  string
+
+        :returns:   True if in grid, False otherwise.
+        :rtype:     boolean
+        """
+
+        for index, straight in enumerate(straights):
+            if search.word in straight or search.word[::-1] in straight:
+                search.current_index = index
+                search.was_found = True
+                if search.word[::-1] in straight:
+                    search.is_reverse = True
+                self.lines_scanned += index + 1
+                return True
+        self.lines_scanned += len(straights)
+        return False
+
+    def iter_matches(self, search):
+        """
+        Iterate over every occurrence of the search in the puzzle, as a
+        pattern with the pattern engine.
+
+        Matches are yielded lazily in the searching order, straight by
+        straight, so nothing is collected in memory.
+
+        :param      search:  The search
+        :type       search:  Search
+
+        :returns:   The (x, y) start, the (x, y) end, the direction and the
+                    mismatches of every match
+        :rtype:     generator
+        """
+
+        if self.engine == CrossWords.ENGINE_PATTERN:
+            matches = self.iter_pattern_matches(search.word)
+        else:
+            matches = self.iter_word_matches(search.word)
+
+        for found_by, index, is_reverse, pointer, length, mismatches in matches:
+            first = self.grid.get_position(found_by, index, pointer)
+            last = self.grid.get_position(found_by, index, pointer + length - 1)
+            if is_reverse:
+                first, last = last, first
+            yield (
+                (first[1], first[0]),
+                (last[1], last[0]),
+                Search.DIRECTIONS[(found_by, is_reverse)],
+                mismatches
+            )
+
+    def iter_word_matches(self, word):
+        """
+        Iterate over every occurrence of a word and of its reverse.
+
+        :param      word:  The word
+        :type       word:  string
+
+        :returns:   The straight direction and index, True for the reverse,
+                    the pointer, length and mismatches of every match
+        :rtype:     generator
+        """
+
+        patterns = [(False, word)]
+        if word[::-1] != word:
+            patterns.append((True, word[::-1]))
+
+        for found_by, straights in self.get_straights():
+            for index, straight in enumerate(straights):
+                for is_reverse, pattern in patterns:
+                    pointer = straight.find(pattern)
+                    while pointer != -1:
+                        yield found_by, index, is_reverse, pointer, len(word), 0
+                        pointer = straight.find(pattern, pointer + 1)
+
+    def iter_pattern_matches(self, word):
+        """
+        Iterate over every match of a pattern and of its reverse, within the
+        mismatches allowed.
+
+        :param      word:  The pattern
+        :type       word:  string
+
+        :returns:   The straight direction and index, True for the reverse,
+                    the pointer, length and mismatches of every match
+        :rtype:     generator
+        """
+
+        parts, matcher = self.compile_patterns([word])
+        keys = [False]
+        if parts[(word, True)] != parts[(word, False)]:
+            keys.append(True)
+
+        for found_by, index, gaps, hits in self.iter_pattern_lines(parts, matcher, {word}):
+            for is_reverse in keys:
+                occurrences = hits.get((word, is_reverse))
+                if occurrences is None:
+                    continue
+                for pointer, length, mismatches in self.iter_chains(
+                        parts[(word, is_reverse)], occurrences, gaps):
+                    yield found_by, index, is_reverse, pointer, length, mismatches
+
+    def sync_pointer(self, search):
+        """
+        Sync the pointer position
+
+        :param      search:  The search
+        :type       search:  Search
+        """
+
+        word = search.word
+        match = self.get_straight(search.found_by, search.current_index)
+
+        if search.is_reverse:
+            word = word[::-1]
+
+        search.pointer = match.find(word)
+        self.has_result = True
+        return self
+
+    def search(self, engine = ENGINE_SCAN):
+        """
+        Search every word of the searches.
+
+        :param      engine:  The engine, one of CrossWords.ENGINES
+        :type       engine:  string
+        """
+
+        self.engine = engine
+        if engine == CrossWords.ENGINE_AUTOMATON:
+            return self.search_with_automaton()
+        if engine == CrossWords.ENGINE_PATTERN:
+            return self.search_with_patterns()
+        if engine == CrossWords.ENGINE_INDEX and self.suffix_index is None:
+            self.build_search_index()
+
+        # Duplicated words are only searched once
+        solved = FirstPositions(len(self.searches), self.get_word)
+        for position, search in enumerate(self.searches):
+            first = solved.setdefault(search.word, position)
+            if first == position:
+                self.find(search)
+            else:
+                search.set_result(self.searches[first].get_result())
+            # Written back for the searches kept in a store
+            self.searches[position] = search
+
+        return self
+
+    def find(self, search):
+        """
+        Find the search in the puzzle and create its coordinates, as a
+        pattern with the pattern engine.
+
+        :param      search:  The search
+        :type       search:  Search
+
+        :returns:   True if the search was found, False otherwise.
+        :rtype:     boolean
+        """
+
+        if search.word in self.pruned:
+            return False
+
+        if self.recall(search):
+            return search.was_found
+
+        if self.metrics.enabled:
+            lines_scanned = self.lines_scanned
+            started = time.perf_counter()
+
+        if self.engine == CrossWords.ENGINE_PATTERN:
+            self.find_pattern(search)
+        elif self.suffix_index is not None:
+            if self.is_in_suffix_index(search):
+                search.create_coordinates(self.grid)
+        elif self.is_in_puzzle(search):
+            self.sync_pointer(search)
+            search.create_coordinates(self.grid)
+
+        if self.metrics.enabled:
+            self.metrics.observe("search_seconds", time.perf_counter() - started)
+            self.metrics.observe("lines_scanned_per_search", self.lines_scanned - lines_scanned)
+
+        self.memorize(search)
+        return search.was_found
+
+    def get_memo_key(self, word):
+        """
+        Gets the memo key of a word searched in the grid.
+
+        :param      word:  The word
+        :type       word:  string
+
+        :returns:   The grid fingerprint and the word, with the mismatches
+                    allowed by the pattern engine
+        :rtype:     tuple
+        """
+
+        key = (self.grid.fingerprint(), word)
+        if self.engine == CrossWords.ENGINE_PATTERN:
+            key += (self.max_mismatches,)
+        return key
+
+    def recall(self, search):
+        """
+        Sets the memoized result of a search.
+
+        :param      search:  The search
+        :type       search:  Search
+
+        :returns:   True if the search result was memoized, False otherwise.
+        :rtype:     boolean
+        """
+
+        if self.memo is None:
+            return False
+
+        result = self.memo.get(self.get_memo_key(search.word))
+        if result is None:
+            return False
+
+        search.set_result(result)
+        self.has_result = self.has_result or search.was_found
+        return True
+
+    def memorize(self, search):
+        """
+        Memoize the result of a search.
+
+        :param      search:  The search
+        :type       search:  Search
+        """
+
+        if self.memo is not None:
+            self.memo.set(self.get_memo_key(search.word), search.get_result())
+        return self
+
+    def recall_searches(self):
+        """
+        Sets the memoized result of the searches, and gets the others to
+        search.
+
+        :returns:   The positions of every word neither pruned nor memoized
+        :rtype:     dictionary
+        """
+
+        pending = {}
+        for position, search in enumerate(self.searches):
+            if search.word in self.pruned:
+                continue
+            if search.word not in pending and self.recall(search):
+                self.searches[position] = search
+                continue
+            pending.setdefault(search.word, []).append(position)
+        return pending
+
+    def memorize_searches(self, searched):
+        """
+        Memoize the result of the searches of every word searched.
+
+        :param      searched:  The positions of every word searched
+        :type       searched:  dictionary
+        """
+
+        if self.memo is not None:
+            for positions in searched.values():
+                self.memorize(self.searches[positions[0]])
+        return self
+
+    def search_with_automaton(self):
+        """
+        Search every word at once using an Aho-Corasick automaton.
+
+        Each straight is scanned only once for all the words and their
+        reverses, the first straight holding a word resolves it exactly like
+        `is_in_puzzle` and `sync_pointer` would.
+        """
+
+        pending = self.recall_searches()
+        searched = dict(pending) if self.memo is not None else {}
+
+        automaton = AhoCorasick()
+        for word in pending:
+            automaton.add_word(word, (word, False))
+            automaton.add_word(word[::-1], (word, True))
+
+        for found_by, straights in self.get_straights():
+            for index, straight in enumerate(straights):
+                if not pending:
+                    break
+
+                self.lines_scanned += 1
+                hits = {}
+                for position, (word, is_reverse) in automaton.iter_matches(straight):
+                    if word not in pending:
+                        continue
+                    positions = hits.setdefault(word, [None, None])
+                    if positions[is_reverse] is None:
+                        positions[is_reverse] = position
+
+                for word, (forward, reverse) in hits.items():
+                    for position in pending.pop(word):
+                        search = self.searches[position]
+                        search.was_found = True
+                        search.found_by = found_by
+                        search.current_index = index
+                        search.is_reverse = reverse is not None
+                        search.pointer = reverse if search.is_reverse else forward
+                        search.create_coordinates(self.grid)
+                        self.searches[position] = search
+                        self.has_result = True
+
+            # Resolved before the next direction is generated
+            if not pending:
+                break
+
+        self.memorize_searches(searched)
+        return self
+
+    def search_with_patterns(self):
+        """
+        Search every word as a pattern using a bit-parallel Shift-Add matcher.
+
+        In a pattern `?` matches any letter and `*` any run of letters, and a
+        match may have up to `max_mismatches` letters differing from the
+        pattern. Each straight is scanned only once for all the patterns and
+        their reverses, the first straight holding a pattern resolves it at
+        its leftmost match like `is_in_puzzle` and `sync_pointer` would.
+        """
+
+        pending = self.recall_searches()
+        searched = dict(pending) if self.memo is not None else {}
+
+        for word, found_by, index, is_reverse, match in self.locate_patterns(list(pending)):
+            for position in pending.pop(word):
+                search = self.searches[position]
+                self.set_pattern_match(search, found_by, index, is_reverse, match)
+                self.searches[position] = search
+
+        self.memorize_searches(searched)
+        return self
+
+    def find_pattern(self, search):
+        """
+        Find a single search as a pattern, like `search_with_patterns`.
+
+        :param      search:  The search
+        :type       search:  Search
+
+        :returns:   True if the search was found, False otherwise.
+        :rtype:     boolean
+        """
+
+        for word, found_by, index, is_reverse, match in self.locate_patterns([search.word]):
+            self.set_pattern_match(search, found_by, index, is_reverse, match)
+        return search.was_found
+
+    def set_pattern_match(self, search, found_by, index, is_reverse, match):
+        """
+        Resolves a search at a pattern match and create its coordinates.
+
+        :param      search:      The search
+        :type       search:      Search
+        :param      found_by:    The straight direction
+        :type       found_by:    string
+        :param      index:       The straight index
+        :type       index:       number
+        :param      is_reverse:  True when the reverse pattern matched
+        :type       is_reverse:  boolean
+        :param      match:       The start, length and mismatches of the match
+        :type       match:       tuple
+        """
+
+        search.was_found = True
+        search.found_by = found_by
+        search.current_index = index
+        search.is_reverse = is_reverse
+        search.pointer, search.length, search.mismatches = match
+        search.create_coordinates(self.grid)
+        self.has_result = True
+        return self
+
+    def locate_patterns(self, words):
+        """
+        Iterate over the first straight holding each pattern, every straight
+        is scanned once for all the patterns left.
+
+        :param      words:  The patterns
+        :type       words:  list
+
+        :returns:   The pattern, the straight direction and index, True when
+                    the reverse pattern matched, and the match of every
+                    pattern found
+        :rtype:     generator
+        """
+
+        pending = set(words)
+        if not pending:
+            return
+
+        parts, matcher = self.compile_patterns(pending)
+        for found_by, index, gaps, hits in self.iter_pattern_lines(parts, matcher, pending):
+            self.lines_scanned += 1
+
+            matches = {}
+            for key, occurrences in hits.items():
+                match = self.chain_parts(parts[key], occurrences, gaps)
+                if match is not None:
+                    matches.setdefault(key[0], [None, None])[key[1]] = match
+
+            for word, (forward, reverse) in matches.items():
+                pending.discard(word)
+                if reverse is not None:
+                    yield word, found_by, index, True, reverse
+                else:
+                    yield word, found_by, index, False, forward
+
+            # Resolved before the next straight is generated
+            if not pending:
+                return
+
+    def compile_patterns(self, words):
+        """
+        Compiles the patterns and their reverses in one Shift-Add matcher, the
+        letters between the stars of a pattern are matched as separate parts.
+
+        :param      words:  The patterns
+        :type       words:  list
+
+        :returns:   The parts of every (pattern, is_reverse) and the matcher
+        :rtype:     tuple
+        """
+
+        parts = {}
+        matcher = ShiftAdd(self.max_mismatches)
+        for word in words:
+            forward = [part for part in word.split(CrossWords.ANY_LETTERS) if part]
+            parts[(word, False)] = forward
+            parts[(word, True)] = [part[::-1] for part in reversed(forward)]
+            for key in ((word, False), (word, True)):
+                for number, part in enumerate(parts[key]):
+                    matcher.add_word(part, (key, number))
+        return parts, matcher
+
+    def iter_pattern_lines(self, parts, matcher, pending):
+        """
+        Iterate over the straights with the occurrences of the pattern parts
+        they hold, every straight is scanned once for all the parts.
+
+        :param      parts:    The parts of every (pattern, is_reverse)
+        :type       parts:    dictionary
+        :param      matcher:  The matcher of the parts
+        :type       matcher:  ShiftAdd
+        :param      pending:  The patterns still searched, the others are left
+                              out of the occurrences
+        :type       pending:  set
+
+        :returns:   The straight direction and index, the sorted offsets of
+                    its gaps, and the (start, mismatches) of every part of
+                    each (pattern, is_reverse) it holds
+        :rtype:     generator
+        """
+
+        for found_by, straights in self.get_straights():
+            for index, straight in enumerate(straights):
+                text = str(straight)
+                gaps = None
+                if Grid.GAP in text:
+                    gaps = [offset for offset, letter in enumerate(text) if letter == Grid.GAP]
+
+                hits = {}
+                for start, (key, number), mismatches in matcher.iter_matches(text):
+                    if key[0] in pending:
+                        occurrences = hits.setdefault(key, [[] for part in parts[key]])
+                        occurrences[number].append((start, mismatches))
+                yield found_by, index, gaps, hits
+
+    def chain_parts(self, parts, occurrences, gaps = None):
+        """
+        Find the leftmost match of the parts of a pattern in a straight, each
+        part following the previous one within the mismatches left and without
+        a gap between them.
+
+        :param      parts:        The letters between the stars of the pattern
+        :type       parts:        list
+        :param      occurrences:  The (start, mismatches) of every part in the
+                                  straight, in order
+        :type       occurrences:  list
+        :param      gaps:         The sorted offsets of the straight gaps
+        :type       gaps:         list
+
+        :returns:   The start, length and mismatches of the match, None when
+                    not matched
+        :rtype:     tuple
+        """
+
+        return next(self.iter_chains(parts, occurrences, gaps), None)
+
+    def iter_chains(self, parts, occurrences, gaps = None):
+        """
+        Iterate over the matches of the parts of a pattern in a straight, one
+        for every start of the first part, each following part being its
+        first occurrence within the mismatches left and without a gap between.
+
+        :param      parts:        The letters between the stars of the pattern
+        :type       parts:        list
+        :param      occurrences:  The (start, mismatches) of every part in the
+                                  straight, in order
+        :type       occurrences:  list
+        :param      gaps:         The sorted offsets of the straight gaps
+        :type       gaps:         list
+
+        :returns:   The start, length and mismatches of every match
+        :rtype:     generator
+        """
+
+        for start, mismatches in occurrences[0]:
+            end = start + len(parts[0])
+            for number in range(1, len(parts)):
+                following = None
+                for part_start, part_mismatches in occurrences[number]:
+                    if part_start >= end and mismatches + part_mismatches <= self.max_mismatches:
+                        following = (part_start, part_mismatches)
+                        break
+                if following is None:
+                    break
+                if gaps:
+                    gap = bisect.bisect_left(gaps, end)
+                    if gap < len(gaps) and gaps[gap] < following[0]:
+                        break
+                end = following[0] + len(parts[number])
+                mismatches += following[1]
+            else:
+                yield (start, end - start, mismatches)
+
+    def preview_grid(self, padding = 0):
+        """
+        Prints out the puzzle grid
 
         :param      padding:  The padding for X/Y axis
         :type       padding:  number
         """
 
-        row_guide = "  ".join([ str(num + padding) for num in range(0, self.grid.row_max_count) ])
+        row_guide = "  ".join([ str(num + padding) for num in range(0, self.grid.column_max_count) ])
         print("\n     " + row_guide + "\n")
         for r in range(0, self.grid.row_max_count):
             print("{0}   ".format(r + padding), end='')
-            for c in range(0, self.grid.column_max_count):
+            for c in range(0, len(self.grid.rows[r])):
                 print(" %c " % self.grid.cells[r][c], end='')
             print()
         print()
+
+class WordMatcher:
+    """
+    This class describes a word list compiled once to be matched against many
+    grids.
+
+    The words and their reverses make a single Aho-Corasick automaton, the
+    straights of a grid are joined in one text read once for all the words,
+    and a grid is reported as a row of hits, one byte per word set to 1 when
+    the grid holds it.
+
+    With the numpy backend the automaton is expanded to a transition table
+    and the grids of the same shape are read together, one table lookup per
+    letter for the whole batch.
+    """
+
+    """Ends every straight of the text of a grid"""
+    SEPARATOR = "\n"
+
+    """The grids read together by the numpy backend"""
+    BATCH_SIZE = 1024
+
+    """The most letters read together by the numpy backend"""
+    BATCH_LETTERS = 1 << 22
+
+    def __init__(self, words, backend = CrossWords.BACKEND_PYTHON):
+        """
+        Constructs a new instance.
+
+        :param      words:    The words
+        :type       words:    list
+        :param      backend:  The matching backend, one of CrossWords.BACKENDS
+        :type       backend:  string
+
+        :raises     ValueError:  If a word is not only letters or numpy is
+                                 missing for the numpy backend
+        """
+
+        if backend == CrossWords.BACKEND_NUMPY and not has_numpy():
+            raise ValueError("numpy is required for the {} backend".format(backend))
+
+        self.backend = backend
+        self.words = []
+        self.automaton = AhoCorasick()
+        for number, word in enumerate(words):
+            word = str(word).upper()
+            if not word.isalpha():
+                raise ValueError("{} is not a valid word".format(word))
+            self.words.append(word)
+            self.automaton.add_word(word, number)
+            if word[::-1] != word:
+                self.automaton.add_word(word[::-1], number)
+        self.automaton.build()
+
+        self.table = None
+        self.layouts = {}
+
+    def get_rows(self, grid):
+        """
+        Gets the upper case rows of a grid.
+
+        :param      grid:  The grid, a Grid, its rows or its text
+        :type       grid:  Grid|list|string
+
+        :returns:   The rows
+        :rtype:     list
+        """
+
+        if isinstance(grid, Grid):
+            return [str(row) for row in grid.rows]
+        if isinstance(grid, str):
+            grid = grid.splitlines()
+        return [str(row).upper() for row in grid]
+
+    def get_grid(self, grid):
+        """
+        Gets a grid of its rows or its text.
+
+        :param      grid:  The grid, a Grid, its rows or its text
+        :type       grid:  Grid|list|string
+
+        :returns:   The grid
+        :rtype:     Grid
+        """
+
+        if isinstance(grid, Grid):
+            return grid
+
+        rows = grid
+        grid = Grid()
+        for row in self.get_rows(rows):
+            grid.add_row(row)
+        return grid
+
+    @staticmethod
+    def get_text(grid):
+        """
+        Gets the straights of a grid in searching order joined by the
+        separator.
+
+        :param      grid:  The grid
+        :type       grid:  Grid
+
+        :returns:   The text
+        :rtype:     string
+        """
+
+        return WordMatcher.SEPARATOR.join(
+            WordMatcher.SEPARATOR.join(getattr(grid, name)) for found_by, name in CrossWords.FAMILIES
+        )
+
+    def find_words(self, grid):
+        """
+        Finds the words a grid holds.
+
+        :param      grid:  The grid, a Grid, its rows or its text
+        :type       grid:  Grid|list|string
+
+        :returns:   The hits, 1 for every word found
+        :rtype:     bytearray
+        """
+
+        outputs = self.automaton.outputs
+        hits = bytearray(len(self.words))
+        for state in self.automaton.find_states(self.get_text(self.get_grid(grid))):
+            for length, number in outputs[state]:
+                hits[number] = 1
+        return hits
+
+    def iter_hits(self, grids, batch_size = BATCH_SIZE):
+        """
+        Finds the words of every grid, in the grids order.
+
+        :param      grids:       The grids, each a Grid, its rows or its text
+        :type       grids:       iterable
+        :param      batch_size:  The grids read together by the numpy backend
+        :type       batch_size:  number
+
+        :returns:   The hits of every grid
+        :rtype:     generator
+        """
+
+        if self.backend != CrossWords.BACKEND_NUMPY:
+            for grid in grids:
+                yield self.find_words(grid)
+            return
+
+        batch = []
+        for grid in grids:
+            batch.append(self.get_rows(grid))
+            if len(batch) >= batch_size:
+                yield from self.match_batch(batch)
+                batch = []
+        if batch:
+            yield from self.match_batch(batch)
+
+    def hit_matrix(self, grids):
+        """
+        Finds the words of every grid.
+
+        :param      grids:  The grids, each a Grid, its rows or its text
+        :type       grids:  iterable
+
+        :returns:   The hits of every grid, in the grids order
+        :rtype:     list
+        """
+
+        return list(self.iter_hits(grids))
+
+    def match_batch(self, batch):
+        """
+        Finds the words of a batch of grids, the rectangular ASCII grids of a
+        shape are matched together, the others one by one.
+
+        :param      batch:  The upper case rows of every grid
+        :type       batch:  list
+
+        :returns:   The hits of every grid
+        :rtype:     list
+        """
+
+        hits = [None] * len(batch)
+        shapes = {}
+        for number, rows in enumerate(batch):
+            if rows and len(set(map(len, rows))) == 1 and all(map(str.isascii, rows)):
+                shapes.setdefault((len(rows), len(rows[0])), []).append(number)
+            else:
+                hits[number] = self.find_words(rows)
+
+        for shape, numbers in shapes.items():
+            step = max(1, WordMatcher.BATCH_LETTERS // len(self.get_layout(*shape)))
+            for start in range(0, len(numbers), step):
+                chunk = numbers[start:start + step]
+                for number, row in zip(chunk, self.match_shape(shape, [batch[n] for n in chunk])):
+                    hits[number] = row
+        return hits
+
+    def get_layout(self, row_count, column_count):
+        """
+        Gets the cell read at every letter of the text of a grid of a shape,
+        the separators and gaps read the cell after the last one.
+
+        :param      row_count:     The number of rows
+        :type       row_count:     number
+        :param      column_count:  The number of columns
+        :type       column_count:  number
+
+        :returns:   The cells
+        :rtype:     numpy.ndarray
+        """
+
+        shape = (row_count, column_count)
+        if shape not in self.layouts:
+            numpy = import_numpy()
+            cell_count = row_count * column_count
+            grid = Grid()
+            for row in range(row_count):
+                grid.add_row("A" * column_count)
+
+            layout = []
+            for found_by, name in CrossWords.FAMILIES:
+                for index, straight in enumerate(getattr(grid, name)):
+                    for offset in range(len(straight)):
+                        row, column = grid.get_position(found_by, index, offset)
+                        layout.append(row * column_count + column)
+                    layout.append(cell_count)
+            self.layouts[shape] = numpy.array(layout, dtype=numpy.intp)
+        return self.layouts[shape]
+
+    def build_table(self):
+        """
+        Expands the automaton to a table of the next state for every state and
+        letter number, the letter number 0 is any letter not in the words.
+        Every state copies the row of its failure link, then sets its own
+        transitions.
+        """
+
+        numpy = import_numpy()
+        automaton = self.automaton
+        letters = sorted(set("".join(self.words)))
+        self.letter_numbers = numpy.zeros(256, dtype=numpy.intp)
+        for number, letter in enumerate(letters, 1):
+            if ord(letter) < 256:
+                self.letter_numbers[ord(letter)] = number
+        columns = dict((letter, number) for number, letter in enumerate(letters, 1))
+
+        state_count = len(automaton.goto)
+        self.table = numpy.zeros((state_count, len(letters) + 1), dtype=numpy.int32)
+        for state in automaton.get_order():
+            if state:
+                self.table[state] = self.table[automaton.fail[state]]
+            for letter, next_state in automaton.goto[state].items():
+                self.table[state, columns[letter]] = next_state
+
+        # The word numbers of every state, state N owns the numbers between
+        # the starts N and N + 1
+        numbers = [sorted(set(number for length, number in output)) for output in automaton.outputs]
+        self.accepting = numpy.array([bool(output) for output in numbers], dtype=bool)
+        self.number_starts = numpy.zeros(state_count + 1, dtype=numpy.intp)
+        self.number_starts[1:] = numpy.cumsum([len(output) for output in numbers])
+        self.state_numbers = numpy.array(
+            [number for output in numbers for number in output], dtype=numpy.intp
+        )
+        return self
+
+    def match_shape(self, shape, batch):
+        """
+        Finds the words of grids of the same shape together, every letter of
+        their texts is one table lookup for all the grids.
+
+        :param      shape:  The (rows, columns) of the grids
+        :type       shape:  tuple
+        :param      batch:  The upper case rows of every grid
+        :type       batch:  list
+
+        :returns:   The hits of every grid
+        :rtype:     list
+        """
+
+        numpy = import_numpy()
+        if self.table is None:
+            self.build_table()
+
+        layout = self.get_layout(*shape)
+        grid_count = len(batch)
+        cells = numpy.frombuffer("".join("".join(rows) for rows in batch).encode("ascii"), dtype=numpy.uint8)
+        letters = numpy.zeros((grid_count, shape[0] * shape[1] + 1), dtype=numpy.intp)
+        letters[:, :-1] = self.letter_numbers[cells].reshape(grid_count, -1)
+        letters = numpy.ascontiguousarray(letters.T[layout])
+
+        table = self.table
+        state = numpy.zeros(grid_count, dtype=numpy.int32)
+        states = numpy.empty((len(layout), grid_count), dtype=numpy.int32)
+        for position, column in enumerate(letters):
+            state = table[state, column]
+            states[position] = state
+
+        # Every accepting state reached by a grid, once, expanded to its words
+        positions, grids = numpy.nonzero(self.accepting[states])
+        state_count = len(table)
+        reached = numpy.unique(grids.astype(numpy.int64) * state_count + states[positions, grids])
+        grids = reached // state_count
+        reached = reached % state_count
+        starts = self.number_starts[reached]
+        counts = self.number_starts[reached + 1] - starts
+        offsets = numpy.arange(counts.sum()) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+
+        hits = numpy.zeros((grid_count, len(self.words)), dtype=numpy.uint8)
+        hits[numpy.repeat(grids, counts), self.state_numbers[numpy.repeat(starts, counts) + offsets]] = 1
+        return [bytearray(row) for row in hits]
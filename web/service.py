@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from cache import GridIndexCache, LRUCache
+from WordSearch import WordSearch, WordSearchError
+
+class HttpError(Exception):
+    """
+    This class describes an HTTP error answered to the client.
+    """
+
+    def __init__(self, status, message):
+        """
+        Constructs a new instance.
+
+        :param      status:   The HTTP status
+        :type       status:   number
+        :param      message:  The message
+        :type       message:  string
+        """
+
+        super().__init__(message)
+        self.status = status
+
+class SearchService:
+    """
+    This class describes a long running word search HTTP service.
+
+    `POST /search` takes a JSON body with the grid `rows` and the `words`,
+    optionally `all` to get one result for every occurrence, and answers the
+    coordinates as JSON. Grids stay warm in an index cache across requests and the searches
+    run in an executor to keep the event loop responsive.
+    """
+
+    STATUSES = {
+        200: "OK",
+        400: "Bad Request",
+        404: "Not Found",
+        405: "Method Not Allowed",
+        413: "Payload Too Large",
+        500: "Internal Server Error",
+    }
+
+    def __init__(self, max_grids = 64, memo_entries = 100000, max_body = 64 * 1024 * 1024):
+        """
+        Constructs a new instance.
+
+        :param      max_grids:     The number of grids kept warm
+        :type       max_grids:     number
+        :param      memo_entries:  The number of search results memoized
+        :type       memo_entries:  number
+        :param      max_body:      The maximum request body size in bytes
+        :type       max_body:      number
+        """
+
+        self.index_cache = GridIndexCache(max_entries = max_grids)
+        self.memo = LRUCache(memo_entries)
+        self.max_body = max_body
+        # The caches are shared, so the searches run one at a time
+        self.executor = ThreadPoolExecutor(max_workers = 1)
+
+    def search(self, rows, words, all_matches = False):
+        """
+        Search the words in the grid rows.
+
+        :param      rows:         The grid rows
+        :type       rows:         list
+        :param      words:        The words to search
+        :type       words:        list
+        :param      all_matches:  True to report every occurrence
+        :type       all_matches:  boolean
+
+        :returns:   The 1 based results of every word, or of every occurrence
+        :rtype:     list
+
+        :raises     WordSearchError:  If the rows or words are not valid
+        """
+
+        word_search = WordSearch()
+        word_search.set_quiet(True)
+        word_search.set_index_cache(self.index_cache)
+        word_search.set_memo(self.memo)
+        word_search.set_all_matches(all_matches)
+
+        return [
+            result.to_dict(1) for result in word_search.load_puzzle(rows, words).solve()
+        ]
+
+    async def handle_search(self, body):
+        """
+        Handle a search request body.
+
+        :param      body:  The JSON request body
+        :type       body:  bytes
+
+        :returns:   The response payload
+        :rtype:     dictionary
+
+        :raises     HttpError:  If the body is not a valid puzzle
+        """
+
+        try:
+            payload = json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            raise HttpError(400, "request body must be JSON")
+
+        if not isinstance(payload, dict):
+            raise HttpError(400, "request body must be a JSON object")
+
+        rows = payload.get("rows")
+        words = payload.get("words")
+        if not isinstance(rows, list) or not isinstance(words, list):
+            raise HttpError(400, "rows and words must be lists of strings")
+
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                self.executor, self.search,
+                [str(row) for row in rows], [str(word) for word in words],
+                bool(payload.get("all", False))
+            )
+        except WordSearchError as e:
+            raise HttpError(400, str(e))
+
+        return {"results": results}
+
+    async def handle_client(self, reader, writer):
+        """
+        Answer the requests of a client connection.
+
+        :param      reader:  The reader
+        :type       reader:  StreamReader
+        :param      writer:  The writer
+        :type       writer:  StreamWriter
+        """
+
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                    keep_alive = keep_alive and version == "HTTP/1.1"
+                    length = int(headers.get("content-length", 0))
+                    if length > self.max_body:
+                        keep_alive = False
+                        raise HttpError(413, "request body is too large")
+                    body = await reader.readexactly(length)
+                    status, payload = 200, await self.route(method, path, body)
+                except HttpError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except ValueError:
+                    status, payload, keep_alive = 400, {"error": "malformed request"}, False
+                except Exception as e:
+                    status, payload = 500, {"error": str(e)}
+
+                self.respond(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body):
+        """
+        Route a request.
+
+        :param      method:  The HTTP method
+        :type       method:  string
+        :param      path:    The request path
+        :type       path:    string
+        :param      body:    The request body
+        :type       body:    bytes
+
+        :returns:   The response payload
+        :rtype:     dictionary
+
+        :raises     HttpError:  If the route is unknown
+        """
+
+        path = path.split("?", 1)[0]
+        if path == "/search":
+            if method != "POST":
+                raise HttpError(405, "use POST /search")
+            return await self.handle_search(body)
+        if path == "/health":
+            return {
+                "status": "ok",
+                "grids": len(self.index_cache.memory),
+                "memo_hits": self.memo.hits,
+                "memo_misses": self.memo.misses,
+            }
+        raise HttpError(404, "{} not found".format(path))
+
+    def respond(self, writer, status, payload, keep_alive):
+        """
+        Write a JSON response.
+
+        :param      writer:      The writer
+        :type       writer:      StreamWriter
+        :param      status:      The HTTP status
+        :type       status:      number
+        :param      payload:     The response payload
+        :type       payload:     dictionary
+        :param      keep_alive:  True to keep the connection open
+        :type       keep_alive:  boolean
+        """
+
+        body = json.dumps(payload).encode("utf-8")
+        writer.write((
+            "HTTP/1.1 {} {}\r\n"
+            "Content-Type: application/json\r\n"
+            "Content-Length: {}\r\n"
+            "Connection: {}\r\n\r\n"
+        ).format(
+            status, self.STATUSES.get(status, ""), len(body),
+            "keep-alive" if keep_alive else "close"
+        ).encode("latin-1") + body)
+
+    async def start(self, host = "0.0.0.0", port = 8080):
+        """
+        Starts listening.
+
+        :param      host:  The host
+        :type       host:  string
+        :param      port:  The port, 0 for any free port
+        :type       port:  number
+
+        :returns:   The server
+        :rtype:     Server
+        """
+
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    async def serve(self, host = "0.0.0.0", port = 8080):
+        """
+        Serve until cancelled.
+
+        :param      host:  The host
+        :type       host:  string
+        :param      port:  The port
+        :type       port:  number
+        """
+
+        server = await self.start(host, port)
+        print("Word search service listening on {}:{}".format(host, port))
+        async with server:
+            await server.serve_forever()
+
+if __name__ == "__main__":
+
+    """Run as a service"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Word search HTTP service")
+    parser.add_argument("--host", default="0.0.0.0", help="host to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument("--grids", type=int, default=64, help="number of grids kept warm")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(SearchService(args.grids).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
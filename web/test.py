@@ -2,10 +2,27 @@
 
 # -*- coding: utf-8 -*-
 
+import asyncio
+import csv
+import io
+import json
+import os
 import unittest
 import pprint
-
-from WordSearch import WordSearch, WordSearchError
+import shutil
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+from WordSearch import WordSearch, WordSearchError, run_batch, solve, solve_text
+from cache import GridIndexCache, LRUCache
+from service import SearchService
+from benchmark import PHASES, generate_puzzle, get_default_engines, run_benchmark
+from metrics import NULL_METRICS, Metrics
+from writer import ResultWriter, read_binary
+import puzzle
+from puzzle import CrossWords, LetterFilter, Search, SearchStore, WordMatcher
 
 class ExtendedTestCase(unittest.TestCase):
 
@@ -90,7 +107,7 @@ class TestLogics(ExtendedTestCase):
             lines = f.read()
             pprint.pprint(lines)
             self.assertMultiLineEqual(
-                "DIAMOND (7, 1)(1, 1)\nHEART (7, 5)(5, 3)\n",
+                "DIAMOND (7, 1)(1, 1)\nHEART (5, 7)(5, 3)\n",
                 lines
             )
 
@@ -139,6 +156,1351 @@ class TestLogics(ExtendedTestCase):
                 lines
             )
 
+    def test_valid_with_diagonals(self):
+        """"""
+
+        _file = "diagonals.pzl"
+        self.word_search.set_puzzle_file(_file)
+        self.word_search.run_search()
+
+        with open(self.word_search.get_output_path()) as f:
+            lines = f.read()
+            pprint.pprint(lines)
+            self.assertMultiLineEqual(
+                "SUN (1, 1)(3, 3)\nBIN (5, 1)(3, 3)\n"
+                "MON (1, 5)(3, 3)\nNUS (3, 3)(1, 1)\n",
+                lines
+            )
+
+class TestSolve(ExtendedTestCase):
+
+    """Test solving puzzles in memory"""
+
+    def test_solve(self):
+        """"""
+
+        results = solve("CIRN\nADOG\nTCIS\nKDIE\n", ["cat", "dog", "duck"])
+
+        self.assertMultiLineEqual(
+            "CAT (1, 1)(1, 3)\nDOG (2, 2)(4, 2)\nDUCK not found\n",
+            "".join(result.to_line(1) for result in results)
+        )
+
+    def test_solve_text(self):
+        """"""
+
+        with open("puzzles/suits.pzl") as f:
+            results = list(solve_text(f.read(), {"engine": CrossWords.ENGINE_AUTOMATON}))
+
+        self.assertEqual(["DIAMOND", "HEART"], [result.word for result in results])
+        self.assertEqual(((6, 0), (0, 0), "W"), (results[0].start, results[0].end, results[0].direction))
+
+    def test_solve_invalid(self):
+        """"""
+
+        self.assertRaisesWithMessage(
+            "There are no words to search found in puzzle file", solve, ["CAT", "DOG", "COW"], []
+        )
+
+
+class TestShapes(ExtendedTestCase):
+
+    """Test the rectangular and ragged grids"""
+
+    def test_rectangular(self):
+        """"""
+
+        for engine in CrossWords.ENGINES:
+            results = solve(
+                "CATDOG\nXOXUXX\nXXWXCX\n", ["cat", "cow", "god", "xxw"], {"engine": engine}
+            )
+            self.assertMultiLineEqual(
+                "CAT (1, 1)(3, 1)\nCOW (1, 1)(3, 3)\nGOD (6, 1)(4, 1)\nXXW (1, 3)(3, 3)\n",
+                "".join(result.to_line(1) for result in results)
+            )
+
+    def test_ragged(self):
+        """"""
+
+        rows = ["CAT", "OX", "WXDUCK"]
+        self.assertRaisesWithMessage(
+            "Puzzle file must have equal dimension (X,X)", solve, rows, ["cow"]
+        )
+
+        for engine in CrossWords.ENGINES:
+            results = solve(rows, ["cow", "td", "duck"], {"engine": engine, "allow_ragged": True})
+            self.assertMultiLineEqual(
+                "COW (1, 1)(1, 3)\nTD not found\nDUCK (3, 3)(6, 3)\n",
+                "".join(result.to_line(1) for result in results)
+            )
+
+    def test_ragged_gaps(self):
+        """"""
+
+        grid = puzzle.Grid()
+        for row in ("CAT", "OX", "WXDUCK"):
+            grid.add_row(row)
+
+        self.assertFalse(grid.is_rectangular())
+        self.assertEqual(["COW", "AXX", "T D", "  U", "  C", "  K"], grid.verticals)
+        self.assertEqual(["W", "OX", "CXD", "A U", "T C", "  K", "", ""], grid.diagonals)
+
+        results = solve(
+            grid.rows, ["t?d", "t*d", "d*k"],
+            {"engine": CrossWords.ENGINE_PATTERN, "allow_ragged": True}
+        )
+        self.assertEqual([False, False, True], [result.was_found for result in results])
+
+
+class TestAllMatches(ExtendedTestCase):
+
+    """Test reporting every occurrence of the words"""
+
+    def setUp(self):
+
+       """This runs before the test cases are executed"""
+
+       self.word_search = WordSearch()
+
+    def tearDown(self):
+
+       """This runs after the test cases are executed"""
+
+       self.word_search = None
+
+    def test_iter_matches(self):
+        """"""
+
+        crosswords = CrossWords()
+        for row in ("CATX", "AXAX", "TACX", "XXXX"):
+            crosswords.add_row(row)
+        crosswords.init_puzzle()
+
+        self.assertEqual(
+            [
+                ((0, 0), (2, 0), "E", 0),
+                ((2, 2), (0, 2), "W", 0),
+                ((0, 0), (0, 2), "S", 0),
+                ((2, 2), (2, 0), "N", 0),
+            ],
+            list(crosswords.iter_matches(Search("cat")))
+        )
+        self.assertEqual([], list(crosswords.iter_matches(Search("dog"))))
+
+    def test_output_all_matches(self):
+        """"""
+
+        _file = "repeated.pzl"
+        self.word_search.set_puzzle_file(_file)
+        self.word_search.set_all_matches(True)
+        self.word_search.run_search()
+
+        with open(self.word_search.get_output_path()) as f:
+            lines = f.read()
+            pprint.pprint(lines)
+            self.assertMultiLineEqual(
+                "CAT (1, 1)(3, 1)\nCAT (3, 3)(1, 3)\n"
+                "CAT (1, 1)(1, 3)\nCAT (3, 3)(3, 1)\nDOG not found\n",
+                lines
+            )
+
+
+    def test_all_matches_patterns(self):
+        """"""
+
+        options = {"engine": CrossWords.ENGINE_PATTERN, "all_matches": True}
+        results = solve(["CATX", "AXAX", "TACX", "XXXX"], ["c?t", "c*c", "d*g"], options)
+
+        self.assertMultiLineEqual(
+            "C?T (1, 1)(3, 1)\nC?T (3, 3)(1, 3)\nC?T (1, 1)(1, 3)\nC?T (3, 3)(3, 1)\n"
+            "C*C (1, 1)(3, 3)\nD*G not found\n",
+            "".join(result.to_line(1) for result in results)
+        )
+
+
+class TestEngines(ExtendedTestCase):
+
+    """Test the search engines gives the same results"""
+
+    PUZZLES = (
+        "puzzle1.pzl",
+        "suits.pzl",
+        "puzzle_far_inputs.pzl",
+        "puzzle_has_blank_each_inputs.pzl",
+        "lostDuck.pzl",
+        "diagonals.pzl",
+    )
+
+    def run_engine(self, _file, engine):
+        """
+        Run the word search with an engine
+
+        :param      _file:   The puzzle file
+        :type       _file:   string
+        :param      engine:  The engine
+        :type       engine:  string
+
+        :returns:   The output file content
+        :rtype:     string
+        """
+
+        word_search = WordSearch()
+        word_search.set_puzzle_file(_file)
+        word_search.set_engine(engine)
+        word_search.run_search()
+
+        with open(word_search.get_output_path()) as f:
+            return f.read()
+
+    def test_automaton_matches_scan(self):
+        """"""
+
+        for _file in self.PUZZLES:
+            self.assertMultiLineEqual(
+                self.run_engine(_file, CrossWords.ENGINE_SCAN),
+                self.run_engine(_file, CrossWords.ENGINE_AUTOMATON)
+            )
+
+    def test_pattern_matches_scan(self):
+        """"""
+
+        for _file in self.PUZZLES:
+            self.assertMultiLineEqual(
+                self.run_engine(_file, CrossWords.ENGINE_SCAN),
+                self.run_engine(_file, CrossWords.ENGINE_PATTERN)
+            )
+
+    def test_index_matches_scan(self):
+        """"""
+
+        for _file in self.PUZZLES:
+            self.assertMultiLineEqual(
+                self.run_engine(_file, CrossWords.ENGINE_SCAN),
+                self.run_engine(_file, CrossWords.ENGINE_INDEX)
+            )
+
+    def test_index_lookup(self):
+        """"""
+
+        crosswords = CrossWords()
+        for row in ("CIRN", "ADOG", "TCIS", "KCOW"):
+            crosswords.add_row(row)
+        index = crosswords.build_suffix_index()
+
+        self.assertEqual((Search.BY_ROW, 1, False, 1), index.locate("DOG"))
+        self.assertEqual((Search.BY_ROW, 1, True, 1), index.locate("GOD"))
+        self.assertEqual((Search.BY_COLUMN, 0, False, 0), index.locate("CAT"))
+        self.assertEqual((Search.BY_DIAGONAL, 3, False, 1), index.locate("DIW"))
+        self.assertIsNone(index.locate("DUCK"))
+
+    def test_index_large_grid(self):
+        """"""
+
+        rows = ["CIRN", "ADOG", "TCIS", "KCOW"]
+        crosswords = CrossWords()
+        for row in rows:
+            crosswords.add_row(row)
+        crosswords.add_searches("CAT").add_searches("DOG")
+
+        cells = CrossWords.SUFFIX_INDEX_CELLS
+        CrossWords.SUFFIX_INDEX_CELLS = 15
+        try:
+            crosswords.search(CrossWords.ENGINE_INDEX)
+            found = solve(rows, ["CAT", "DOG", "GOD"], {"engine": CrossWords.ENGINE_INDEX})
+        finally:
+            CrossWords.SUFFIX_INDEX_CELLS = cells
+
+        self.assertIsNone(crosswords.suffix_index)
+        self.assertIsNotNone(crosswords.index)
+        self.assertEqual([True, True], [search.was_found for search in crosswords.get_searches()])
+        self.assertEqual(
+            [result.to_line(1) for result in solve(rows, ["CAT", "DOG", "GOD"])],
+            [result.to_line(1) for result in found]
+        )
+
+    def test_pattern_wildcards(self):
+        """"""
+
+        rows = ["DIAMOND", "XQZXQZX", "DNOMZID", "QXZQXZQ", "ZQXZQXZ", "XZQXZQX", "QZXQZXQ"]
+        options = {"engine": CrossWords.ENGINE_PATTERN}
+
+        self.assertEqual([
+            "D?AM*ND (1, 1)(7, 1)\n",
+            "DI*D (1, 1)(7, 1)\n",
+            "MO?D (4, 1)(7, 1)\n",
+            "D*Q (1, 1)(1, 4)\n",
+        ], [
+            result.to_line(1)
+            for result in solve(rows, ["D?AM*ND", "DI*D", "MO?D", "D*Q"], options)
+        ])
+
+    def test_pattern_mismatches(self):
+        """"""
+
+        rows = ["DIAMOND", "XQZXQZX", "DNOMZID", "QXZQXZQ", "ZQXZQXZ", "XZQXZQX", "QZXQZXQ"]
+        options = {"engine": CrossWords.ENGINE_PATTERN, "max_mismatches": 1}
+        results = list(solve(rows, ["DIAMAND", "DEAMAND", "ZIQ"], options))
+
+        self.assertEqual("DIAMAND (1, 1)(7, 1) 1 mismatches\n", results[0].to_line(1))
+        self.assertEqual(1, results[0].to_dict(1)["mismatches"])
+        self.assertFalse(results[1].was_found)
+        self.assertEqual("ZIQ (3, 2)(5, 2) 1 mismatches\n", results[2].to_line(1))
+        self.assertRaisesWithMessage(
+            "D?AM*ND is not a valid alphabet", lambda: list(solve(rows, ["D?AM*ND"]))
+        )
+        for pattern in ("*", "**", "D**ND", "*?**"):
+            self.assertRaisesWithMessage(
+                "{} is not a valid alphabet".format(pattern),
+                lambda: list(solve(rows, [pattern], options))
+            )
+
+    def test_parallel_matches_serial(self):
+        """"""
+
+        for _file in self.PUZZLES:
+            serial = self.run_engine(_file, CrossWords.ENGINE_SCAN)
+
+            word_search = WordSearch()
+            word_search.set_puzzle_file(_file)
+            word_search.set_workers(2)
+            word_search.run_search()
+
+            with open(word_search.get_output_path()) as f:
+                self.assertMultiLineEqual(serial, f.read())
+
+    def test_invalid_engine(self):
+        """"""
+
+        word_search = WordSearch()
+        self.assertRaisesWithMessage(
+            "FOO is not a valid search engine", word_search.set_engine, "foo"
+        )
+
+
+class TestLazyGrid(ExtendedTestCase):
+
+    """Test the straights generated on first access"""
+
+    BACKENDS = [CrossWords.BACKEND_PYTHON] + (
+        [CrossWords.BACKEND_NUMPY] if puzzle.has_numpy() else []
+    )
+
+    def test_rows_only(self):
+        """"""
+
+        # The index engine indexes every straight before searching
+        engines = [engine for engine in CrossWords.ENGINES if engine != CrossWords.ENGINE_INDEX]
+        for engine in engines:
+            for backend in TestLazyGrid.BACKENDS:
+                word_search = WordSearch().set_quiet(True).set_engine(engine).set_backend(backend)
+                results = list(word_search.load_puzzle(
+                    ["CIRN", "ADOG", "TCIS", "KCOW"], ["DOG", "COW", "RIC"]
+                ).solve())
+
+                grid = word_search.crosswords.grid
+                self.assertTrue(all(result.was_found for result in results))
+                self.assertFalse(grid.is_generated("verticals"))
+                self.assertFalse(grid.is_generated("diagonals"))
+
+    def test_generate_on_access(self):
+        """"""
+
+        grid = puzzle.Grid()
+        for row in ("CIRN", "ADOG", "TCIS", "KCOW"):
+            grid.add_row(row)
+
+        self.assertFalse(grid.is_generated("anti_diagonals"))
+        self.assertEqual((0, 3), grid.anti_diagonal_origins[3])
+        self.assertEqual("NOCK", grid.anti_diagonals[3])
+        self.assertEqual("CATK", grid.verticals[0])
+
+        grid.add_row("ABCD")
+        self.assertFalse(grid.is_generated("verticals"))
+        self.assertEqual("CATKA", grid.verticals[0])
+
+
+class TestSearchStore(ExtendedTestCase):
+
+    """Test the searches kept in a columnar store"""
+
+    def test_slots(self):
+        """"""
+
+        search = Search("cat")
+
+        self.assertFalse(hasattr(search, "__dict__"))
+        self.assertIsNone(search.coordinates)
+
+    def test_store_round_trip(self):
+        """"""
+
+        crosswords = CrossWords()
+        for row in ("CIRN", "ADOG", "TCIS", "KCOW"):
+            crosswords.add_row(row)
+        crosswords.init_puzzle()
+        for word in ("CAT", "GOD", "SIC", "FOX"):
+            crosswords.add_searches(word)
+        crosswords.search()
+
+        store = SearchStore()
+        for search in crosswords.get_searches():
+            store.append(search)
+
+        self.assertEqual(4, len(store))
+        for search, stored in zip(crosswords.get_searches(), store):
+            self.assertEqual(search.word, stored.word)
+            self.assertEqual(search.get_result(), stored.get_result())
+            self.assertEqual(search.coordinates, stored.coordinates)
+        self.assertEqual("FOX", store[-1].word)
+
+    def test_compact_matches_objects(self):
+        """"""
+
+        for puzzle_file in TestEngines.PUZZLES:
+            for engine in CrossWords.ENGINES:
+                expected = WordSearch().set_engine(engine).set_puzzle_file(puzzle_file)
+                expected.read_puzzle_file().build_puzzle().build_searches().begin_search()
+
+                compact = WordSearch().set_compact(True).set_engine(engine)
+                compact.set_puzzle_file(puzzle_file)
+                compact.read_puzzle_file().build_puzzle().build_searches().begin_search()
+
+                self.assertIsInstance(compact.crosswords.get_searches(), SearchStore)
+                self.assertEqual(
+                    [result.to_line(1) for result in expected.iter_results()],
+                    [result.to_line(1) for result in compact.iter_results()]
+                )
+
+    def test_first_positions(self):
+        """"""
+
+        store = SearchStore()
+        words = ["CAT", "DOG", "CAT", "COW", "DOG", "CAT"]
+        for word in words:
+            store.append(Search(word))
+
+        first_positions = puzzle.FirstPositions(len(store), store.get_word)
+        self.assertEqual(
+            [0, 1, 0, 3, 1, 0],
+            [first_positions.setdefault(word, position) for position, word in enumerate(words)]
+        )
+        self.assertEqual(16, len(first_positions.positions))
+
+
+class TestNumpyGrid(ExtendedTestCase):
+
+    """Test the NumPy grid backend builds the same straights"""
+
+    ROWS = ("DNOMAID", "PQINEEG", "XXWQTDK", "CDKBRAF", "UWERAFX", "TDAFESJ", "AKJSHHE")
+
+    def build_grid(self, grid):
+        """
+        Build all the straights of a grid
+
+        :param      grid:  The grid
+        :type       grid:  Grid
+
+        :returns:   The grid
+        :rtype:     Grid
+        """
+
+        for row in self.ROWS:
+            grid.add_row(row)
+        grid.generate_horizontals()
+        grid.generate_cells()
+        grid.generate_verticals()
+        grid.generate_diagonals()
+        return grid
+
+    @unittest.skipIf(not puzzle.has_numpy(), "numpy is not installed")
+    def test_same_straights(self):
+        """"""
+
+        grid = self.build_grid(puzzle.Grid())
+        numpy_grid = self.build_grid(puzzle.NumpyGrid())
+
+        self.assertIsNotNone(numpy_grid.array)
+        self.assertEqual(grid.verticals, numpy_grid.verticals)
+        self.assertEqual(grid.diagonals, numpy_grid.diagonals)
+        self.assertEqual(grid.anti_diagonals, numpy_grid.anti_diagonals)
+        self.assertEqual(grid.diagonal_origins, numpy_grid.diagonal_origins)
+        self.assertEqual(grid.anti_diagonal_origins, numpy_grid.anti_diagonal_origins)
+
+    @unittest.skipIf(not puzzle.has_numpy(), "numpy is not installed")
+    def test_uneven_falls_back(self):
+        """"""
+
+        grid = puzzle.NumpyGrid()
+        for row in ("CIRN", "ADOG", "TCI", "KCOW"):
+            grid.add_row(row)
+        grid.generate_cells()
+        grid.generate_verticals()
+
+        self.assertIsNone(grid.array)
+        self.assertEqual(["CATK", "IDCC", "ROIO", "NG W"], grid.verticals)
+
+
+class TestFilter(ExtendedTestCase):
+
+    """Test the words pruned before searching"""
+
+    ROWS = ["CIRN", "ADOG", "TCIS", "KCOW"]
+
+    def test_rejects(self):
+        """"""
+
+        grid = puzzle.Grid()
+        for row in self.ROWS:
+            grid.add_row(row)
+        letter_filter = LetterFilter(grid)
+
+        self.assertFalse(letter_filter.rejects("DOG"))
+        self.assertFalse(letter_filter.rejects("GOD"))
+        self.assertFalse(letter_filter.rejects("CDIW"))
+        self.assertTrue(letter_filter.rejects("CATKC"))
+        self.assertTrue(letter_filter.rejects("DUCK"))
+        self.assertTrue(letter_filter.rejects("CWN"))
+
+    def test_pruned_not_searched(self):
+        """"""
+
+        words = ["CAT", "DUCK", "DOG", "SNOW", "DUCK"]
+        for engine in CrossWords.ENGINES:
+            word_search = WordSearch().set_quiet(True).set_engine(engine)
+            word_search.configure({"metrics": "log"})
+            word_search.metrics.export = lambda: None
+            results = list(word_search.load_puzzle(self.ROWS, words).solve())
+
+            self.assertEqual([True, False, True, False, False], [result.was_found for result in results])
+            if engine == CrossWords.ENGINE_PATTERN:
+                self.assertEqual(0, word_search.metrics.counters["searches_pruned"])
+            else:
+                self.assertEqual({"DUCK", "SNOW"}, word_search.crosswords.pruned)
+                self.assertEqual(3, word_search.metrics.counters["searches_pruned"])
+
+    def test_filter_kept_with_grid(self):
+        """"""
+
+        index_cache = GridIndexCache()
+        letter_filters = []
+        for words in (["CAT", "DUCK"], ["DOG", "SNOW"]):
+            word_search = WordSearch().set_quiet(True).set_index_cache(index_cache)
+            list(word_search.load_puzzle(self.ROWS, words).solve())
+            letter_filters.append(word_search.crosswords.grid.letter_filter)
+        grid = word_search.crosswords.grid
+
+        self.assertIsNotNone(letter_filters[0])
+        self.assertIs(letter_filters[0], letter_filters[1])
+
+        crosswords = word_search.crosswords
+        crosswords.add_searches("DUG")
+        crosswords.set_cell(1, 2, "U")
+
+        self.assertIsNone(crosswords.grid.letter_filter)
+        self.assertFalse(crosswords.grid.get_letter_filter().rejects("DUG"))
+        self.assertIs(letter_filters[0], grid.letter_filter)
+
+
+class TestMultiGrid(ExtendedTestCase):
+
+    """Test one word list matched against many grids"""
+
+    WORDS = ["CAT", "DOG", "cow", "SNOW", "KITE", "DIW", "DOG"]
+
+    GRIDS = (
+        ["CIRN", "ADOG", "TCIS", "KCOW"],
+        ["WOCD", "SNOW", "TACO", "GODZ"],
+        ["KITEX", "AAAAA", "CATCA"],
+        "EKIT\nWOC\nGO\nDZ",
+        ["CIRN", "ADOG", "TCI", "KCOW"],
+        ["XQZ"],
+    )
+
+    def backends(self):
+        """
+        Gets the backends installed
+
+        :returns:   The backends
+        :rtype:     list
+        """
+
+        return [
+            backend for backend in CrossWords.BACKENDS
+            if backend != CrossWords.BACKEND_NUMPY or puzzle.has_numpy()
+        ]
+
+    def test_hits_match_solve(self):
+        """"""
+
+        expected = [
+            bytearray(result.was_found for result in solve(grid, self.WORDS, {"allow_ragged": True}))
+            for grid in self.GRIDS
+        ]
+        for backend in self.backends():
+            matcher = WordMatcher(self.WORDS, backend)
+            self.assertEqual(expected, matcher.hit_matrix(self.GRIDS))
+            self.assertEqual(expected, list(matcher.iter_hits(self.GRIDS, batch_size=2)))
+
+    def test_find_words(self):
+        """"""
+
+        grid = puzzle.Grid()
+        for row in self.GRIDS[0]:
+            grid.add_row(row)
+
+        matcher = WordMatcher(self.WORDS)
+        self.assertEqual(bytearray([1, 1, 1, 0, 0, 1, 1]), matcher.find_words(grid))
+        self.assertEqual(bytearray(7), matcher.find_words([]))
+
+    def test_invalid_word(self):
+        """"""
+
+        with self.assertRaises(ValueError) as context:
+            WordMatcher(["DOG", "c?t"])
+        self.assertEqual("C?T is not a valid word", str(context.exception))
+
+
+class TestIncremental(ExtendedTestCase):
+
+    """Test the cells changed after the puzzle is built"""
+
+    ROWS = ["CIRN", "ADOG", "TCIS", "KCOW"]
+    WORDS = ["CAT", "DOG", "COW", "SNOW", "ROW"]
+
+    def solve_lines(self, rows, words):
+        return [result.to_line(1) for result in solve(rows, words)]
+
+    def test_set_cell(self):
+        """"""
+
+        word_search = WordSearch().set_quiet(True).load_puzzle(self.ROWS, self.WORDS)
+        list(word_search.solve())
+
+        rows = ["CIRN", "ADOG", "TCIW", "KCOW"]
+        positions = word_search.set_cell(2, 3, "w")
+
+        self.assertEqual(
+            self.solve_lines(rows, self.WORDS),
+            [result.to_line(1) for result in word_search.iter_results()]
+        )
+        self.assertEqual([2, 3, 4], positions)
+        self.assertEqual(["CATK", "IDCC", "ROIO", "NGWW"], word_search.crosswords.grid.verticals)
+
+    def test_set_cell_patterns(self):
+        """"""
+
+        options = {"engine": CrossWords.ENGINE_PATTERN, "max_mismatches": 1}
+        words = ["C?T", "D*G", "CURE", "ROWS"]
+        word_search = WordSearch().set_quiet(True)
+        word_search.configure(options)
+        list(word_search.load_puzzle(self.ROWS, words).solve())
+        word_search.set_cell(0, 1, "U")
+
+        self.assertEqual(
+            [result.to_line(1) for result in solve(["CURN", "ADOG", "TCIS", "KCOW"], words, options)],
+            [result.to_line(1) for result in word_search.iter_results()]
+        )
+        self.assertEqual(
+            "CURE (1, 1)(4, 1) 1 mismatches\n", list(word_search.iter_results())[2].to_line(1)
+        )
+
+    def test_set_cell_shared_index(self):
+        """"""
+
+        index_cache = GridIndexCache()
+        word_search = WordSearch().set_quiet(True).set_index_cache(index_cache)
+        list(word_search.load_puzzle(self.ROWS, self.WORDS).solve())
+        cached = index_cache.get(word_search.crosswords.grid.fingerprint())
+        word_search.set_cell(0, 3, "S")
+
+        self.assertEqual(
+            self.solve_lines(["CIRS", "ADOG", "TCIS", "KCOW"], self.WORDS),
+            [result.to_line(1) for result in word_search.iter_results()]
+        )
+        self.assertEqual("CIRN", cached.grid.rows[0])
+        self.assertEqual([(Search.BY_COLUMN, 3)], cached.candidate_lines("NGS"))
+
+    def test_set_cell_errors(self):
+        """"""
+
+        word_search = WordSearch().set_quiet(True).load_puzzle(self.ROWS, self.WORDS)
+        list(word_search.solve())
+
+        self.assertRaisesWithMessage("@ is not a valid letter", word_search.set_cell, 0, 0, "@")
+        self.assertRaisesWithMessage(
+            "(4, 0) is not a cell of the grid", word_search.set_cell, 4, 0, "A"
+        )
+
+
+class TestOutputFormats(ExtendedTestCase):
+
+    """Test the formats of the output file"""
+
+    def setUp(self):
+
+       """This runs before the test cases are executed"""
+
+       self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+
+       """This runs after the test cases are executed"""
+
+       shutil.rmtree(self.directory)
+
+    def run_format(self, puzzle_file, output_format, stream = False):
+        word_search = WordSearch().set_output_format(output_format)
+        word_search.outputs_directory = self.directory
+        word_search.set_puzzle_file(puzzle_file)
+        if stream:
+            word_search.run_stream_search()
+        else:
+            word_search.run_search()
+        return word_search.get_output_path()
+
+    def test_text(self):
+        """"""
+
+        for stream in (False, True):
+            for puzzle_file in TestEngines.PUZZLES:
+                path = self.run_format(puzzle_file, ResultWriter.FORMAT_TEXT, stream)
+                with open(path) as f, open("outputs/" + os.path.basename(path)) as expected:
+                    self.assertMultiLineEqual(expected.read(), f.read())
+
+    def test_machine_formats(self):
+        """"""
+
+        for stream in (False, True):
+            expected = [result.to_dict(1) for result in solve_text(
+                open("puzzles/puzzle1.pzl").read()
+            )]
+
+            with open(self.run_format("puzzle1.pzl", "ndjson", stream)) as f:
+                self.assertEqual(expected, [json.loads(line) for line in f])
+
+            with open(self.run_format("puzzle1.pzl", "csv", stream), newline = "") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual([result["word"] for result in expected], [row["word"] for row in rows])
+            self.assertEqual(
+                [result.get("direction", "") for result in expected],
+                [row["direction"] for row in rows]
+            )
+
+            records = list(read_binary(self.run_format("puzzle1.pzl", "binary", stream)))
+            self.assertEqual(list(range(0, len(expected))), [record[0] for record in records])
+            for result, record in zip(expected, records):
+                self.assertEqual(result["found"], record[1])
+                if result["found"]:
+                    self.assertEqual(result["direction"], record[2])
+                    self.assertEqual(tuple(result["start"]), record[4])
+                    self.assertEqual(tuple(result["end"]), record[5])
+
+    def test_invalid_format(self):
+        """"""
+
+        self.assertRaisesWithMessage(
+            "XML is not a valid output format", WordSearch().set_output_format, "xml"
+        )
+
+
+class TestStream(ExtendedTestCase):
+
+    """Test searching the words while reading the puzzle file"""
+
+    def test_stream_matches_run_search(self):
+        """"""
+
+        for _file in TestEngines.PUZZLES:
+            word_search = WordSearch()
+            word_search.set_puzzle_file(_file)
+            word_search.run_search()
+            with open(word_search.get_output_path()) as f:
+                expected = f.read()
+
+            word_search = WordSearch()
+            word_search.set_puzzle_file(_file)
+            word_search.run_stream_search()
+            with open(word_search.get_output_path()) as f:
+                self.assertMultiLineEqual(expected, f.read())
+
+    def test_stream_patterns(self):
+        """"""
+
+        with open("puzzles/suits.pzl") as f:
+            grid = f.read().split("\n\n")[0]
+
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "patterns.pzl"), "w") as f:
+                f.write(grid + "\n\nD?AM*ND\nDIAMAND\nHEART\n")
+
+            outputs = []
+            for stream in (False, True):
+                word_search = WordSearch().set_quiet(True)
+                word_search.set_engine(CrossWords.ENGINE_PATTERN).set_max_mismatches(1)
+                word_search.input_directory = word_search.outputs_directory = directory
+                word_search.set_puzzle_file("patterns.pzl")
+                if stream:
+                    word_search.run_stream_search()
+                else:
+                    word_search.run_search()
+                with open(word_search.get_output_path()) as f:
+                    outputs.append(f.read())
+
+        self.assertIn("DIAMAND (7, 1)(1, 1) 1 mismatches\n", outputs[0])
+        self.assertMultiLineEqual(outputs[0], outputs[1])
+
+    def test_stream_invalid_crosswords(self):
+        """"""
+
+        word_search = WordSearch()
+        word_search.set_puzzle_file("puzzle_w_invalid_crosswords.pzl")
+        self.assertRaisesWithMessage(
+            "CI@N is not a valid alphabet", word_search.run_stream_search
+        )
+
+
+class TestWordStream(ExtendedTestCase):
+
+    """Test searching the words read from a stream in the puzzle grid"""
+
+    def test_word_stream_matches_run_search(self):
+        """"""
+
+        for _file in TestEngines.PUZZLES:
+            word_search = WordSearch()
+            word_search.set_puzzle_file(_file)
+            word_search.run_search()
+            with open(word_search.get_output_path()) as f:
+                expected = f.read()
+
+            words = [search.word for search in word_search.crosswords.get_searches()]
+            output = io.BytesIO()
+            word_search = WordSearch().set_engine(CrossWords.ENGINE_INDEX)
+            word_search.set_puzzle_file(_file)
+            word_search.run_word_stream(io.StringIO("\n".join(words) + "\n"), output)
+            self.assertMultiLineEqual(expected, output.getvalue().decode("utf-8"))
+            self.assertEqual([], word_search.crosswords.get_searches())
+
+    def test_result_before_next_word(self):
+        """"""
+
+        output = io.BytesIO()
+
+        def words():
+            yield "cat\n"
+            self.assertEqual(b"CAT (1, 1)(1, 3)\n", output.getvalue())
+            yield "\n"
+            yield "duck\n"
+            self.assertEqual(b"CAT (1, 1)(1, 3)\nDUCK not found\n", output.getvalue())
+
+        word_search = WordSearch().set_puzzle_file("puzzle1.pzl")
+        word_search.run_word_stream(words(), output)
+
+    def test_word_stream_patterns(self):
+        """"""
+
+        output = io.BytesIO()
+        word_search = WordSearch().set_quiet(True).set_puzzle_file("suits.pzl")
+        word_search.set_engine(CrossWords.ENGINE_PATTERN).set_max_mismatches(1)
+        word_search.run_word_stream(["d?am*nd", "diamand", "heart"], output)
+        self.assertMultiLineEqual(
+            "D?AM*ND (7, 1)(1, 1)\nDIAMAND (7, 1)(1, 1) 1 mismatches\nHEART (5, 7)(5, 3)\n",
+            output.getvalue().decode("utf-8")
+        )
+
+    def test_word_stream_invalid_word(self):
+        """"""
+
+        word_search = WordSearch().set_puzzle_file("puzzle1.pzl")
+        self.assertRaisesWithMessage(
+            "C@T is not a valid alphabet", word_search.run_word_stream, ["C@T"], io.BytesIO()
+        )
+
+
+class TestCompiled(ExtendedTestCase):
+
+    """Test searching compiled puzzle files"""
+
+    def setUp(self):
+
+       """This runs before the test cases are executed"""
+
+       self.directory = tempfile.TemporaryDirectory()
+       shutil.copy("puzzles/suits.pzl", self.directory.name)
+
+    def tearDown(self):
+
+       """This runs after the test cases are executed"""
+
+       self.directory.cleanup()
+
+    def create_word_search(self, _file):
+        """
+        Creates a word search reading and writing in the temporary directory
+
+        :param      _file:  The puzzle file
+        :type       _file:  string
+
+        :returns:   The word search
+        :rtype:     WordSearch
+        """
+
+        word_search = WordSearch()
+        word_search.input_directory = self.directory.name
+        word_search.outputs_directory = self.directory.name
+        word_search.set_puzzle_file(_file)
+        return word_search
+
+    def test_compiled_search(self):
+        """"""
+
+        for diagonals in (True, False):
+            self.create_word_search("suits.pzl").compile_puzzle_file(diagonals)
+
+            word_search = self.create_word_search("suits.pzc")
+            word_search.run_search()
+
+            self.assertTrue(word_search.crosswords.grid.buffer.closed)
+            with open(word_search.get_output_path()) as f:
+                self.assertMultiLineEqual(
+                    "DIAMOND (7, 1)(1, 1)\nHEART (5, 7)(5, 3)\n",
+                    f.read()
+                )
+
+    def test_compiled_search_cached(self):
+        """"""
+
+        self.create_word_search("suits.pzl").compile_puzzle_file()
+
+        index_cache = GridIndexCache()
+        grids = []
+        for attempt in range(0, 2):
+            word_search = self.create_word_search("suits.pzc")
+            word_search.set_index_cache(index_cache)
+            word_search.run_search()
+            grids.append(word_search.crosswords.grid)
+
+            with open(word_search.get_output_path()) as f:
+                self.assertMultiLineEqual(
+                    "DIAMOND (7, 1)(1, 1)\nHEART (5, 7)(5, 3)\n",
+                    f.read()
+                )
+
+        self.assertIs(grids[0], grids[1])
+        self.assertFalse(grids[0].buffer.closed)
+        grids[0].close()
+
+    def test_invalid_compiled_file(self):
+        """"""
+
+        with open(os.path.join(self.directory.name, "suits.pzc"), "w") as f:
+            f.write("DNOMAID")
+
+        word_search = self.create_word_search("suits.pzc")
+        self.assertRaisesWithMessage(
+            "{}/suits.pzc is not a compiled puzzle".format(self.directory.name),
+            word_search.run_search
+        )
+
+
+class TestCache(ExtendedTestCase):
+
+    """Test the grid index cache and the search results memo"""
+
+    def test_cached_grid_skips_init(self):
+        """"""
+
+        index_cache = GridIndexCache()
+        grids = []
+        for _file in ("puzzle1.pzl", "lostDuck.pzl", "puzzle1.pzl"):
+            word_search = WordSearch()
+            word_search.set_index_cache(index_cache)
+            word_search.set_puzzle_file(_file)
+            word_search.run_search()
+            grids.append(word_search.crosswords.grid)
+
+        self.assertIs(grids[0], grids[2])
+        self.assertIsNot(grids[0], grids[1])
+        self.assertEqual((1, 2), (index_cache.hits, index_cache.misses))
+
+        with open(word_search.get_output_path()) as f:
+            self.assertMultiLineEqual(
+                "CAT (1, 1)(1, 3)\nDOG (2, 2)(4, 2)\nCOW (2, 4)(4, 4)\n",
+                f.read()
+            )
+
+    def test_disk_cache(self):
+        """"""
+
+        with tempfile.TemporaryDirectory() as directory:
+            for index_cache in (GridIndexCache(directory), GridIndexCache(directory)):
+                word_search = WordSearch()
+                word_search.set_index_cache(index_cache)
+                word_search.set_puzzle_file("suits.pzl")
+                word_search.run_search()
+
+            self.assertEqual(1, index_cache.hits)
+            with open(word_search.get_output_path()) as f:
+                self.assertMultiLineEqual(
+                    "DIAMOND (7, 1)(1, 1)\nHEART (5, 7)(5, 3)\n",
+                    f.read()
+                )
+
+    def test_disk_cache_suffix_index(self):
+        """"""
+
+        with tempfile.TemporaryDirectory() as directory:
+            for index_cache in (GridIndexCache(directory), GridIndexCache(directory)):
+                word_search = WordSearch().set_engine(CrossWords.ENGINE_INDEX)
+                word_search.set_index_cache(index_cache)
+                word_search.set_puzzle_file("suits.pzl")
+                word_search.run_search()
+
+            self.assertEqual(2, index_cache.hits)
+            self.assertIsNotNone(word_search.crosswords.suffix_index)
+            with open(word_search.get_output_path()) as f:
+                self.assertMultiLineEqual(
+                    "DIAMOND (7, 1)(1, 1)\nHEART (5, 7)(5, 3)\n",
+                    f.read()
+                )
+
+    def test_disk_cache_large_grid(self):
+        """"""
+
+        cells = CrossWords.SUFFIX_INDEX_CELLS
+        CrossWords.SUFFIX_INDEX_CELLS = 15
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                index_cache = GridIndexCache(directory)
+                word_search = WordSearch().set_engine(CrossWords.ENGINE_INDEX)
+                word_search.set_index_cache(index_cache)
+                word_search.set_puzzle_file("suits.pzl")
+                word_search.run_search()
+        finally:
+            CrossWords.SUFFIX_INDEX_CELLS = cells
+
+        self.assertIsNone(word_search.crosswords.suffix_index)
+        self.assertIsNotNone(word_search.crosswords.index)
+        self.assertEqual(1, len(index_cache.memory))
+        with open(word_search.get_output_path()) as f:
+            self.assertMultiLineEqual(
+                "DIAMOND (7, 1)(1, 1)\nHEART (5, 7)(5, 3)\n",
+                f.read()
+            )
+
+    def test_memo_and_duplicates(self):
+        """"""
+
+        memo = LRUCache(16)
+        for attempt in range(0, 2):
+            crosswords = CrossWords()
+            crosswords.memo = memo
+            for row in ("CIRN", "ADOG", "TCIS", "KCOW"):
+                crosswords.add_row(row)
+            crosswords.init_puzzle()
+            for word in ("CAT", "cat", "DUCK", "CAT"):
+                crosswords.add_searches(word)
+            crosswords.search()
+
+            self.assertEqual(
+                ["(1, 1)(1, 3)", "(1, 1)(1, 3)", None, "(1, 1)(1, 3)"],
+                [
+                    search.print_coordinates(1) if search.was_found else None
+                    for search in crosswords.get_searches()
+                ]
+            )
+
+        self.assertEqual((2, 2), (memo.hits, memo.misses))
+
+    def test_memo_engines(self):
+        """"""
+
+        rows = ["CIRN", "ADOG", "TCIS", "KCOW"]
+        words = ["CAT", "DUCK", "DOG", "CAT"]
+        # The pattern engine prunes no search
+        for engine, workers, counts in (
+                (CrossWords.ENGINE_AUTOMATON, 1, (3, 2)),
+                (CrossWords.ENGINE_PATTERN, 1, (4, 3)),
+                (CrossWords.ENGINE_SCAN, 2, (3, 2))):
+            memo = LRUCache(16)
+            lines = []
+            for attempt in range(0, 2):
+                word_search = WordSearch().set_quiet(True).set_engine(engine)
+                word_search.set_workers(workers).set_memo(memo)
+                lines.append([
+                    result.to_line(1) for result in word_search.load_puzzle(rows, words).solve()
+                ])
+
+            self.assertEqual(lines[0], lines[1])
+            self.assertIn("CAT (1, 1)(1, 3)\n", lines[1])
+            self.assertEqual(0, word_search.crosswords.lines_scanned)
+            self.assertEqual(counts, (memo.hits, memo.misses))
+
+    def test_lru_expiry(self):
+        """"""
+
+        cache = LRUCache(2, 0)
+        cache.set("a", 1)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(0, len(cache))
+
+    def test_lru_eviction(self):
+        """"""
+
+        cache = LRUCache(2)
+        cache.set("a", 1).set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(["a", "c"], list(cache.entries))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+
+class TestService(ExtendedTestCase):
+
+    """Test the word search HTTP service"""
+
+    def request(self, raw):
+        """
+        Send a raw HTTP request to a running service
+
+        :param      raw:  The raw request
+        :type       raw:  bytes
+
+        :returns:   The raw response
+        :rtype:     bytes
+        """
+
+        async def exchange():
+            server = await SearchService().start("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(raw)
+            response = await reader.read()
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return response
+
+        return asyncio.run(exchange())
+
+    def test_search(self):
+        """"""
+
+        body = json.dumps({
+            "rows": ["CIRN", "ADOG", "TCIS", "KDIE"], "words": ["cat", "duck"]
+        }).encode("utf-8")
+        response = self.request(
+            b"POST /search HTTP/1.1\r\nConnection: close\r\n"
+            b"Content-Length: " + str(len(body)).encode("ascii") + b"\r\n\r\n" + body
+        )
+        head, _, payload = response.partition(b"\r\n\r\n")
+
+        self.assertTrue(head.startswith(b"HTTP/1.1 200 OK"))
+        self.assertEqual(
+            {"results": [
+                {"word": "CAT", "found": True, "start": [1, 1], "end": [1, 3], "direction": "S"},
+                {"word": "DUCK", "found": False},
+            ]},
+            json.loads(payload.decode("utf-8"))
+        )
+
+    def test_invalid_search(self):
+        """"""
+
+        body = b'{"rows": ["CI@N"], "words": ["cat"]}'
+        response = self.request(
+            b"POST /search HTTP/1.1\r\nConnection: close\r\n"
+            b"Content-Length: " + str(len(body)).encode("ascii") + b"\r\n\r\n" + body
+        )
+        head, _, payload = response.partition(b"\r\n\r\n")
+
+        self.assertTrue(head.startswith(b"HTTP/1.1 400 Bad Request"))
+        self.assertEqual(
+            {"error": "CI@N is not a valid alphabet"}, json.loads(payload.decode("utf-8"))
+        )
+
+
+class TestBatch(ExtendedTestCase):
+
+    """Test solving a directory of puzzle files"""
+
+    def test_run_batch(self):
+        """"""
+
+        with tempfile.TemporaryDirectory() as outputs_directory:
+            results = run_batch("puzzles", 2, outputs_directory)
+            errors = dict((result[0], result[2]) for result in results)
+
+            self.assertEqual(
+                sorted(name for name in os.listdir("puzzles") if name.endswith(".pzl")),
+                [result[0] for result in results]
+            )
+            self.assertIsNone(errors["puzzle1.pzl"])
+            self.assertEqual("A should be more than 2 characters", errors["puzzle_w_one_letter.pzl"])
+
+            with open(os.path.join(outputs_directory, "suits.out")) as f:
+                self.assertMultiLineEqual(
+                    "DIAMOND (7, 1)(1, 1)\nHEART (5, 7)(5, 3)\n",
+                    f.read()
+                )
+
+
+class TestBenchmark(ExtendedTestCase):
+
+    """Test the benchmark puzzle generator and report"""
+
+    def test_generate_puzzle(self):
+        """"""
+
+        rows, words = generate_puzzle(12, 20, planted_ratio = 1, seed = 7)
+
+        self.assertEqual((rows, words), generate_puzzle(12, 20, planted_ratio = 1, seed = 7))
+        self.assertEqual([12] * 12, [len(row) for row in rows])
+        self.assertEqual(20, len(words))
+        self.assertTrue(any(result.was_found for result in solve(rows, words)))
+
+    def test_run_benchmark(self):
+        """"""
+
+        report = run_benchmark([8], [10], seed = 1)
+
+        self.assertEqual(len(CrossWords.ENGINES), len(report["results"]))
+        for result in report["results"]:
+            self.assertEqual(sorted(PHASES), sorted(result["phases"]))
+        self.assertEqual(1, len(set(result["found"] for result in report["results"])))
+
+    def test_default_engines(self):
+        """"""
+
+        self.assertEqual(list(CrossWords.ENGINES), get_default_engines(100))
+        self.assertNotIn(CrossWords.ENGINE_INDEX, get_default_engines(1000))
+
+
+class TestMetrics(ExtendedTestCase):
+
+    """Test the stages and searches metrics"""
+
+    def test_disabled_by_default(self):
+        """"""
+
+        word_search = WordSearch()
+
+        self.assertIs(NULL_METRICS, word_search.metrics)
+        self.assertIs(NULL_METRICS, word_search.crosswords.metrics)
+
+    def test_run_search_metrics(self):
+        """"""
+
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "metrics.prom")
+            word_search = WordSearch()
+            word_search.outputs_directory = directory
+            word_search.configure({"metrics": path, "memo_entries": 10})
+            word_search.set_puzzle_file("suits.pzl").run_search()
+
+            metrics = word_search.metrics
+            # The diagonals are never reached, both words are found before
+            self.assertEqual(sorted(PHASES + ("generate_verticals",)), sorted(metrics.stages))
+            self.assertEqual(2, metrics.counters["searches"])
+            self.assertEqual(2, metrics.counters["words_found"])
+            self.assertEqual(2, metrics.observations["lines_scanned_per_search"][0])
+            self.assertEqual(
+                metrics.counters["lines_scanned"],
+                metrics.observations["lines_scanned_per_search"][1]
+            )
+            self.assertEqual(2, metrics.gauges["memo_misses"])
+
+            with open(path) as reader:
+                text = reader.read()
+            self.assertIn('wordsearch_stage_seconds_total{stage="build_puzzle"}', text)
+            self.assertIn("wordsearch_searches_total 2\n", text)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_log_line(self):
+        """"""
+
+        metrics = Metrics("log", track_allocations = True)
+        with metrics.stage("parse"):
+            _ = [letter for letter in "ABCDEFGH" * 100]
+        metrics.count("searches", 3).observe("lines", 4).observe("lines", 2)
+
+        line = metrics.to_log_line()
+        self.assertTrue(line.startswith("wordsearch metrics parse="))
+        self.assertIn("lines.count=2 lines.sum=6 lines.max=4", line)
+        self.assertIn("searches=3", line)
+        self.assertGreater(metrics.stages["parse"][2], 0)
+        tracemalloc.stop()
+
+
+class TestStartup(ExtendedTestCase):
+
+    """Test the import time of the WordSearch CLI"""
+
+    """The most the WordSearch import may take, relative to the imports of a
+    bare interpreter start"""
+    IMPORT_RATIO = 2
+
+    """Modules slow to import, imported only when used"""
+    DEFERRED_MODULES = (
+        "numpy", "pprint", "argparse", "hashlib", "multiprocessing", "json", "asyncio", "mmap"
+    )
+
+    def import_times(self, code = "import WordSearch", env = None):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            stdout = subprocess.PIPE, stderr = subprocess.PIPE,
+            universal_newlines = True, check = True, env = env
+        )
+        times = {}
+        startup = 0
+        for line in process.stderr.splitlines()[1:]:
+            self_time, cumulative, name = line.split(":", 1)[1].split("|")
+            times[name.strip()] = int(cumulative)
+            if not name.startswith("  "):
+                startup += int(cumulative)
+        return times, startup
+
+    def test_deferred_imports(self):
+        """"""
+
+        times, startup = self.import_times()
+        self.assertIn("WordSearch", times)
+        for name in TestStartup.DEFERRED_MODULES:
+            self.assertNotIn(name, times)
+
+    def test_import_budget(self):
+        """"""
+
+        # The first run compiles the modules bytecode, kept aside even when
+        # writing it is disabled, then the fastest runs are compared as both
+        # are slowed down alike on a loaded machine
+        directory = tempfile.mkdtemp()
+        try:
+            env = dict(os.environ, PYTHONPYCACHEPREFIX = directory)
+            env.pop("PYTHONDONTWRITEBYTECODE", None)
+            self.import_times(env = env)
+            word_search = min(self.import_times(env = env)[0]["WordSearch"] for run in range(3))
+            startup = min(self.import_times("pass", env)[1] for run in range(3))
+        finally:
+            shutil.rmtree(directory)
+
+        self.assertLess(word_search, startup * TestStartup.IMPORT_RATIO)
+
+    def test_version(self):
+        """"""
+
+        process = subprocess.run(
+            [sys.executable, "WordSearch.py", "--version"],
+            stdout = subprocess.PIPE, universal_newlines = True, check = True
+        )
+        self.assertEqual("WordSearch.py 1.1.0\n", process.stdout)
+
+
 class TestErrors(ExtendedTestCase):
 
     """Test the erronous operations WordSearch"""
@@ -209,6 +1571,66 @@ def suite():
     suite.addTests(
        unittest.TestLoader().loadTestsFromTestCase(TestLogics)
     )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestSolve)
+    )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestShapes)
+    )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestAllMatches)
+    )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestEngines)
+    )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestLazyGrid)
+    )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestSearchStore)
+    )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestNumpyGrid)
+    )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestFilter)
+    )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestMultiGrid)
+    )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestIncremental)
+    )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestOutputFormats)
+    )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestStream)
+    )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestWordStream)
+    )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestCompiled)
+    )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestCache)
+    )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestService)
+    )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestBatch)
+    )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestBenchmark)
+    )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestMetrics)
+    )
+    suite.addTests(
+       unittest.TestLoader().loadTestsFromTestCase(TestStartup)
+    )
     suite.addTests(
        unittest.TestLoader().loadTestsFromTestCase(TestErrors)
     )
@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+
+import struct
+
+from puzzle import Search
+
+MAGIC = b"WSRS"
+VERSION = 1
+
+"""
+Binary results layout, after the MAGIC and a little endian VERSION short:
+
+    word number     unsigned int, the position of the word in the word list
+    found           unsigned char, 1 when found
+    direction       signed char, the position in DIRECTIONS, -1 when not found
+    mismatches      unsigned short
+    start           (x, y) ints, padded like the text output
+    end             (x, y) ints, padded like the text output
+"""
+HEADER = struct.Struct("<4sH")
+RECORD = struct.Struct("<IBbHiiii")
+
+"""The directions of the binary records"""
+DIRECTIONS = list(Search.DIRECTIONS.values())
+
+class ResultWriter:
+    """
+    This class describes a writer of search results.
+
+    Results are formatted in batches and written with a single call per
+    batch, as the `.out` text or as NDJSON, CSV or packed binary records.
+    """
+
+    FORMAT_TEXT   = "TEXT"
+    FORMAT_NDJSON = "NDJSON"
+    FORMAT_CSV    = "CSV"
+    FORMAT_BINARY = "BINARY"
+    FORMATS       = (FORMAT_TEXT, FORMAT_NDJSON, FORMAT_CSV, FORMAT_BINARY)
+
+    EXTENSIONS = {
+        FORMAT_TEXT: ".out",
+        FORMAT_NDJSON: ".ndjson",
+        FORMAT_CSV: ".csv",
+        FORMAT_BINARY: ".bin",
+    }
+
+    CSV_HEADER = "word,found,start_x,start_y,end_x,end_y,direction,mismatches\r\n"
+
+    def __init__(self, output_file, output_format = FORMAT_TEXT, padding = 1, batch_size = 4096):
+        """
+        Constructs a new instance.
+
+        :param      output_file:    The output file, opened in binary mode
+        :type       output_file:    file
+        :param      output_format:  The format, one of ResultWriter.FORMATS
+        :type       output_format:  string
+        :param      padding:        The padding of the coordinates
+        :type       padding:        number
+        :param      batch_size:     The number of results written at once
+        :type       batch_size:     number
+        """
+
+        self.output_file = output_file
+        self.output_format = output_format
+        self.padding = padding
+        self.batch_size = batch_size
+        self.pending = []
+
+        self.format_result = {
+            ResultWriter.FORMAT_TEXT: self.format_text,
+            ResultWriter.FORMAT_NDJSON: self.format_ndjson,
+            ResultWriter.FORMAT_CSV: self.format_csv,
+            ResultWriter.FORMAT_BINARY: self.format_binary,
+        }[output_format]
+
+        if output_format == ResultWriter.FORMAT_BINARY:
+            self.output_file.write(HEADER.pack(MAGIC, VERSION))
+        elif output_format == ResultWriter.FORMAT_CSV:
+            self.pending.append(ResultWriter.CSV_HEADER)
+
+    def write(self, result, number = 0):
+        """
+        Adds a result to the current batch, written once the batch is full.
+
+        :param      result:  The result
+        :type       result:  SearchResult
+        :param      number:  The position of the word in the word list
+        :type       number:  number
+        """
+
+        self.pending.append(self.format_result(result, number))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+        return self
+
+    def flush(self):
+        """
+        Writes the current batch, then flush the output file so a reader of a
+        pipe gets it at once.
+        """
+
+        if not self.pending:
+            return self
+
+        if self.output_format == ResultWriter.FORMAT_BINARY:
+            self.output_file.write(b"".join(self.pending))
+        else:
+            self.output_file.write("".join(self.pending).encode("utf-8"))
+        self.output_file.flush()
+        self.pending = []
+        return self
+
+    def format_text(self, result, number):
+        """
+        Format a result as an output file line.
+
+        :param      result:  The result
+        :type       result:  SearchResult
+        :param      number:  The position of the word in the word list
+        :type       number:  number
+
+        :returns:   The line
+        :rtype:     string
+        """
+
+        return result.to_line(self.padding)
+
+    def format_ndjson(self, result, number):
+        """
+        Format a result as a JSON line, with the keys of SearchResult.to_dict,
+        the words only have letters and wildcards so they need no escaping.
+
+        :param      result:  The result
+        :type       result:  SearchResult
+        :param      number:  The position of the word in the word list
+        :type       number:  number
+
+        :returns:   The line
+        :rtype:     string
+        """
+
+        if not result.was_found:
+            return '{"word":"' + result.word + '","found":false}\n'
+
+        padding = self.padding
+        line = '{{"word":"{}","found":true,"start":[{},{}],"end":[{},{}],"direction":"{}"'.format(
+            result.word, result.start[0] + padding, result.start[1] + padding,
+            result.end[0] + padding, result.end[1] + padding, result.direction
+        )
+        if result.mismatches:
+            return '{},"mismatches":{}}}\n'.format(line, result.mismatches)
+        return line + "}\n"
+
+    def format_csv(self, result, number):
+        """
+        Format a result as a CSV row, the words only have letters and
+        wildcards so they need no quoting.
+
+        :param      result:  The result
+        :type       result:  SearchResult
+        :param      number:  The position of the word in the word list
+        :type       number:  number
+
+        :returns:   The row
+        :rtype:     string
+        """
+
+        if not result.was_found:
+            return result.word + ",0,,,,,,\r\n"
+
+        padding = self.padding
+        return "{},1,{},{},{},{},{},{}\r\n".format(
+            result.word, result.start[0] + padding, result.start[1] + padding,
+            result.end[0] + padding, result.end[1] + padding,
+            result.direction, result.mismatches
+        )
+
+    def format_binary(self, result, number):
+        """
+        Pack a result as a binary record.
+
+        :param      result:  The result
+        :type       result:  SearchResult
+        :param      number:  The position of the word in the word list
+        :type       number:  number
+
+        :returns:   The record
+        :rtype:     bytes
+        """
+
+        if not result.was_found:
+            return RECORD.pack(number, 0, -1, 0, 0, 0, 0, 0)
+
+        padding = self.padding
+        return RECORD.pack(
+            number, 1, DIRECTIONS.index(result.direction), result.mismatches,
+            result.start[0] + padding, result.start[1] + padding,
+            result.end[0] + padding, result.end[1] + padding
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.flush()
+        return False
+
+def read_binary(path):
+    """
+    Reads a binary results file
+
+    :param      path:  The binary results path
+    :type       path:  string
+
+    :returns:   The word number, found flag, direction, mismatches, start and
+                end of every result
+    :rtype:     generator
+
+    :raises     ValueError:  If the file is not a binary results file
+    """
+
+    with open(path, "rb") as reader:
+        magic, version = HEADER.unpack(reader.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("{} is not a binary results file".format(path))
+
+        for record in RECORD.iter_unpack(reader.read()):
+            number, found, direction, mismatches, start_x, start_y, end_x, end_y = record
+            if not found:
+                yield (number, False, None, 0, None, None)
+            else:
+                yield (
+                    number, True, DIRECTIONS[direction], mismatches,
+                    (start_x, start_y), (end_x, end_y)
+                )